@@ -0,0 +1,5 @@
+'''
+    The autonomous routines. Each module declares its routines with
+    common.routines.autonomous, and they are listed on the dashboard without
+    the modules being imported until a routine is chosen.
+'''
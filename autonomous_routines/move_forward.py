@@ -0,0 +1,12 @@
+from common.routines import autonomous
+
+@autonomous('Move Forward')
+def move_forward(robot, process):
+    '''
+        Drives forward for 3 seconds
+    '''
+    while process.time_since_start < 3:
+        robot.drive.tank(1, 1)
+        yield
+        
+    robot.drive.tank(0, 0)
@@ -0,0 +1,15 @@
+from common import height_levels as hl
+from common.routines import autonomous
+from manager import *
+
+@autonomous('One Object')
+def one_object(robot, process):
+    '''
+        Grabs the tote in front of the robot and lifts it over another tote
+    '''
+    robot.grabber_lift.clamp()
+    yield wait_seconds(1)
+    
+    robot.grabber_lift.prepare_to_move_to_position(hl.START_HEIGHT_BITS + hl.TOTE_HEIGHT_BITS)
+    robot.grabber_lift.move_to_position()
+    yield wait_until(robot.grabber_lift.is_at_position)
@@ -0,0 +1,56 @@
+'''
+    Runs the simulated robot through teleop with the lift buttons held and
+    released and the robot driving, and counts the writes the cached outputs
+    sent to the motor controllers and solenoid against the ones they skipped.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_cached_outputs
+'''
+
+from sim import install
+
+install()
+
+from sim.engine import Simulator
+from common import logitec_controller as lc
+from custom.cached_outputs import Cached_Output
+
+
+def driver(simulator, seconds):
+    ds = simulator.ds
+    # hold the lift up and down buttons for two seconds each, with a second
+    # between them, and toggle the claw now and then
+    phase = int(seconds) % 6
+    ds.set_button(0, lc.L_TRIGGER, phase in (0, 1))
+    ds.set_button(0, lc.L_BUMPER, phase in (3, 4))
+    ds.set_button(0, lc.R_BUMPER, int(seconds * 2) % 7 == 0)
+    # drive at a steady speed for a while and then turn
+    ds.set_axis(0, lc.L_AXIS_Y, -.5)
+    ds.set_axis(0, lc.R_AXIS_X, .3 if int(seconds) % 10 > 7 else 0)
+
+
+def main():
+    simulator = Simulator()
+    robot = simulator.robot
+    simulator.run_mode('disabled', .1)
+    simulator.run_mode('teleop', 60, driver)
+
+    outputs = (
+        ('lift master', robot.grabber_lift.motor_master),
+        ('lift slave', robot.grabber_lift.motor_slave),
+        ('grabber', robot.grabber_lift.grabber),
+        ('front left', robot.drive.robot_drive.frontLeftMotor),
+        ('front right', robot.drive.robot_drive.frontRightMotor),
+        ('rear left', robot.drive.robot_drive.rearLeftMotor),
+        ('rear right', robot.drive.robot_drive.rearRightMotor)
+    )
+
+    print('%d ticks' % simulator.ticks)
+    print('%-12s %8s %10s' % ('output', 'sent', 'skipped'))
+    for name, output in outputs:
+        print('%-12s %8d %10d' % (name, output.writes, output.suppressed))
+    print('%-12s %8d %10d' % ('total', Cached_Output.total_writes, Cached_Output.total_suppressed))
+
+if __name__ == '__main__':
+    main()
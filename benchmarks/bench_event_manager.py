@@ -0,0 +1,103 @@
+'''
+    Compares the number of triggers per second of the Event Manager against
+    the original list based implementation, for the listener counts events
+    have in the robot code, none, one, a few and ten, and for a hundred.
+
+    Registrations are timed on managers made before the timing starts, so
+    making the manager isn't counted.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_event_manager
+'''
+
+import time
+import timeit
+from manager.event_manager import Event_Manager
+
+
+class List_Event_Manager:
+
+    '''
+        The original Event Manager, kept as a baseline for the benchmark
+    '''
+
+    def __init__(self):
+        self.listeners = {}
+
+    def add_listener(self, event_name, callback):
+
+        if event_name not in self.listeners:
+            self.listeners[event_name] = []
+
+        if callback not in self.listeners[event_name]:
+            self.listeners[event_name].append(callback)
+
+    def trigger(self, event_name, event_data = None):
+
+        if event_name not in self.listeners:
+            return
+
+        for callback in self.listeners[event_name]:
+            callback(event_data)
+
+
+def make_listener():
+    def listener(data):
+        pass
+    return listener
+
+def triggers_per_second(event_manager, listener_count, number = 100000):
+    for i in range(listener_count):
+        event_manager.add_listener('teleop.periodic', make_listener())
+
+    seconds = min(timeit.repeat(lambda: event_manager.trigger('teleop.periodic'), number = number, repeat = 9))
+    return number / seconds
+
+def pattern_triggers_per_second(listener_count, number = 100000):
+    event_manager = Event_Manager()
+    for i in range(listener_count):
+        event_manager.add_listener('joystick.*.when_pressed', make_listener())
+
+    seconds = min(timeit.repeat(lambda: event_manager.trigger('joystick.l_bumper.when_pressed'), number = number, repeat = 9))
+    return number / seconds
+
+def registrations_per_second(event_manager_class, listener_count, number = 20):
+    listeners = [make_listener() for i in range(listener_count)]
+    best = None
+
+    for _ in range(5):
+        event_managers = [event_manager_class() for i in range(number)]
+
+        start = time.perf_counter()
+        for event_manager in event_managers:
+            for listener in listeners:
+                event_manager.add_listener('teleop.periodic', listener)
+        seconds = time.perf_counter() - start
+
+        if best is None or seconds < best:
+            best = seconds
+
+    return number * listener_count / best
+
+def main():
+    print('%-10s %18s %18s %8s' % ('listeners', 'list triggers/s', 'triggers/s', 'speedup'))
+    for listener_count in (0, 1, 2, 3, 10, 100):
+        before = triggers_per_second(List_Event_Manager(), listener_count)
+        after = triggers_per_second(Event_Manager(), listener_count)
+        print('%-10d %18.0f %18.0f %7.2fx' % (listener_count, before, after, after / before))
+
+    print()
+    print('%-10s %18s' % ('listeners', 'pattern triggers/s'))
+    for listener_count in (1, 3, 10):
+        print('%-10d %18.0f' % (listener_count, pattern_triggers_per_second(listener_count)))
+
+    print()
+    print('%-10s %18s %18s %8s' % ('listeners', 'list adds/s', 'adds/s', 'speedup'))
+    for listener_count in (10, 100, 1000):
+        before = registrations_per_second(List_Event_Manager, listener_count)
+        after = registrations_per_second(Event_Manager, listener_count)
+        print('%-10d %18.0f %18.0f %7.2fx' % (listener_count, before, after, after / before))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''
+    Times importing the framework, the subsystems and the robot code, and
+    booting the robot, each in a new Python process so nothing is already
+    imported. Each is run several times and the fastest is kept. Also counts
+    the modules each one imports and whether wpilib was one of them.
+
+    The robot cases run on the stand-in wpilib, so installing the stand-ins
+    is part of the time.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_import
+'''
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name, setup, statement timed
+CASES = (
+    ('manager', '', 'import manager'),
+    ('subsystems', '', 'import subsystems'),
+    ('robot', 'from sim import install', 'install()\nimport robot'),
+    ('robot boot', 'from sim import install',
+        'install()\nimport robot\nrobot.MyRobot.parameters_path = None\nrobot.MyRobot().robotInit()'),
+)
+
+TEMPLATE = '''
+import sys
+import time
+%s
+modules = len(sys.modules)
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(elapsed, len(sys.modules) - modules, 'wpilib' in sys.modules and not getattr(sys.modules['wpilib'], 'IS_STAND_IN', False))
+'''
+
+def time_import(setup, statement, repeat = 7):
+    '''
+        @return: (best seconds, modules imported, whether the real wpilib was
+        imported), or None if the statement failed
+    '''
+    best = None
+
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', TEMPLATE % (setup, statement)],
+                                cwd = ROOT, stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+                                universal_newlines = True)
+
+        if result.returncode != 0:
+            return None
+
+        elapsed, modules, wpilib = result.stdout.split()
+        elapsed = float(elapsed)
+
+        if best is None or elapsed < best[0]:
+            best = (elapsed, int(modules), wpilib == 'True')
+
+    return best
+
+def main():
+    print('%-12s %10s %8s %7s' % ('', 'ms', 'modules', 'wpilib'))
+
+    for name, setup, statement in CASES:
+        result = time_import(setup, statement)
+
+        if result is None:
+            print('%-12s failed' % name)
+        else:
+            print('%-12s %10.2f %8d %7s' % (name, result[0] * 1000, result[1], 'yes' if result[2] else 'no'))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+'''
+    Compares the per tick cost of reading joysticks with one Joystick_Button
+    process per button and four axis closures, against one Joystick_Sampler
+    per joystick, for 1, 2 and 6 controllers.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_input_sampler
+'''
+
+import timeit
+from manager import Event_Manager, Process_Manager
+from processes.input_sampler import Joystick_Sampler
+from common import logitec_controller as lc
+
+
+class Joystick_Button:
+
+    '''
+        The original process per button, kept as a baseline for the benchmark
+    '''
+
+    def __init__(self, joystick, button):
+
+        self.joystick = joystick
+        self.button = button
+        self.current_state = False
+        self.event_listeners = {
+            'when_pressed' : [],
+            'when_released' : [],
+            'while_pressed' : [],
+            'while_released' : []
+        }
+
+        Process_Manager.start(self)
+
+    def get_button(self):
+        return self.joystick.getRawButton(self.button)
+
+    def notify_listeners(self, type):
+        for listener in self.event_listeners[type]:
+            listener()
+
+    def add_listener(self, type, listener):
+        self.event_listeners[type].append(listener)
+
+    def __call__(self, process):
+
+        if process.state is Process_Manager.STARTED:
+            self.current_state = self.get_button()
+            return
+
+        elif process.state is not Process_Manager.RUNNING:
+            return
+
+        prev_state = self.current_state
+        self.current_state = self.get_button()
+
+        if self.current_state:
+            self.notify_listeners('while_pressed')
+        else:
+            self.notify_listeners('while_released')
+
+        if prev_state is not self.current_state:
+            if self.current_state:
+                self.notify_listeners('when_pressed')
+            else:
+                self.notify_listeners('when_released')
+
+
+class Fake_Driver_Station:
+
+    def __init__(self):
+        self.buttons = [0] * 6
+
+    def getStickButtons(self, port):
+        return self.buttons[port]
+
+
+class Fake_Joystick:
+
+    def __init__(self, ds, port):
+        self.ds = ds
+        self.port = port
+
+    def getRawButton(self, button):
+        return (self.ds.buttons[self.port] >> (button - 1)) & 1 == 1
+
+    def getRawAxis(self, axis):
+        return .5
+
+    getAxis = getRawAxis
+
+
+BUTTONS = {
+    'l_bumper' : lc.L_BUMPER,
+    'l_trigger' : lc.L_TRIGGER,
+    'r_bumper' : lc.R_BUMPER,
+    'r_trigger' : lc.R_TRIGGER,
+    'btn_one' : 1,
+    'btn_two' : 2
+}
+
+AXES = {
+    'x_left' : lc.L_AXIS_X,
+    'y_left' : lc.L_AXIS_Y,
+    'x_right' : lc.R_AXIS_X,
+    'y_right' : lc.R_AXIS_Y
+}
+
+
+def get_axis(joystick, axis):
+    def axis_func():
+        val = joystick.getAxis(axis)
+        if abs(val) >= .1:
+            return val
+        else:
+            return 0
+    return axis_func
+
+def reset():
+    import manager
+    manager.Event_Manager.__init__()
+    manager.Process_Manager.__init__(event_manager = manager.Event_Manager)
+
+def subscribe(name):
+    for button_name in BUTTONS:
+        Event_Manager.add_listener('%s.%s.when_pressed' % (name, button_name), lambda data: None)
+    Event_Manager.add_listener('%s.l_bumper.while_pressed' % name, lambda data: None)
+
+def button_processes_tick(joysticks):
+    reset()
+
+    for port, joystick in enumerate(joysticks):
+        name = 'joystick%d' % port
+        subscribe(name)
+        for button_name, button in BUTTONS.items():
+            button_process = Joystick_Button(joystick, button)
+            for kind in ('when_pressed', 'while_pressed'):
+                event_name = '%s.%s.%s' % (name, button_name, kind)
+                button_process.add_listener(kind, lambda event_name = event_name: Event_Manager.trigger(event_name))
+
+    def tick():
+        Process_Manager.run()
+        for joystick in joysticks:
+            Event_Manager.post('axis.updated', {
+                axis_name : get_axis(joystick, axis)() for axis_name, axis in AXES.items()
+            })
+        Event_Manager.drain()
+
+    return tick
+
+def sampler_tick(joysticks):
+    reset()
+    samplers = []
+
+    for port, joystick in enumerate(joysticks):
+        name = 'joystick%d' % port
+        subscribe(name)
+        sampler = Joystick_Sampler(joystick, name, BUTTONS, AXES)
+        Process_Manager.start(sampler)
+        samplers.append(sampler)
+
+    def tick():
+        Process_Manager.run()
+        for sampler in samplers:
+            sampler.post_axes()
+        Event_Manager.drain()
+
+    return tick
+
+def tick_cost(make_tick, controller_count, number = 2000):
+    ds = Fake_Driver_Station()
+    joysticks = [Fake_Joystick(ds, port) for port in range(controller_count)]
+    tick = make_tick(joysticks)
+
+    def pressing_tick():
+        # alternate between a few buttons being held and none
+        for port in range(controller_count):
+            ds.buttons[port] ^= 0b110001
+        tick()
+
+    seconds = min(timeit.repeat(pressing_tick, number = number, repeat = 5))
+    return seconds / number
+
+def main():
+    print('%-12s %20s %20s %8s' % ('controllers', 'button procs us/tick', 'sampler us/tick', 'speedup'))
+    for controller_count in (1, 2, 6):
+        before = tick_cost(button_processes_tick, controller_count)
+        after = tick_cost(sampler_tick, controller_count)
+        print('%-12d %20.2f %20.2f %7.2fx' % (controller_count, before * 1e6, after * 1e6, before / after))
+
+if __name__ == '__main__':
+    main()
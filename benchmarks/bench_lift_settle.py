@@ -0,0 +1,88 @@
+'''
+    Moves the simulated lift between its preset levels, once by sending the
+    goal straight to the Talon like move_to_position used to and once with the
+    profiled move_to_position, and compares how long the lift takes to settle
+    within tolerance of the goal and how far it overshoots.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_lift_settle
+'''
+
+from sim import install
+
+install()
+
+from sim.engine import Simulator
+from subsystems.grabber_lift import Grabber_Lift
+
+# the levels the lift is moved to, in order
+MOVES = (1, 3, 2, 5, 0, 4)
+# seconds each move is given to settle
+WINDOW = 3.0
+
+
+def step_move(lift, goal):
+    # the goal is sent to the Talon all at once
+    lift.stop_move()
+    lift.goal_position = goal
+    lift.set_mode(Grabber_Lift.mPostion)
+    lift.change_break_mode(False)
+    lift.set_setpoint(goal)
+
+def profiled_move(lift, goal):
+    lift.prepare_to_move_to_position(goal)
+    lift.move_to_position()
+
+
+def measure(move):
+    '''
+        @return: A list of (start, goal, settle seconds, overshoot bits) for
+        each move
+    '''
+    simulator = Simulator()
+    lift = simulator.robot.grabber_lift
+    samples = [[] for level in MOVES]
+    starts = []
+
+    def driver(simulator, seconds):
+        index = min(int(seconds // WINDOW), len(MOVES) - 1)
+
+        if index == len(starts):
+            starts.append(lift.pot_reading())
+            move(lift, Grabber_Lift.levels[MOVES[index]])
+
+        samples[index].append((seconds - index * WINDOW, lift.pot_reading()))
+
+    simulator.run_mode('disabled', .1)
+    simulator.run_mode('teleop', WINDOW * len(MOVES), driver)
+
+    results = []
+    for index, level in enumerate(MOVES):
+        start = starts[index]
+        goal = Grabber_Lift.levels[level]
+        direction = 1 if goal >= start else -1
+        settle_time = 0.0
+        overshoot = 0.0
+
+        for time, position in samples[index]:
+            if abs(position - goal) >= lift.tolerance:
+                settle_time = time
+            overshoot = max(overshoot, direction * (position - goal))
+
+        results.append((start, goal, settle_time, overshoot))
+
+    return results
+
+
+def main():
+    step = measure(step_move)
+    profiled = measure(profiled_move)
+
+    print('%-12s %14s %14s %16s %16s' % ('move', 'step settle', 'profiled', 'step overshoot', 'profiled'))
+    for (start, goal, step_time, step_overshoot), (_, _, profiled_time, profiled_overshoot) in zip(step, profiled):
+        print('%4d -> %-4d %12.2f s %12.2f s %11.0f bits %11.0f bits' % (
+            start, goal, step_time, profiled_time, step_overshoot, profiled_overshoot))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+'''
+    Compares KwarqsDriveMech.mecanumDrive_Cartesian as it was, building a
+    wheel speed list and rotating with RobotDrive.rotateVector on every call,
+    against the cached Mecanum_Kinematics, and measures the batch path.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_mecanum
+'''
+
+import random
+import timeit
+from sim import install
+
+install()
+
+import wpilib
+from wpilib import RobotDrive
+from custom.kwarqs_drive_mech import KwarqsDriveMech
+from custom import mecanum_kinematics
+
+
+def list_mecanum(drive, x, y, rotation, gyroAngle):
+    # the mecanumDrive_Cartesian this replaced, without the HAL report
+    xIn = x
+    yIn = -y
+    xIn, yIn = RobotDrive.rotateVector(xIn, yIn, gyroAngle)
+
+    wheelSpeeds = [0]*drive.kMaxNumberOfMotors
+    wheelSpeeds[drive.MotorType.kFrontLeft] = xIn + yIn + rotation
+    wheelSpeeds[drive.MotorType.kFrontRight] = -xIn + yIn - rotation
+    wheelSpeeds[drive.MotorType.kRearLeft] = -xIn + yIn + ( rotation * drive.weight_multiplier )
+    wheelSpeeds[drive.MotorType.kRearRight] = xIn + yIn - ( rotation * drive.weight_multiplier )
+
+    RobotDrive.normalize(wheelSpeeds)
+
+    drive.frontLeftMotor.set(wheelSpeeds[drive.MotorType.kFrontLeft] * drive.invertedMotors[drive.MotorType.kFrontLeft] * drive.maxOutput, drive.syncGroup)
+    drive.frontRightMotor.set(wheelSpeeds[drive.MotorType.kFrontRight] * drive.invertedMotors[drive.MotorType.kFrontRight] * drive.maxOutput, drive.syncGroup)
+    drive.rearLeftMotor.set(wheelSpeeds[drive.MotorType.kRearLeft] * drive.invertedMotors[drive.MotorType.kRearLeft] * drive.maxOutput, drive.syncGroup)
+    drive.rearRightMotor.set(wheelSpeeds[drive.MotorType.kRearRight] * drive.invertedMotors[drive.MotorType.kRearRight] * drive.maxOutput, drive.syncGroup)
+
+    if drive.syncGroup != 0:
+        wpilib.CANJaguar.updateSyncGroup(drive.syncGroup)
+    drive.feed()
+
+def make_drive():
+    drive = KwarqsDriveMech(4, 2, 5, 3)
+    drive.setInvertedMotor(RobotDrive.MotorType.kFrontRight, True)
+    drive.setInvertedMotor(RobotDrive.MotorType.kRearRight, True)
+    drive.set_multiplier(.8)
+    return drive
+
+def get_outputs(drive):
+    return (drive.frontLeftMotor.value, drive.frontRightMotor.value, drive.rearLeftMotor.value,
+            drive.rearRightMotor.value)
+
+def main(number = 100000):
+    random.seed(0)
+    inputs = [(random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1), random.choice((0, 0, 90)))
+              for i in range(1000)]
+    drive = make_drive()
+
+    # both have to write the same outputs
+    for x, y, rotation, angle in inputs:
+        list_mecanum(drive, x, y, rotation, angle)
+        before = get_outputs(drive)
+        drive.mecanumDrive_Cartesian(x, y, rotation, angle)
+        after = get_outputs(drive)
+        assert all(abs(a - b) < 1e-12 for a, b in zip(before, after)), (before, after)
+
+    # the joystick moves but the gyro angle is the same from tick to tick
+    x, y, rotation, angle = .3, -.6, .2, 12.5
+    before = min(timeit.repeat(lambda: list_mecanum(drive, x, y, rotation, angle), number = number, repeat = 5))
+    after = min(timeit.repeat(lambda: drive.mecanumDrive_Cartesian(x, y, rotation, angle), number = number, repeat = 5))
+    kinematics = drive.kinematics
+    compute = min(timeit.repeat(lambda: kinematics.compute(x, y, rotation, angle), number = number, repeat = 5))
+
+    print('%-34s %8.3f us' % ('mecanumDrive_Cartesian before', before / number * 1e6))
+    print('%-34s %8.3f us (%.2fx)' % ('mecanumDrive_Cartesian after', after / number * 1e6, before / after))
+    print('%-34s %8.3f us' % ('Mecanum_Kinematics.compute', compute / number * 1e6))
+
+    count = 100000
+    xs = [random.uniform(-1, 1) for i in range(count)]
+    ys = [random.uniform(-1, 1) for i in range(count)]
+    rotations = [random.uniform(-1, 1) for i in range(count)]
+    angles = [random.uniform(0, 360) for i in range(count)]
+    batch = min(timeit.repeat(lambda: kinematics.compute_batch(xs, ys, rotations, angles), number = 1, repeat = 3))
+    print('%-34s %8.3f us per input (%s)' % ('Mecanum_Kinematics.compute_batch', batch / count * 1e6,
+                                            'numpy' if mecanum_kinematics.numpy is not None else 'no numpy'))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+    Measures the cost of one Process Manager tick as the number of running
+    processes grows, and how fast processes can be started and finished.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_process_manager
+'''
+
+import timeit
+from manager.process_manager import Process_Manager
+
+
+def noop_process(process):
+    pass
+
+def make_processes(count):
+    # each process has to be a different callable
+    return [lambda process: None for i in range(count)]
+
+def tick_cost(process_count, number = 200):
+    process_manager = Process_Manager()
+    for process in make_processes(process_count):
+        process_manager.start(process)
+
+    seconds = min(timeit.repeat(process_manager.run, number = number, repeat = 5))
+    return seconds / number
+
+def sleeping_tick_cost(process_count, number = 200):
+    process_manager = Process_Manager()
+    for process in make_processes(process_count):
+        process_manager.start_every(60, process)
+
+    seconds = min(timeit.repeat(process_manager.run, number = number, repeat = 5))
+    return seconds / number
+
+def churn_per_second(process_count):
+    process_manager = Process_Manager()
+    processes = make_processes(process_count)
+
+    def churn():
+        for process in processes:
+            process_manager.start(process)
+        for process in processes:
+            process_manager.finish(process)
+
+    seconds = min(timeit.repeat(churn, number = 10, repeat = 5))
+    return 10 * process_count / seconds
+
+def main():
+    print('%-10s %14s %16s %18s %18s' % ('processes', 'us/tick', 'ns/process', 'start+finish/s',
+                                         'sleeping us/tick'))
+    for process_count in (1, 10, 100, 1000, 5000):
+        cost = tick_cost(process_count)
+        print('%-10d %14.2f %16.1f %18.0f %18.2f' % (process_count, cost * 1e6, cost * 1e9 / process_count,
+                                                      churn_per_second(process_count),
+                                                      sleeping_tick_cost(process_count) * 1e6))
+
+if __name__ == '__main__':
+    main()
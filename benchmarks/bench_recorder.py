@@ -0,0 +1,51 @@
+'''
+    Measures how much recording adds to triggering an event and to starting
+    and finishing a process, and how fast a recording is read back.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_recorder
+'''
+
+import os
+import tempfile
+import timeit
+from manager import Event_Manager, Process_Manager, start_recording, stop_recording, read_recording
+
+
+def process(process_data):
+    return Process_Manager.FINISHED
+
+def trigger_cost(number = 200000):
+    Event_Manager.add_listener('teleop.periodic', lambda data: None)
+    return min(timeit.repeat(lambda: Event_Manager.trigger('teleop.periodic'), number = number, repeat = 5)) / number
+
+def process_cost(number = 20000):
+    def start_and_finish():
+        Process_Manager.start(process)
+        Process_Manager.run()
+    return min(timeit.repeat(start_and_finish, number = number, repeat = 5)) / number
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), 'match.evfr')
+
+    before_trigger = trigger_cost()
+    before_process = process_cost()
+
+    recorder = start_recording(path)
+    after_trigger = trigger_cost()
+    after_process = process_cost()
+    stop_recording()
+
+    print('%-26s %10s %10s %10s' % ('', 'before us', 'after us', 'added us'))
+    print('%-26s %10.3f %10.3f %10.3f' % ('trigger', before_trigger * 1e6, after_trigger * 1e6,
+                                          (after_trigger - before_trigger) * 1e6))
+    print('%-26s %10.3f %10.3f %10.3f' % ('start, run, finish', before_process * 1e6, after_process * 1e6,
+                                          (after_process - before_process) * 1e6))
+
+    seconds = timeit.timeit(lambda: read_recording(path), number = 1)
+    recording = read_recording(path)
+    print('read %d of %d records in %.1f ms' % (len(recording), recorder.count, seconds * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''
+    Times how long Routine_Registry takes to find the routines of a package
+    of generated routine modules, against importing every module, as the
+    number of routines grows. Each generated module imports a module that is
+    slow to import, like the heavy dependencies a routine may have.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_routines
+'''
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+from common.routines import Routine_Registry
+
+ROUTINE = '''
+import %(package)s_heavy
+from common.routines import autonomous
+
+@autonomous('Routine %(index)d')
+def routine_%(index)d(robot, process):
+    while process.time_since_start < %(index)d:
+        robot.drive.tank(1, 1)
+        yield
+    robot.drive.tank(0, 0)
+'''
+
+# stands in for a dependency that takes 2ms to import
+HEAVY = '''
+import time
+time.sleep(.002)
+'''
+
+
+def make_package(directory, package, count):
+    os.mkdir(os.path.join(directory, package))
+    open(os.path.join(directory, package, '__init__.py'), 'w').close()
+
+    with open(os.path.join(directory, package + '_heavy.py'), 'w') as file:
+        file.write(HEAVY)
+
+    for index in range(count):
+        with open(os.path.join(directory, package, 'routine_%d.py' % index), 'w') as file:
+            file.write(ROUTINE % {'package' : package, 'index' : index})
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        sys.path.insert(0, directory)
+
+        print('%-9s %12s %12s' % ('routines', 'scan', 'import all'))
+        for count in (5, 25, 100):
+            package = 'bench_routines_%d' % count
+            make_package(directory, package, count)
+
+            start = time.perf_counter()
+            registry = Routine_Registry(package)
+            scan_time = time.perf_counter() - start
+            assert len(registry.routines) == count
+
+            start = time.perf_counter()
+            for name, info in registry.routines.items():
+                importlib.import_module(info.module)
+            import_time = time.perf_counter() - start
+
+            print('%-9d %9.2f ms %9.2f ms' % (count, scan_time * 1000, import_time * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+    Edits dashboard values from a second thread, the way the NetworkTables
+    thread does, while the simulated robot loop runs, and counts how many
+    edits reached the loop as dashboard.updated events. Also times a put on
+    the editing thread.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_snapshot
+'''
+
+import threading
+import time
+import timeit
+from sim import install
+
+install()
+
+from sim.engine import Simulator
+from manager import Event_Manager, Snapshot
+
+KEYS = ('drive_deadband', 'drive_expo', 'drive_speed_limit', 'drive_max_accel')
+
+
+def main():
+    simulator = Simulator()
+    updates = simulator.robot.oi.dashboard_updates
+    triggered = [0]
+
+    def count(event):
+        triggered[0] += 1
+
+    Event_Manager.add_listener('dashboard.updated', count)
+    simulator.run_mode('disabled', .1)
+    triggered[0] = 0
+    running = [True]
+    edits = [0]
+
+    def edit():
+        # sliders being dragged on the dashboard
+        while running[0]:
+            for key in KEYS:
+                simulator.set_dashboard(key, (edits[0] % 100) / 100)
+                edits[0] += 1
+            time.sleep(0)
+
+    thread = threading.Thread(target = edit)
+    thread.start()
+    # the robot loop waits for the next tick most of the time
+    simulator.run_mode('teleop', 5, lambda simulator, seconds: time.sleep(.001))
+    running[0] = False
+    thread.join()
+
+    # the last edits are delivered on the next tick
+    simulator.run_mode('teleop', .02)
+
+    print('%d edits over %d ticks, %d dashboard.updated events (%.1f per tick), %d merged, %d dropped' % (
+        edits[0], simulator.ticks, triggered[0], triggered[0] / simulator.ticks, updates.merged, updates.dropped))
+
+    snapshot = Snapshot()
+    put_time = min(timeit.repeat(lambda: snapshot.put('drive_expo', .5), number = 100000, repeat = 5)) * 10
+    print('put on the NetworkTables thread: %.3f us' % put_time)
+
+if __name__ == '__main__':
+    main()
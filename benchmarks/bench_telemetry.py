@@ -0,0 +1,105 @@
+'''
+    Compares publishing the drive and lift values to the SmartDashboard every
+    loop, against publishing them through Telemetry channels, while the robot
+    sits still with a little sensor noise and then drives for a while.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_telemetry
+'''
+
+import random
+import timeit
+from manager.telemetry import Telemetry
+
+
+class Fake_Dashboard:
+
+    '''
+        Counts the values put to it. A real NetworkTables put costs much more
+        than this, so the us/tick of the 'every loop' row is a lower bound.
+    '''
+
+    def __init__(self):
+        self.puts = 0
+        self.table = {}
+
+    def _put(self, name, value):
+        self.puts += 1
+        self.table[name] = value
+
+    putNumber = putBoolean = putString = _put
+
+
+def make_inputs(ticks):
+    random.seed(0)
+    inputs = []
+    for tick in range(ticks):
+        moving = tick % 500 > 350
+        speed = .75 if moving else 0
+        inputs.append((
+            speed, speed, 0,
+            random.gauss(0, .002), random.gauss(0, .002), 1 + random.gauss(0, .002),
+            tick % 500 > 400, 512 + (tick % 500 if moving else 0), 'mPosition'
+        ))
+    return inputs
+
+def put_every_loop(dashboard, inputs):
+    def run():
+        for x, y, z, ax, ay, az, box, pos, mode in inputs:
+            dashboard.putNumber('x axis', x)
+            dashboard.putNumber('y axis', y)
+            dashboard.putNumber('z axis', z)
+            dashboard.putNumber('acceleration_x', ax)
+            dashboard.putNumber('acceleration_y', ay)
+            dashboard.putNumber('acceleration_z', az)
+            dashboard.putBoolean('box_sensor', box)
+            dashboard.putNumber('lift_position', pos)
+            dashboard.putString('lift_mode', mode)
+    return run
+
+def put_channels(dashboard, inputs):
+    telemetry = Telemetry(dashboard)
+    channels = (
+        telemetry.add_channel('x axis', epsilon = .005),
+        telemetry.add_channel('y axis', epsilon = .005),
+        telemetry.add_channel('z axis', epsilon = .005),
+        telemetry.add_channel('acceleration_x', epsilon = .01, max_rate = 5),
+        telemetry.add_channel('acceleration_y', epsilon = .01, max_rate = 5),
+        telemetry.add_channel('acceleration_z', epsilon = .01, max_rate = 5),
+        telemetry.add_channel('box_sensor', Telemetry.BOOLEAN),
+        telemetry.add_channel('lift_position', epsilon = 1),
+        telemetry.add_channel('lift_mode', Telemetry.STRING),
+    )
+
+    def run():
+        now = 0
+        for values in inputs:
+            for channel, value in zip(channels, values):
+                channel.set(value)
+            now += .02
+            telemetry.flush(now)
+    run.telemetry = telemetry
+    return run
+
+def main():
+    ticks = 3000
+    inputs = make_inputs(ticks)
+
+    before_dashboard = Fake_Dashboard()
+    put_every_loop(before_dashboard, inputs)()
+
+    after_dashboard = Fake_Dashboard()
+    after = put_channels(after_dashboard, inputs)
+    after()
+
+    before_time = min(timeit.repeat(lambda: put_every_loop(Fake_Dashboard(), inputs)(), number = 1, repeat = 5)) / ticks
+    after_time = min(timeit.repeat(lambda: put_channels(Fake_Dashboard(), inputs)(), number = 1, repeat = 5)) / ticks
+
+    print('%-16s %12s %12s' % ('', 'puts/tick', 'us/tick'))
+    print('%-16s %12.2f %12.2f' % ('every loop', before_dashboard.puts / ticks, before_time * 1e6))
+    print('%-16s %12.2f %12.2f' % ('channels', after_dashboard.puts / ticks, after_time * 1e6))
+    print('sent %d, suppressed %d' % (after.telemetry.sent, after.telemetry.suppressed))
+
+if __name__ == '__main__':
+    main()
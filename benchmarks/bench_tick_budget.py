@@ -0,0 +1,91 @@
+'''
+    Runs ticks of made up work with and without a tick budget: a CRITICAL
+    process feeding the drive, NORMAL work that takes much longer every few
+    ticks, and BACKGROUND logging and dashboard processes and a BACKGROUND
+    listener. The work advances a Manual_Clock the ticks are measured with
+    instead of taking real time, so the results are the same every run.
+
+    Counts the ticks that went over the budget, the longest tick, how many
+    ticks the drive wasn't fed in, and how much work was deferred.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.bench_tick_budget
+'''
+
+from manager.clock import Manual_Clock
+from manager.event_manager import Event_Manager
+from manager.process_manager import Process_Manager
+
+BUDGET = .015
+TICKS = 1000
+
+
+def run_ticks(budget):
+    clock = Manual_Clock()
+    work = Manual_Clock()
+    event_manager = Event_Manager()
+    process_manager = Process_Manager(clock, event_manager, work.now)
+    process_manager.budget = budget
+    # the ticks the drive was fed in
+    fed = set()
+    logged = [0]
+
+    def feed_drive(process):
+        work.advance(.001)
+        fed.add(process_manager.tick)
+
+    def autonomous(process):
+        # a vision frame is processed every 5th tick
+        work.advance(.016 if process_manager.tick % 5 == 0 else .004)
+        event_manager.trigger('autonomous.updated')
+
+    def log(process):
+        work.advance(.003)
+        logged[0] += 1
+
+    def sync_dashboard(process):
+        work.advance(.002)
+
+    def record(event):
+        work.advance(.001)
+
+    process_manager.start(feed_drive, priority = Process_Manager.CRITICAL)
+    process_manager.start(autonomous)
+    process_manager.start_every(.1, log, priority = Process_Manager.BACKGROUND)
+    process_manager.start(sync_dashboard, priority = Process_Manager.BACKGROUND)
+    event_manager.add_listener('autonomous.updated', record, Event_Manager.BACKGROUND)
+
+    longest = 0
+    over = 0
+
+    for i in range(TICKS):
+        clock.advance(.02)
+        process_manager.run()
+        event_manager.drain()
+        process_manager.end_tick()
+        longest = max(longest, process_manager.tick_time)
+        # counted against the budget even when nothing is deferred
+        if process_manager.tick_time > BUDGET + 1e-9:
+            over += 1
+
+    return {
+        'longest' : longest,
+        'over' : over,
+        'unfed' : TICKS - len(fed - {0}),
+        'logged' : logged[0],
+        'deferred_processes' : process_manager.deferred_processes,
+        'deferred_listeners' : event_manager.deferred_listeners
+    }
+
+def main():
+    print('%d ticks, %.0fms budget' % (TICKS, BUDGET * 1000))
+    print('%-10s %12s %10s %8s %8s %10s %10s' % ('', 'longest ms', 'overruns', 'unfed', 'logs', 'deferred', 'listeners'))
+
+    for name, budget in (('no budget', None), ('budget', BUDGET)):
+        results = run_ticks(budget)
+        print('%-10s %12.1f %10d %8d %8d %10d %10d' % (name, results['longest'] * 1000, results['over'], results['unfed'],
+            results['logged'], results['deferred_processes'], results['deferred_listeners']))
+
+if __name__ == '__main__':
+    main()
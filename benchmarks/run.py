@@ -0,0 +1,451 @@
+'''
+    Runs the benchmarks of the event and process framework and of a full
+    teleop tick, on the stand-in wpilib modules, and saves the results as
+    JSON so a change can be compared against a baseline.
+
+    Run from the root of the project with:
+
+        python -m benchmarks.run --baseline benchmarks/baseline.json
+
+    With --baseline the run fails if any speed is worse than the baseline by
+    more than --threshold, 15% by default, or any allocation result is worse
+    by more than --memory-threshold, 10% by default.
+
+    benchmarks/baseline.json is the baseline of the current code. The speeds
+    in it are only comparable on the machine it was saved on, so on another
+    machine save a baseline of the unchanged code first with
+
+        python -m benchmarks.run --save baseline.json
+
+    and update benchmarks/baseline.json along with changes that are meant to
+    change the results.
+
+    The speed of a Python process can differ by tens of percent from the
+    next one on a busy or virtual machine, so the benchmarks are run in
+    --processes separate processes, 3 by default, and the best result of
+    each is kept. The allocation results don't depend on the machine and are
+    the same every run.
+'''
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from sim import install
+
+install()
+
+from sim.engine import Simulator, reset
+from manager import Process_Manager as Robot_Process_Manager
+from manager.clock import Manual_Clock
+from manager.event_manager import Event_Manager
+from manager.process_manager import Process_Manager
+from processes.input_sampler import Joystick_Sampler
+from common import logitec_controller as lc
+
+# metric -> (higher is better, how much worse than the baseline is always
+# allowed, compared with the memory threshold)
+METRICS = {
+    'ops_per_second' : (True, 0, False),
+    'bytes_per_tick' : (False, 64, True),
+    'net_blocks_per_tick' : (False, 1, True)
+}
+
+BENCHMARKS = []
+
+def benchmark(function):
+    BENCHMARKS.append(function)
+    return function
+
+
+def ops_per_second(function, ops = 1, repeat_seconds = .005, repeat = 25):
+    '''
+        Times many short runs of a function and keeps the fastest, so a run
+        slowed down by something else on the machine doesn't count
+
+        @param ops: The number of operations one call of function does
+        @param repeat_seconds: About how long each run is
+    '''
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < repeat_seconds:
+        number *= 2
+
+    seconds = min(timer.repeat(number = number, repeat = repeat))
+    return ops * number / seconds
+
+def allocations(function, calls = 1000):
+    '''
+        Measures the memory a function allocates while it runs and keeps
+        afterwards. Python doesn't count allocations, so the peak memory
+        above what was in use before each call stands in for the allocations.
+
+        @return: The average bytes allocated and blocks kept per call
+    '''
+    # caches fill up during the first calls
+    for i in range(calls):
+        function()
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    for i in range(calls):
+        function()
+    gc.collect()
+    net_blocks = (sys.getallocatedblocks() - blocks) / calls
+
+    tracemalloc.start()
+    peak = 0
+    for i in range(calls):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        function()
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return peak / calls, net_blocks
+
+
+def listener(data = None):
+    pass
+
+def make_listeners(count):
+    # each listener has to be a different callable
+    return [lambda data = None: None for i in range(count)]
+
+
+@benchmark
+def event_trigger():
+    '''
+        Triggers of an event with 10 listeners
+    '''
+    event_manager = Event_Manager()
+    for callback in make_listeners(10):
+        event_manager.add_listener('teleop.periodic', callback)
+
+    return {'ops_per_second' : ops_per_second(lambda: event_manager.trigger('teleop.periodic'))}
+
+@benchmark
+def event_pattern_trigger():
+    '''
+        Triggers of an event whose 10 listeners are added with a pattern
+    '''
+    event_manager = Event_Manager()
+    for callback in make_listeners(10):
+        event_manager.add_listener('joystick.*.when_pressed', callback)
+
+    return {'ops_per_second' : ops_per_second(lambda: event_manager.trigger('joystick.l_bumper.when_pressed'))}
+
+@benchmark
+def event_listener_churn():
+    '''
+        Adds and removes of a listener, with a trigger after each so the
+        dispatch is recompiled
+    '''
+    event_manager = Event_Manager()
+    for callback in make_listeners(10):
+        event_manager.add_listener('teleop.periodic', callback)
+
+    def churn():
+        event_manager.add_listener('teleop.periodic', listener)
+        event_manager.trigger('teleop.periodic')
+        event_manager.remove_listener('teleop.periodic', listener)
+        event_manager.trigger('teleop.periodic')
+
+    return {'ops_per_second' : ops_per_second(churn, ops = 2)}
+
+@benchmark
+def event_post_drain():
+    '''
+        Posts of coalesced events, drained once per 10 posts
+    '''
+    event_manager = Event_Manager()
+    event_manager.set_coalesce_policy('dashboard.updated', Event_Manager.KEEP_LATEST)
+    event_manager.add_listener('dashboard.updated', listener)
+    keys = ['key%d' % (i % 4) for i in range(10)]
+
+    def post():
+        for key in keys:
+            event_manager.post('dashboard.updated', key, key)
+        event_manager.drain()
+
+    return {'ops_per_second' : ops_per_second(post, ops = 10)}
+
+@benchmark
+def process_tick():
+    '''
+        Process Manager ticks with 100 running processes
+    '''
+    process_manager = Process_Manager()
+    for process in make_listeners(100):
+        process_manager.start(process)
+
+    bytes_per_tick, net_blocks_per_tick = allocations(process_manager.run)
+
+    return {
+        'ops_per_second' : ops_per_second(process_manager.run),
+        'bytes_per_tick' : bytes_per_tick,
+        'net_blocks_per_tick' : net_blocks_per_tick
+    }
+
+@benchmark
+def process_start_finish():
+    '''
+        Starts and finishes of a process
+    '''
+    process_manager = Process_Manager()
+    processes = make_listeners(100)
+
+    def churn():
+        for process in processes:
+            process_manager.start(process)
+        for process in processes:
+            process_manager.finish(process)
+
+    return {'ops_per_second' : ops_per_second(churn, ops = 100)}
+
+@benchmark
+def process_sequence():
+    '''
+        Sequences of 3 processes that each finish when they are started,
+        started and run until they are over
+    '''
+    process_manager = Process_Manager()
+
+    def step(process):
+        return Process_Manager.FINISHED
+
+    steps = (step, lambda process: Process_Manager.FINISHED, lambda process: Process_Manager.FINISHED)
+
+    def run_sequence():
+        process_manager.start_sequence(steps)
+        while process_manager.processes:
+            process_manager.run()
+
+    return {'ops_per_second' : ops_per_second(run_sequence)}
+
+@benchmark
+def process_group_preemption():
+    '''
+        Starts of a process in a group with a default process, each
+        finishing the process started before it
+    '''
+    process_manager = Process_Manager()
+    process_manager.add_group('lift', listener)
+    processes = make_listeners(2)
+
+    def preempt():
+        process_manager.start(processes[0], 'lift')
+        process_manager.start(processes[1], 'lift')
+
+    return {'ops_per_second' : ops_per_second(preempt, ops = 2)}
+
+@benchmark
+def joystick_sampler():
+    '''
+        Ticks of the robot's Process Manager with a Joystick_Sampler for 10
+        buttons and 4 axes, one of the buttons held, and the axes posted and
+        drained like the OI does
+    '''
+    clock = Manual_Clock(0.0)
+    reset(clock)
+    from sim import fakes
+    from manager import Event_Manager as Robot_Event_Manager
+    ds = fakes.Driver_Station.getInstance()
+    joystick = fakes.Joystick(0)
+    buttons = {'button%d' % button : button for button in range(1, 11)}
+
+    for button_name in buttons:
+        for kind in ('when_pressed', 'while_pressed'):
+            Robot_Event_Manager.add_listener('joystick.%s.%s' % (button_name, kind), listener)
+
+    sampler = Joystick_Sampler(joystick, 'joystick', buttons, {
+        'x_left' : lc.L_AXIS_X,
+        'y_left' : lc.L_AXIS_Y,
+        'x_right' : lc.R_AXIS_X,
+        'y_right' : lc.R_AXIS_Y
+    })
+    Robot_Process_Manager.start(sampler, priority = Robot_Process_Manager.CRITICAL)
+    ds.set_button(0, 3, True)
+
+    def tick():
+        clock.advance(.02)
+        Robot_Process_Manager.run()
+        sampler.post_axes()
+        Robot_Event_Manager.drain()
+
+    bytes_per_tick, net_blocks_per_tick = allocations(tick)
+
+    return {
+        'ops_per_second' : ops_per_second(tick),
+        'bytes_per_tick' : bytes_per_tick,
+        'net_blocks_per_tick' : net_blocks_per_tick
+    }
+
+@benchmark
+def teleop_tick():
+    '''
+        Full simulated teleop ticks of the robot with the real OI, Teleop and
+        Drive wiring: the sticks are moving, the lift button is held and the
+        physics model is updated
+    '''
+    simulator = Simulator()
+    simulator.run_mode('disabled', .1)
+    simulator.run_mode('teleop', .1)
+    robot = simulator.robot
+    physics = simulator.physics
+    clock = simulator.clock
+    ds = simulator.ds
+    ticks = [0]
+
+    def tick():
+        ticks[0] += 1
+        phase = ticks[0] % 200
+        ds.set_axis(0, lc.L_AXIS_X, (phase - 100) / 100)
+        ds.set_axis(0, lc.L_AXIS_Y, -.5)
+        ds.set_button(0, lc.L_TRIGGER, phase < 100)
+        clock.advance(.02)
+        robot.teleopPeriodic()
+        physics.update(.02)
+
+    bytes_per_tick, net_blocks_per_tick = allocations(tick)
+
+    return {
+        'ops_per_second' : ops_per_second(tick),
+        'bytes_per_tick' : bytes_per_tick,
+        'net_blocks_per_tick' : net_blocks_per_tick
+    }
+
+
+def run(names = None):
+    '''
+        @param names: The benchmarks to run, all of them if None
+        @return: A dict of benchmark name -> dict of metric -> value
+    '''
+    results = {}
+
+    for function in BENCHMARKS:
+        if names and function.__name__ not in names:
+            continue
+
+        results[function.__name__] = function()
+        # the next benchmark starts without this one's garbage
+        gc.collect()
+
+    return results
+
+def run_processes(names, processes):
+    '''
+        Runs the benchmarks in separate processes
+
+        @return: The best value of each result
+    '''
+    best = {}
+
+    for i in range(processes):
+        output = subprocess.check_output([sys.executable, '-m', 'benchmarks.run', '--json'] + list(names))
+
+        for name, metrics in json.loads(output).items():
+            best_metrics = best.setdefault(name, {})
+
+            for metric, value in metrics.items():
+                higher_is_better = METRICS[metric][0]
+
+                if metric not in best_metrics:
+                    best_metrics[metric] = value
+                elif higher_is_better:
+                    best_metrics[metric] = max(best_metrics[metric], value)
+                else:
+                    best_metrics[metric] = min(best_metrics[metric], value)
+
+    return best
+
+def compare(results, baseline, threshold, memory_threshold):
+    '''
+        @return: A list of (benchmark, metric, value, baseline value, change)
+        of the results worse than the baseline by more than their threshold
+    '''
+    regressions = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+
+            if base is None:
+                continue
+
+            higher_is_better, slack, is_memory = METRICS[metric]
+            allowed = memory_threshold if is_memory else threshold
+            change = (value - base) / base if base else 0.0
+
+            if higher_is_better:
+                worse = value < base * (1 - allowed) - slack
+            else:
+                worse = value > base * (1 + allowed) + slack
+
+            if worse:
+                regressions.append((name, metric, value, base, change))
+
+    return regressions
+
+def format_value(metric, value):
+    if metric == 'ops_per_second':
+        return '%.0f ops/s' % value
+    if metric == 'bytes_per_tick':
+        return '%.0f B/tick' % value
+    return '%.2f blocks/tick' % value
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmarks of the event and process framework')
+    parser.add_argument('--save', help = 'write the results to this JSON file')
+    parser.add_argument('--baseline', help = 'compare the results with this JSON file')
+    parser.add_argument('--threshold', type = float, default = .15,
+                        help = 'the fraction a speed can be worse than the baseline')
+    parser.add_argument('--memory-threshold', type = float, default = .1,
+                        help = 'the fraction an allocation result can be worse than the baseline')
+    parser.add_argument('--processes', type = int, default = 3,
+                        help = 'the number of processes the benchmarks are run in')
+    parser.add_argument('--json', action = 'store_true',
+                        help = 'run the benchmarks in this process and print the results as JSON')
+    parser.add_argument('names', nargs = '*', help = 'the benchmarks to run, all of them by default')
+    args = parser.parse_args()
+
+    if args.json:
+        print(json.dumps(run(args.names)))
+        return
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    results = run_processes(args.names, args.processes)
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            line = '%-26s %-20s %20s' % (name, metric, format_value(metric, value))
+            base = baseline.get(name, {}).get(metric) if baseline else None
+            if base:
+                line += '   %+7.1f%%' % (100 * (value - base) / base)
+            print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'python' : platform.python_version(), 'results' : results}, file, indent = 4, sort_keys = True)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+
+        if regressions:
+            print()
+            print('%d results are worse than the baseline by more than the threshold:' % len(regressions))
+            for name, metric, value, base, change in regressions:
+                print('  %s %s: %s, was %s (%+.1f%%)' % (name, metric, format_value(metric, value),
+                                                       format_value(metric, base), 100 * change))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''
+    Stages that shape driver input before it is sent to the motors. Each stage
+    is called with a value and the seconds since the last tick, and returns
+    the shaped value. The vector stages shape a list of values in place, so
+    the axes of a drive keep their direction while they are limited.
+
+    The settings of every stage are plain attributes, so they can be changed
+    while the robot runs.
+'''
+
+import math
+
+class Deadband:
+
+    '''
+        Values smaller than width become 0, and the rest are rescaled so the
+        output still starts at 0 and ends at 1
+    '''
+
+    def __init__(self, width = 0.0):
+        self.width = width
+
+    def __call__(self, value, dt):
+        width = self.width
+        if not width:
+            return value
+        if -width < value < width:
+            return 0.0
+        if value > 0:
+            return (value - width) / (1 - width)
+        return (value + width) / (1 - width)
+
+
+class Expo:
+
+    '''
+        Blends the value with its cube, giving finer control near the center
+        of the stick. An amount of 0 leaves the value alone and 1 is a pure
+        cube.
+    '''
+
+    def __init__(self, amount = 0.0):
+        self.amount = amount
+
+    def __call__(self, value, dt):
+        amount = self.amount
+        if not amount:
+            return value
+        return amount * value * value * value + (1 - amount) * value
+
+
+class Scale:
+
+    def __init__(self, factor = 1.0):
+        self.factor = factor
+
+    def __call__(self, value, dt):
+        return value * self.factor
+
+
+class Rate_Limit:
+
+    '''
+        Limits how fast the value changes, in units per second
+    '''
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.value = 0.0
+
+    def __call__(self, value, dt):
+        max_change = self.rate * dt
+        current = self.value
+
+        if value > current + max_change:
+            value = current + max_change
+        elif value < current - max_change:
+            value = current - max_change
+
+        self.value = value
+        return value
+
+    def reset(self, value = 0.0):
+        self.value = value
+
+
+class Pipeline:
+
+    '''
+        Runs a value through stages in order
+    '''
+
+    def __init__(self, *stages):
+        self.stages = stages
+
+    def __call__(self, value, dt):
+        for stage in self.stages:
+            value = stage(value, dt)
+        return value
+
+
+class Vector_Rate_Limit:
+
+    '''
+        Limits how fast a vector changes, in units per second. All of the axes
+        are slowed down together so the vector keeps moving toward where it is
+        going, instead of the axis with the farthest to go changing last.
+    '''
+
+    def __init__(self, rate, size):
+        self.rate = rate
+        self.values = [0.0] * size
+
+    def __call__(self, values, dt):
+        current = self.values
+        length = 0.0
+
+        for i in range(len(values)):
+            change = values[i] - current[i]
+            length += change * change
+
+        length = math.sqrt(length)
+        max_change = self.rate * dt
+
+        if length > max_change:
+            scale = max_change / length
+            for i in range(len(values)):
+                current[i] += (values[i] - current[i]) * scale
+                values[i] = current[i]
+        else:
+            current[:] = values
+
+        return values
+
+    def reset(self):
+        for i in range(len(self.values)):
+            self.values[i] = 0.0
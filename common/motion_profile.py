@@ -0,0 +1,79 @@
+'''
+    Motion profiles give the position a mechanism should be at each moment of
+    a move, so it can be sent a setpoint every tick instead of jumping
+    straight to the goal.
+'''
+
+import math
+
+class Trapezoid_Profile:
+
+    '''
+        Speeds up at max_acceleration until it reaches max_velocity, cruises,
+        and slows down at max_acceleration to stop at the goal. Short moves
+        never reach max_velocity and have no cruise.
+    '''
+
+    def __init__(self, start, goal, max_velocity, max_acceleration):
+        self.start = start
+        self.goal = goal
+        self.direction = 1 if goal >= start else -1
+        self.max_acceleration = max_acceleration
+
+        distance = abs(goal - start)
+        accel_time = max_velocity / max_acceleration
+
+        if max_acceleration * accel_time * accel_time > distance:
+            # the move is too short to reach max velocity
+            accel_time = math.sqrt(distance / max_acceleration)
+            max_velocity = max_acceleration * accel_time
+
+        accel_distance = .5 * max_acceleration * accel_time * accel_time
+
+        self.max_velocity = max_velocity
+        self.accel_time = accel_time
+        self.accel_distance = accel_distance
+        self.cruise_time = (distance - 2 * accel_distance) / max_velocity if max_velocity else 0.0
+        self.duration = 2 * accel_time + self.cruise_time
+
+    def get_position(self, time):
+        '''
+            The position the move should be at a number of seconds after it
+            started
+        '''
+        if time <= 0:
+            return self.start
+
+        if time >= self.duration:
+            return self.goal
+
+        accel_time = self.accel_time
+        acceleration = self.max_acceleration
+
+        if time < accel_time:
+            distance = .5 * acceleration * time * time
+        elif time < accel_time + self.cruise_time:
+            distance = self.accel_distance + self.max_velocity * (time - accel_time)
+        else:
+            time_left = self.duration - time
+            distance = abs(self.goal - self.start) - .5 * acceleration * time_left * time_left
+
+        return self.start + self.direction * distance
+
+    def get_velocity(self, time):
+        if time <= 0 or time >= self.duration:
+            return 0.0
+
+        accel_time = self.accel_time
+
+        if time < accel_time:
+            velocity = self.max_acceleration * time
+        elif time < accel_time + self.cruise_time:
+            velocity = self.max_velocity
+        else:
+            velocity = self.max_acceleration * (self.duration - time)
+
+        return self.direction * velocity
+
+    def is_finished(self, time):
+        return time >= self.duration
@@ -0,0 +1,180 @@
+'''
+    Autonomous routines are declared with the autonomous decorator in the
+    modules of a package:
+
+        @autonomous('Move Forward')
+        def move_forward(robot, process):
+            ...
+
+    A routine is a process function called with the robot and its Process
+    Data, or a class that is created with the robot and is a process itself.
+
+    Routine_Registry finds the routines of a package by reading the source of
+    its modules, without importing them, so the dashboard can list every
+    routine at startup. A routine's module is only imported when the routine
+    is built.
+'''
+
+import ast
+import functools
+import importlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# routine name -> routine, of the routine modules that have been imported
+loaded_routines = {}
+
+def autonomous(name, default = False):
+    '''
+        Declares an autonomous routine
+
+        @param name: The name the routine is listed with on the dashboard
+        @param default: The routine is selected until another one is chosen
+    '''
+    def register(routine):
+        routine.autonomous_name = name
+        routine.autonomous_default = default
+        loaded_routines[name] = routine
+        return routine
+
+    return register
+
+
+class Routine_Info:
+
+    __slots__ = ('name', 'module', 'attribute', 'default')
+
+    def __init__(self, name, module, attribute, default):
+        self.name = name
+        # the module the routine is declared in, and its name in the module
+        self.module = module
+        self.attribute = attribute
+        # None if it isn't known until the routine is loaded
+        self.default = default
+
+
+class Routine_Registry:
+
+    def __init__(self, package):
+        '''
+            @param package: The name of the package the routines are in
+        '''
+        self.package = package
+        # routine name -> Routine_Info, in the order they were found
+        self.routines = {}
+        self.scan()
+
+    def scan(self):
+        '''
+            Finds the routines declared in the modules of the package
+        '''
+        self.routines.clear()
+
+        for directory in importlib.import_module(self.package).__path__:
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith('.py') and file_name != '__init__.py':
+                    self._scan_module(os.path.join(directory, file_name), '%s.%s' % (self.package, file_name[:-3]))
+
+    def _scan_module(self, path, module):
+        with open(path, encoding = 'utf-8') as file:
+            source = file.read()
+
+        # most modules can be skipped without being parsed
+        if 'autonomous(' not in source:
+            return
+
+        for node in ast.parse(source, path).body:
+            if not isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                continue
+
+            for decorator in node.decorator_list:
+                if not isinstance(decorator, ast.Call):
+                    continue
+
+                function = decorator.func
+                function_name = function.attr if isinstance(function, ast.Attribute) else getattr(function, 'id', None)
+
+                if function_name != 'autonomous' or not decorator.args:
+                    continue
+
+                name = self._literal(decorator.args[0])
+
+                if not isinstance(name, str):
+                    # only known when the module is imported, too late for the dashboard
+                    logger.warning('skipping routine %s in %s, its name is not a string literal', node.name, path)
+                    continue
+
+                default = False
+
+                for keyword in decorator.keywords:
+                    if keyword.arg == 'default':
+                        default = self._literal(keyword.value)
+
+                if len(decorator.args) > 1:
+                    default = self._literal(decorator.args[1])
+
+                self.routines[name] = Routine_Info(name, module, node.name, default)
+
+    @staticmethod
+    def _literal(node):
+        '''
+            @return: The value of a literal, or None if it is an expression
+            that is only known when the module is imported
+        '''
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            return None
+
+    def get_names(self):
+        return list(self.routines)
+
+    def get_default(self):
+        '''
+            Finds the default routine. Routines whose default is an expression
+            are loaded to find out if they are the default.
+
+            @return: The name of the default routine, or None if there isn't one
+        '''
+        for info in self.routines.values():
+            if info.default is None:
+                self.load(info.name)
+
+            if info.default:
+                return info.name
+
+        return None
+
+    def load(self, name):
+        '''
+            Imports the module of a routine
+
+            @return: The routine
+        '''
+        routine = loaded_routines.get(name)
+
+        if routine is None:
+            importlib.import_module(self.routines[name].module)
+            routine = loaded_routines[name]
+
+        # the decorator has the final say on whether the routine is the default
+        info = self.routines.get(name)
+        if info is not None:
+            info.default = bool(routine.autonomous_default)
+
+        return routine
+
+    def build(self, name, robot):
+        '''
+            Creates the process of a routine
+
+            @return: A process that runs the routine
+        '''
+        routine = self.load(name)
+
+        if isinstance(routine, type):
+            return routine(robot)
+
+        return functools.update_wrapper(functools.partial(routine, robot), routine)
@@ -0,0 +1,142 @@
+from manager import Process_Manager
+
+class Cached_Output:
+
+    '''
+        Wraps a motor controller or solenoid so that writing the value it was
+        last sent again is skipped instead of going out over the CAN bus. Each
+        kind of write (the setpoint, the control mode, the brake mode, ...) is
+        cached on its own. A value that hasn't changed is still sent again
+        once refresh_period seconds have passed since it was last sent, in case
+        the device missed it or was reset.
+
+        Anything that isn't cached is passed through to the wrapped output, so
+        the wrapper can be used wherever the output was.
+    '''
+
+    # seconds after which an unchanged value is sent again
+    refresh_period = .5
+
+    # writes sent and skipped by every cached output
+    total_writes = 0
+    total_suppressed = 0
+
+    def __init__(self, output):
+        self.output = output
+        # write name -> (value last sent, time it was sent)
+        self.sent = {}
+        self.writes = 0
+        self.suppressed = 0
+
+    def __getattr__(self, name):
+        return getattr(self.output, name)
+
+    def _write(self, key, value, write, *args):
+        '''
+            Calls write with args unless value was sent for key less than
+            refresh_period ago
+
+            @return: True if the write was sent
+        '''
+        now = Process_Manager.now
+        sent = self.sent.get(key)
+
+        if sent is not None and sent[0] == value and now - sent[1] < self.refresh_period:
+            self.suppressed += 1
+            Cached_Output.total_suppressed += 1
+            return False
+
+        write(*args)
+        self.sent[key] = (value, now)
+        self.writes += 1
+        Cached_Output.total_writes += 1
+        return True
+
+    def invalidate(self, key = None):
+        '''
+            Forgets what was sent, so the next write is sent whatever its value
+
+            @param key: The write to forget, or None to forget all of them
+        '''
+        if key is None:
+            self.sent.clear()
+        else:
+            self.sent.pop(key, None)
+
+
+class Cached_Speed_Controller(Cached_Output):
+
+    '''
+        A speed controller whose setpoint is only sent when it changes. The
+        setpoint is set every tick, so it is cached in attributes instead of
+        through _write.
+    '''
+
+    def __init__(self, output):
+        super().__init__(output)
+        self.setpoint = None
+        self.setpoint_time = 0.0
+
+    def set(self, speed, syncGroup = 0):
+        now = Process_Manager.now
+
+        if speed == self.setpoint and now - self.setpoint_time < self.refresh_period:
+            self.suppressed += 1
+            Cached_Output.total_suppressed += 1
+            return
+
+        self.output.set(speed, syncGroup)
+        self.setpoint = speed
+        self.setpoint_time = now
+        self.writes += 1
+        Cached_Output.total_writes += 1
+
+    def invalidate(self, key = None):
+        super().invalidate(key)
+
+        if key is None or key == 'set':
+            self.setpoint = None
+
+    def disable(self):
+        self.invalidate('set')
+        self.output.disable()
+
+
+class Cached_CAN_Talon(Cached_Speed_Controller):
+
+    '''
+        A CANTalon whose setpoint, control mode, brake mode and PID gains are
+        only sent when they change
+    '''
+
+    def changeControlMode(self, mode):
+        if self._write('mode', mode, self.output.changeControlMode, mode):
+            # the setpoint means something else in the new mode
+            self.invalidate('set')
+
+    def enableBrakeMode(self, brake):
+        self._write('brake', brake, self.output.enableBrakeMode, brake)
+
+    def setPID(self, p, i, d, *args):
+        if self._write('pid', (p, i, d) + args, self.output.setPID, p, i, d, *args):
+            self.invalidate('p')
+            self.invalidate('i')
+            self.invalidate('d')
+
+    def setP(self, p):
+        if self._write('p', p, self.output.setP, p):
+            self.invalidate('pid')
+
+    def setI(self, i):
+        if self._write('i', i, self.output.setI, i):
+            self.invalidate('pid')
+
+    def setD(self, d):
+        if self._write('d', d, self.output.setD, d):
+            self.invalidate('pid')
+
+
+class Cached_Solenoid(Cached_Output):
+
+    def set(self, value):
+        self._write('set', value, self.output.set, value)
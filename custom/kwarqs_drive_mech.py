@@ -1,19 +1,34 @@
-import wpilib
-import hal
-from wpilib import RobotDrive
+from manager import record_output, hardware
+from custom.mecanum_kinematics import Mecanum_Kinematics
+from custom.cached_outputs import Cached_Speed_Controller
 
-class KwarqsDriveMech(RobotDrive):
+class KwarqsDriveMech(hardware.RobotDrive):
     
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # a wheel that keeps turning at the same speed isn't sent it again
+        self.frontLeftMotor = Cached_Speed_Controller(self.frontLeftMotor)
+        self.frontRightMotor = Cached_Speed_Controller(self.frontRightMotor)
+        self.rearLeftMotor = Cached_Speed_Controller(self.rearLeftMotor)
+        self.rearRightMotor = Cached_Speed_Controller(self.rearRightMotor)
         self.weight_multiplier = 1
+        self.kinematics = Mecanum_Kinematics(self.invertedMotors, self.weight_multiplier, self.maxOutput)
         
     def set_multiplier(self, in_multi = None):
         if in_multi != None :
             self.weight_multiplier = in_multi
         else:
             self.weight_multiplier = 1
+        self.kinematics.set_weight_multiplier(self.weight_multiplier)
+        
+    def setInvertedMotor(self, motor, isInverted):
+        super().setInvertedMotor(motor, isInverted)
+        self.kinematics.set_inverted(motor, isInverted)
+        
+    def setMaxOutput(self, maxOutput):
+        super().setMaxOutput(maxOutput)
+        self.kinematics.set_max_output(maxOutput)
         
     def mecanumDrive_Cartesian(self, x, y, rotation, gyroAngle):
         """Drive method for Mecanum wheeled robots.
@@ -35,33 +50,27 @@ class KwarqsDriveMech(RobotDrive):
         :param gyroAngle: The current angle reading from the gyro.  Use this
             to implement field-oriented controls.
         """
-        if not wpilib.RobotDrive.kMecanumCartesian_Reported:
-            hal.HALReport(hal.HALUsageReporting.kResourceType_RobotDrive,
-                          self.getNumMotors(),
-                          hal.HALUsageReporting.kRobotDrive_MecanumCartesian)
-            RobotDrive.kMecanumCartesian_Reported = True
-        xIn = x
-        yIn = y
-        # Negate y for the joystick.
-        yIn = -yIn
-        # Compenstate for gyro angle.
-        xIn, yIn = RobotDrive.rotateVector(xIn, yIn, gyroAngle)
-
-        wheelSpeeds = [0]*self.kMaxNumberOfMotors
-        wheelSpeeds[self.MotorType.kFrontLeft] = xIn + yIn + rotation 
-        wheelSpeeds[self.MotorType.kFrontRight] = -xIn + yIn - rotation
-        wheelSpeeds[self.MotorType.kRearLeft] = -xIn + yIn + ( rotation * self.weight_multiplier )
-        wheelSpeeds[self.MotorType.kRearRight] = xIn + yIn - ( rotation * self.weight_multiplier )
-
-        RobotDrive.normalize(wheelSpeeds)
-
-
-        self.frontLeftMotor.set(wheelSpeeds[self.MotorType.kFrontLeft] * self.invertedMotors[self.MotorType.kFrontLeft] * self.maxOutput, self.syncGroup)
-        self.frontRightMotor.set(wheelSpeeds[self.MotorType.kFrontRight] * self.invertedMotors[self.MotorType.kFrontRight] * self.maxOutput, self.syncGroup)
-        self.rearLeftMotor.set(wheelSpeeds[self.MotorType.kRearLeft] * self.invertedMotors[self.MotorType.kRearLeft] * self.maxOutput, self.syncGroup)
-        self.rearRightMotor.set(wheelSpeeds[self.MotorType.kRearRight] * self.invertedMotors[self.MotorType.kRearRight] * self.maxOutput, self.syncGroup)
+        if not self.kMecanumCartesian_Reported:
+            usage = hardware.HALUsageReporting
+            hardware.HALReport(usage.kResourceType_RobotDrive,
+                               self.getNumMotors(),
+                               usage.kRobotDrive_MecanumCartesian)
+            hardware.RobotDrive.kMecanumCartesian_Reported = True
+            
+        front_left, front_right, rear_left, rear_right = self.kinematics.compute(x, y, rotation, gyroAngle)
+        
+        record_output('drive.front_left', front_left)
+        record_output('drive.front_right', front_right)
+        record_output('drive.rear_left', rear_left)
+        record_output('drive.rear_right', rear_right)
+        
+        syncGroup = self.syncGroup
+        self.frontLeftMotor.set(front_left, syncGroup)
+        self.frontRightMotor.set(front_right, syncGroup)
+        self.rearLeftMotor.set(rear_left, syncGroup)
+        self.rearRightMotor.set(rear_right, syncGroup)
 
         if self.syncGroup != 0:
-            wpilib.CANJaguar.updateSyncGroup(self.syncGroup)
+            hardware.CANJaguar.updateSyncGroup(self.syncGroup)
         self.feed()
     
\ No newline at end of file
@@ -0,0 +1,137 @@
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Mecanum_Kinematics:
+
+    '''
+        Turns the x, y and rotation speeds of a mecanum drive into the outputs
+        of its four motors, in the order front left, front right, rear left,
+        rear right.
+
+        The mixing matrix includes the rotation weight of the rear wheels and
+        the inverted motor signs, and is only rebuilt when they change. The
+        sine and cosine of the gyro angle are only recalculated when the angle
+        changes. compute reuses one list for its result, and compute_batch
+        works on whole arrays with numpy if it is installed.
+    '''
+
+    FRONT_LEFT = 0
+    FRONT_RIGHT = 1
+    REAR_LEFT = 2
+    REAR_RIGHT = 3
+
+    def __init__(self, inverted = (1, 1, 1, 1), weight_multiplier = 1, max_output = 1.0):
+        '''
+            @param inverted: 1 or -1 for each motor
+            @param weight_multiplier: How much the rear wheels turn compared to
+            the front wheels
+            @param max_output: The outputs are scaled by this
+        '''
+        self.inverted = list(inverted)
+        self.weight_multiplier = weight_multiplier
+        self.max_output = max_output
+        self.outputs = [0.0] * 4
+        self.angle = 0.0
+        self.cos_angle = 1.0
+        self.sin_angle = 0.0
+        self.update_matrix()
+
+    def update_matrix(self):
+        '''
+            Builds the rows of (x, y, rotation) coefficients of each motor
+        '''
+        inverted = self.inverted
+        weight = self.weight_multiplier
+        self.matrix = (
+            (inverted[0], inverted[0], inverted[0]),
+            (-inverted[1], inverted[1], -inverted[1]),
+            (-inverted[2], inverted[2], weight * inverted[2]),
+            (inverted[3], inverted[3], -weight * inverted[3])
+        )
+        self._numpy_matrix = None
+
+    def set_inverted(self, motor, is_inverted):
+        sign = -1 if is_inverted else 1
+        if self.inverted[motor] != sign:
+            self.inverted[motor] = sign
+            self.update_matrix()
+
+    def set_weight_multiplier(self, weight_multiplier):
+        if self.weight_multiplier != weight_multiplier:
+            self.weight_multiplier = weight_multiplier
+            self.update_matrix()
+
+    def set_max_output(self, max_output):
+        self.max_output = max_output
+
+    def compute(self, x, y, rotation, angle = 0.0):
+        '''
+            Computes the motor outputs. y is negated to match the forward ==
+            -1 of joysticks, and x and y are rotated by the gyro angle in
+            degrees for field oriented driving.
+
+            @return: The list of motor outputs, which is reused by the next call
+        '''
+        if angle != self.angle:
+            radians = math.radians(angle)
+            self.angle = angle
+            self.cos_angle = math.cos(radians)
+            self.sin_angle = math.sin(radians)
+
+        y = -y
+        cos_angle = self.cos_angle
+        sin_angle = self.sin_angle
+        x, y = x * cos_angle - y * sin_angle, x * sin_angle + y * cos_angle
+
+        (fl_x, fl_y, fl_r), (fr_x, fr_y, fr_r), (rl_x, rl_y, rl_r), (rr_x, rr_y, rr_r) = self.matrix
+        front_left = fl_x * x + fl_y * y + fl_r * rotation
+        front_right = fr_x * x + fr_y * y + fr_r * rotation
+        rear_left = rl_x * x + rl_y * y + rl_r * rotation
+        rear_right = rr_x * x + rr_y * y + rr_r * rotation
+
+        # the signs of the inverted motors don't change the largest magnitude
+        largest = max(abs(front_left), abs(front_right), abs(rear_left), abs(rear_right))
+        scale = self.max_output / largest if largest > 1.0 else self.max_output
+
+        outputs = self.outputs
+        outputs[0] = front_left * scale
+        outputs[1] = front_right * scale
+        outputs[2] = rear_left * scale
+        outputs[3] = rear_right * scale
+        return outputs
+
+    def compute_batch(self, x, y, rotation, angle = 0.0):
+        '''
+            Computes the motor outputs for arrays of inputs. angle can be an
+            array or one angle for all of the inputs.
+
+            @return: An array of shape (n, 4) if numpy is installed, otherwise a
+            list of n tuples of 4 outputs
+        '''
+        if numpy is None:
+            count = len(x)
+            angles = angle if hasattr(angle, '__len__') else [angle] * count
+            return [tuple(self.compute(x[i], y[i], rotation[i], angles[i])) for i in range(count)]
+
+        if self._numpy_matrix is None:
+            self._numpy_matrix = numpy.array(self.matrix, dtype = float).T
+
+        x = numpy.asarray(x, dtype = float)
+        y = -numpy.asarray(y, dtype = float)
+        radians = numpy.radians(angle)
+        cos_angle = numpy.cos(radians)
+        sin_angle = numpy.sin(radians)
+
+        inputs = numpy.empty((len(x), 3))
+        inputs[:, 0] = x * cos_angle - y * sin_angle
+        inputs[:, 1] = x * sin_angle + y * cos_angle
+        inputs[:, 2] = rotation
+
+        outputs = inputs @ self._numpy_matrix
+        largest = numpy.abs(outputs).max(axis = 1, keepdims = True)
+        outputs *= self.max_output / numpy.maximum(largest, 1.0)
+        return outputs
@@ -1,24 +1,95 @@
 from .event_manager import Event_Manager as EM
 from .process_manager import Process_Manager as PM
-from wpilib import IterativeRobot
+from .profiler import Profiler
+from .telemetry import Telemetry as TM
+from .recorder import Flight_Recorder, read_recording
+from .snapshot import Snapshot
+from .parameters import Parameter_Store
+from .coroutines import wait_seconds, wait_until, wait_event
+from .combinators import sequence, parallel, race, timeout, repeat
+from . import hardware
 
 Event_Manager = EM()
-Process_Manager = PM()
+Process_Manager = PM(event_manager = Event_Manager)
+Telemetry = TM()
+Parameters = Parameter_Store(Event_Manager, Process_Manager, Telemetry)
 
-class EventRobot(IterativeRobot):
-    
-    def __init__(self):
-        super().__init__()
-        Event_Manager.remove_all_listeners()
-    
-    def autonomousInit(self):
-        Event_Manager.trigger('auto.init')      
+def enable_profiling(budget = .02, **kwargs):
+    '''
+        Starts profiling the events, listeners and processes. Ticks that take
+        longer than the budget in seconds are recorded as overruns.
+        
+        @return: The Profiler the results can be queried from
+    '''
+    profiler = Profiler(budget, **kwargs)
+    Event_Manager.set_profiler(profiler)
+    Process_Manager.set_profiler(profiler)
+    return profiler
+
+def disable_profiling(path = None):
+    '''
+        Stops profiling, and writes the results to a file if a path is given.
+        See Profiler.dump for the file formats.
+        
+        @return: The Profiler the results can be queried from
+    '''
+    profiler = Event_Manager.profiler or Process_Manager.profiler
+    Event_Manager.set_profiler(None)
+    Process_Manager.set_profiler(None)
     
-    def autonomousPeriodic(self):
-        Event_Manager.trigger('auto.periodic')
+    if profiler:
+        profiler.end_tick()
+        if path:
+            profiler.dump(path)
+        
+    return profiler
+
+def start_recording(path, **kwargs):
+    '''
+        Starts recording the triggered events, process state changes and
+        published telemetry to a flight recorder file. See Flight_Recorder for
+        the options and read_recording to read the file.
+        
+        @return: The Flight_Recorder
+    '''
+    stop_recording()
+    recorder = Flight_Recorder(path, Process_Manager, **kwargs)
+    Event_Manager.set_recorder(recorder)
+    Process_Manager.set_recorder(recorder)
+    Telemetry.set_recorder(recorder)
+    return recorder
+
+def stop_recording():
+    '''
+        Stops recording and closes the flight recorder file
+        
+        @return: The Flight_Recorder that was recording, if there was one
+    '''
+    recorder = Event_Manager.recorder
+    Event_Manager.set_recorder(None)
+    Process_Manager.set_recorder(None)
+    Telemetry.set_recorder(None)
     
-    def teleopInit(self):
-        Event_Manager.trigger('teleop.init')
+    if recorder:
+        recorder.close()
+        
+    return recorder
+
+def record_output(name, value):
+    '''
+        Records a value written to a motor or solenoid if recording, so
+        replays can be compared with the match they were recorded from
+    '''
+    recorder = Event_Manager.recorder
     
-    def teleopPeriodic(self):
-        Event_Manager.trigger('teleop.periodic')
\ No newline at end of file
+    if recorder is not None:
+        recorder.record_output(name, value)
+
+def __getattr__(name):
+    # the robot base class is imported when it is used, so importing the
+    # framework doesn't import wpilib
+    if name == 'EventRobot':
+        from .robot import EventRobot
+        return EventRobot
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,31 @@
+import time
+
+class Monotonic_Clock:
+    
+    '''
+        Reads the time from a clock that only moves forward, so it doesn't jump
+        when the system clock is synced with the driver station
+    '''
+    
+    def now(self):
+        return time.monotonic()
+
+
+class Manual_Clock:
+    
+    '''
+        A clock that only moves when it is told to. Used to run the robot code
+        deterministically in tests and simulations.
+    '''
+    
+    def __init__(self, start_time = 0.0):
+        self.time = start_time
+        
+    def now(self):
+        return self.time
+    
+    def set(self, time):
+        self.time = time
+        
+    def advance(self, seconds):
+        self.time += seconds
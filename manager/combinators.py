@@ -0,0 +1,220 @@
+from .coroutines import Wait, Wait_Seconds
+
+class Wait_Children(Wait):
+
+    '''
+        Parks a composite process until one of its children finishes. Composite
+        processes aren't run every tick, the Process Manager tells them when a
+        child finishes instead.
+    '''
+
+    __slots__ = ()
+
+    def park(self, manager, process_data):
+        pass
+
+WAIT_CHILDREN = Wait_Children()
+
+
+class Composite:
+
+    '''
+        A process made of other processes. The children are started by the
+        Process Manager with the composite as their parent. When the composite
+        finishes or is interrupted so are its children, and when a child
+        finishes on its own the composite decides what runs next.
+    '''
+
+    def __init__(self, processes):
+        self.processes = tuple(processes)
+
+    def __call__(self, process_data):
+
+        state = process_data.state
+        manager = process_data.manager
+
+        if state is manager.STARTED:
+            process_data.step = 0
+            self.start(manager, process_data)
+
+        elif state is manager.RUNNING:
+            return self.run(manager, process_data)
+
+        elif state is not manager.RESUMED:
+            return None
+
+        # the composite may have finished or parked itself already
+        if process_data.state is state and process_data.waiting is None:
+            return self.wait(process_data)
+
+    def wait(self, process_data):
+        '''
+            The Wait the composite is parked on while its children run
+        '''
+        return WAIT_CHILDREN
+
+    def start(self, manager, process_data):
+        '''
+            Starts the children when the composite is started
+        '''
+        pass
+
+    def run(self, manager, process_data):
+        '''
+            Called when a wait returned by the composite is over
+        '''
+        return WAIT_CHILDREN
+
+    def child_finished(self, manager, process_data, child):
+        '''
+            Called when a child finishes on its own
+        '''
+        pass
+
+
+class Sequence(Composite):
+
+    '''
+        Runs processes one after the other
+    '''
+
+    def start(self, manager, process_data):
+        if self.processes:
+            manager._start_child(process_data, self.processes[0])
+        else:
+            manager._finish(process_data)
+
+    def child_finished(self, manager, process_data, child):
+        process_data.step += 1
+
+        if process_data.step < len(self.processes):
+            manager._start_child(process_data, self.processes[process_data.step])
+        else:
+            manager._finish(process_data)
+
+
+class Parallel(Composite):
+
+    '''
+        Runs processes at the same time and finishes when all of them have
+    '''
+
+    def start(self, manager, process_data):
+        for process in self.processes:
+            # a child may have finished the composite while it was started
+            if process_data.state is manager.FINISHED:
+                return
+            process_data.step += 1
+            manager._start_child(process_data, process)
+
+        if not process_data.children:
+            manager._finish(process_data)
+
+    def child_finished(self, manager, process_data, child):
+        if process_data.step == len(self.processes) and not process_data.children:
+            manager._finish(process_data)
+
+
+class Race(Parallel):
+
+    '''
+        Runs processes at the same time and finishes when the first of them
+        does. The others are finished with it.
+    '''
+
+    def child_finished(self, manager, process_data, child):
+        manager._finish(process_data)
+
+
+class Timeout(Composite):
+
+    '''
+        Runs a process and finishes it if it takes longer than a number of
+        seconds
+    '''
+
+    def __init__(self, seconds, process):
+        super().__init__((process,))
+        self.seconds = seconds
+
+    def start(self, manager, process_data):
+        manager._start_child(process_data, self.processes[0])
+
+    def wait(self, process_data):
+        return Wait_Seconds(self.seconds - process_data.time_since_start)
+
+    def run(self, manager, process_data):
+        # the time is up
+        return manager.FINISHED
+
+    def child_finished(self, manager, process_data, child):
+        manager._finish(process_data)
+
+
+class Repeat(Composite):
+
+    '''
+        Runs a process again every time it finishes, forever or a number of
+        times. A process that finishes in the tick it started is started again
+        on the next tick.
+    '''
+
+    def __init__(self, process, times = None):
+        super().__init__((process,))
+        self.times = times
+
+    def start(self, manager, process_data):
+        if self.times == 0:
+            manager._finish(process_data)
+        else:
+            manager._start_child(process_data, self.processes[0])
+
+    def run(self, manager, process_data):
+        manager._start_child(process_data, self.processes[0])
+
+        if process_data.state is manager.RUNNING and process_data.waiting is None:
+            return WAIT_CHILDREN
+
+    def child_finished(self, manager, process_data, child):
+        process_data.step += 1
+
+        if self.times is not None and process_data.step >= self.times:
+            manager._finish(process_data)
+        elif child.start_time == manager.now:
+            manager._handle_result(process_data, Wait_Seconds(0))
+        else:
+            manager._start_child(process_data, self.processes[0])
+
+
+def sequence(*processes):
+    '''
+        Creates a process that runs processes one after the other
+    '''
+    return Sequence(processes)
+
+def parallel(*processes):
+    '''
+        Creates a process that runs processes at the same time until all of
+        them finish
+    '''
+    return Parallel(processes)
+
+def race(*processes):
+    '''
+        Creates a process that runs processes at the same time until one of
+        them finishes
+    '''
+    return Race(processes)
+
+def timeout(seconds, process):
+    '''
+        Creates a process that runs a process for at most a number of seconds
+    '''
+    return Timeout(seconds, process)
+
+def repeat(process, times = None):
+    '''
+        Creates a process that runs a process over and over, forever or a
+        number of times
+    '''
+    return Repeat(process, times)
@@ -0,0 +1,114 @@
+
+class Wait:
+
+    '''
+        Something a process is waiting for. A process can return a Wait, or a
+        generator or coroutine process can yield or await one, and the Process
+        Manager won't run the process again until the wait is over.
+    '''
+
+    __slots__ = ()
+
+    def __await__(self):
+        return (yield self)
+
+    def park(self, manager, process_data):
+        '''
+            Called by the Process Manager to put a process in the index of the
+            processes that are waiting for the same kind of thing
+        '''
+        raise NotImplementedError()
+
+
+class Wait_Seconds(Wait):
+
+    __slots__ = ('seconds',)
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def park(self, manager, process_data):
+        manager._park_timer(process_data, manager.now + self.seconds)
+
+
+class Wait_Until(Wait):
+
+    __slots__ = ('condition',)
+
+    def __init__(self, condition):
+        self.condition = condition
+
+    def park(self, manager, process_data):
+        manager._park_condition(process_data)
+
+
+class Wait_Event(Wait):
+
+    __slots__ = ('event_name',)
+
+    def __init__(self, event_name):
+        self.event_name = event_name
+
+    def park(self, manager, process_data):
+        manager._park_event(process_data, self.event_name)
+
+
+def wait_seconds(seconds):
+    '''
+        Waits for a number of seconds
+    '''
+    return Wait_Seconds(seconds)
+
+def wait_until(condition):
+    '''
+        Waits until a function returns True. The function is called once per tick.
+    '''
+    return Wait_Until(condition)
+
+def wait_event(event_name):
+    '''
+        Waits until an event is triggered. The wait returns the event data.
+    '''
+    return Wait_Event(event_name)
+
+
+class Coroutine_Process:
+
+    '''
+        Runs a generator function or an async def function as a process. The
+        function is called with the Process Data when the process is started,
+        and the generator or coroutine is resumed every tick until it yields or
+        awaits a Wait, which parks the process until the wait is over. The
+        process finishes when the function returns.
+    '''
+
+    def __init__(self, function):
+        self.function = function
+        self.__qualname__ = getattr(function, '__qualname__', type(function).__qualname__)
+
+    def __call__(self, process_data):
+
+        state = process_data.state
+        manager = process_data.manager
+
+        if state is manager.RUNNING:
+            value = process_data.resume_value
+            process_data.resume_value = None
+            return self._step(process_data, value)
+
+        elif state is manager.STARTED:
+            process_data.coroutine = self.function(process_data)
+            return self._step(process_data, None)
+
+        elif state is manager.FINISHED:
+            coroutine = process_data.coroutine
+            if coroutine is not None:
+                process_data.coroutine = None
+                coroutine.close()
+
+    def _step(self, process_data, value):
+        try:
+            return process_data.coroutine.send(value)
+        except StopIteration:
+            process_data.coroutine = None
+            return process_data.manager.FINISHED
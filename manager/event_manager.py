@@ -1,46 +1,580 @@
 
-class Event_Manager:
+from . import priority
+
+class _Pattern_Node:
+
+    '''
+        A node in the trie of event name segments that wildcard listeners are
+        registered in
+    '''
+
+    __slots__ = ('children', 'listeners')
 
     def __init__(self):
-        self.uid = 1
+        # segment, '*' or '**' -> _Pattern_Node
+        self.children = {}
+        # callback -> priority and registration order, see Event_Manager
         self.listeners = {}
-    
-    def add_listener(self, event_name, callback):
-        
-        uid = self.uid = self.uid + 1
-        
-        if event_name not in self.listeners:
-            self.listeners[event_name] = []
-        
-        if callback not in self.listeners[event_name]:
-            self.listeners[event_name].append(callback)
-      
+
+
+class _Deferrable_Listener:
+
+    '''
+        Calls a BACKGROUND listener, or puts the call off to the next drain if
+        the tick is over its budget
+    '''
+
+    def __init__(self, event_manager, callback):
+        self.event_manager = event_manager
+        self.callback = callback
+        # profiles show the listener
+        self.__qualname__ = getattr(callback, '__qualname__', type(callback).__qualname__)
+
+    def __call__(self, event_data):
+        event_manager = self.event_manager
+        over_budget = event_manager.over_budget
+
+        if over_budget is not None and over_budget():
+            event_manager._deferred_calls.append((self.callback, event_data, 1))
+            event_manager.deferred_listeners += 1
+        else:
+            self.callback(event_data)
+
+
+def _no_listeners(event_data):
+    pass
+
+
+def _fuse(callbacks):
+    '''
+        Makes the function trigger calls for a tuple of callbacks. Events
+        with no callbacks share a function that does nothing, which trigger
+        skips calling. A single callback is called directly, and two or three
+        are called from a closure so triggering doesn't go through a loop.
+        More than that are looped over in a closure, where unrolling would
+        only save a little and cost recompiling more.
+
+        @return: a function called with the event data
+    '''
+    count = len(callbacks)
+
+    if count == 0:
+        return _no_listeners
+
+    if count == 1:
+        return callbacks[0]
+
+    if count == 2:
+        first, second = callbacks
+        def dispatch(event_data):
+            first(event_data)
+            second(event_data)
+
+    elif count == 3:
+        first, second, third = callbacks
+        def dispatch(event_data):
+            first(event_data)
+            second(event_data)
+            third(event_data)
+
+    else:
+        def dispatch(event_data):
+            for callback in callbacks:
+                callback(event_data)
+
+    return dispatch
+
+
+class Event_Manager:
+
+    '''
+        Calls listeners when events are triggered. Event names are dotted
+        hierarchies like 'joystick.l_bumper.when_pressed'. Listeners can be
+        added for an exact event name or for a pattern where '*' matches one
+        segment and '**' matches zero or more segments, e.g.
+        'joystick.*.when_pressed' or 'joystick.**'.
+
+        The listeners an event name resolves to are compiled into a tuple and
+        a function that calls them the first time the event is triggered, and
+        reused until the listeners change, so patterns are only matched once
+        per event name.
+
+        Events can also be posted to a queue instead of being triggered right
+        away. The queue is drained once per robot loop, and events that only
+        matter for their latest value can be coalesced so listeners are called
+        once per loop no matter how many times the event was posted.
+
+        Listeners are called in order of priority, and in the order they were
+        added within a priority. BACKGROUND listeners are called in the next
+        drain instead if the tick is over its budget.
+    '''
+
+    # Every posted event is delivered
+    KEEP_ALL = 1
+    # Only the latest data posted for an event is delivered, in the place of
+    # the first post that hasn't been delivered yet
+    KEEP_LATEST = 2
+
+    CRITICAL = priority.CRITICAL
+    NORMAL = priority.NORMAL
+    BACKGROUND = priority.BACKGROUND
+
+    # The order of a listener is its priority times ORDER_SPAN plus the order
+    # it was added in, so sorting listeners by it sorts them by priority and
+    # then by when they were added
+    ORDER_SPAN = 1 << 48
+
+    # The most ticks a BACKGROUND listener call is deferred before it is made
+    # anyway. The Process Manager sets it to its own limit.
+    max_deferred_ticks = 10
+
+    def __init__(self, queue_size = 256):
+        # event name -> dict of callback -> order
+        self.listeners = {}
+        # root of the trie holding the pattern listeners
+        self.patterns = _Pattern_Node()
+        # event name -> tuple of callbacks it resolves to
+        self._compiled = {}
+        # event name -> function trigger calls with the event data, see _fuse
+        self._dispatch = {}
+        self._order = 0
+        # changes every time a listener is added or removed
+        self.version = 0
+        # the number of listeners that aren't NORMAL, while there are none
+        # compiling doesn't need to sort by priority
+        self.prioritized = 0
+        # callback -> the _Deferrable_Listener it is called through if it is
+        # a BACKGROUND listener
+        self._deferrable = {}
+
+        # event name -> KEEP_ALL or KEEP_LATEST
+        self.coalesce_policies = {}
+        # ring buffer of posted events
+        self.queue_size = queue_size
+        self._queue_names = [None] * queue_size
+        self._queue_data = [None] * queue_size
+        self._queue_keys = [None] * queue_size
+        self._queue_head = 0
+        self._queue_length = 0
+        # coalescing key -> index of the queued event it is delivered in
+        self._queue_latest = {}
+        # events thrown away because the queue was full
+        self.dropped_events = 0
+        # posts merged into an event that was already queued
+        self.coalesced_events = 0
+
+        self.profiler = None
+        self.recorder = None
+
+        # returns True when the tick is over its budget, set by the Process
+        # Manager
+        self.over_budget = None
+        # (callback, event data, times deferred) of the BACKGROUND listener
+        # calls deferred this tick, and of the ones called in the next drain
+        self._deferred_calls = []
+        self._ready_calls = []
+        # BACKGROUND listener calls put off to a later tick
+        self.deferred_listeners = 0
+
+    @staticmethod
+    def is_pattern(event_name):
+        return '*' in event_name
+
+    def add_listener(self, event_name, callback, priority = NORMAL):
+        '''
+            @param event_name: The name of the event, or a pattern
+            @param callback: Called with the event data
+            @param priority: CRITICAL, NORMAL or BACKGROUND. Adding a listener
+            that was already added changes its priority.
+        '''
+
+        pattern = '*' in event_name
+
+        if pattern:
+            callbacks = self._get_pattern_node(event_name, True).listeners
+        else:
+            callbacks = self.listeners.get(event_name)
+            if callbacks is None:
+                callbacks = self.listeners[event_name] = {}
+
+        order = callbacks.get(callback)
+
+        if order is None:
+            self._order += 1
+            order = self._order
+        elif order // Event_Manager.ORDER_SPAN == priority:
+            return
+        else:
+            # the listener keeps its place among the listeners of its priority
+            self._forget(callback, order)
+            order %= Event_Manager.ORDER_SPAN
+
+        if priority != Event_Manager.NORMAL:
+            self.prioritized += 1
+
+        callbacks[callback] = priority * Event_Manager.ORDER_SPAN + order
+
+        # the same as _invalidate, which adding listeners is too common to
+        # call out to
+        self.version += 1
+        if pattern:
+            self._compiled = {}
+            self._dispatch = {}
+        elif event_name in self._dispatch:
+            del self._compiled[event_name]
+            del self._dispatch[event_name]
+
+    def _forget(self, callback, order):
+        '''
+            Updates the counts and caches for a listener that was removed or
+            changed priority
+        '''
+        listener_priority = order // Event_Manager.ORDER_SPAN
+
+        if listener_priority != Event_Manager.NORMAL:
+            self.prioritized -= 1
+
+            if listener_priority == Event_Manager.BACKGROUND:
+                self._deferrable.pop(callback, None)
+
     def add_listeners(self, listener_map):
         for event_name, callback in listener_map.items():
             self.add_listener(event_name, callback)
-            
-    
+
+
     def remove_listener(self, event_name, callback):
-        
-        if event_name in self.listeners and callback in self.listeners[event_name]:
-            self.listeners[event_name].remove(callback)
-            
+
+        if Event_Manager.is_pattern(event_name):
+            node = self._get_pattern_node(event_name)
+            callbacks = node.listeners if node else None
+        else:
+            callbacks = self.listeners.get(event_name)
+
+        if callbacks is not None and callback in callbacks:
+            self._forget(callback, callbacks.pop(callback))
+            if not callbacks and event_name in self.listeners:
+                del self.listeners[event_name]
+            self._invalidate(event_name)
+
     def remove_all_listeners(self, event_name = None):
-        ''' 
-            Removes all the listeners for a specific event, or all listeners if
-            no event name is given
-        '''    
-        
+        '''
+            Removes all the listeners for a specific event or pattern, or all
+            listeners if no event name is given
+        '''
+
         if event_name is None:
             self.listeners = {}
+            self.patterns = _Pattern_Node()
+            self.prioritized = 0
+            self._deferrable = {}
+            self._compiled = {}
+            self._dispatch = {}
+            self.version += 1
+        elif Event_Manager.is_pattern(event_name):
+            node = self._get_pattern_node(event_name)
+            if node and node.listeners:
+                for callback, order in node.listeners.items():
+                    self._forget(callback, order)
+                node.listeners = {}
+                self._invalidate(event_name)
         elif event_name in self.listeners:
-            del self.listeners[event_name]
-            
-    
-    def trigger(self, event_name, event_data = None):
-        
-        if event_name not in self.listeners:
+            for callback, order in self.listeners.pop(event_name).items():
+                self._forget(callback, order)
+            self._invalidate(event_name)
+
+    def _get_pattern_node(self, pattern, create = False):
+        '''
+            Finds the trie node for a pattern, creating it if requested
+        '''
+        node = self.patterns
+
+        for segment in pattern.split('.'):
+            child = node.children.get(segment)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[segment] = _Pattern_Node()
+            node = child
+
+        return node
+
+    def _invalidate(self, event_name):
+        '''
+            Forgets the compiled callbacks affected by a change to the listeners
+            of an event name or pattern
+        '''
+        self.version += 1
+
+        if Event_Manager.is_pattern(event_name):
+            self._compiled = {}
+            self._dispatch = {}
+        else:
+            self._compiled.pop(event_name, None)
+            self._dispatch.pop(event_name, None)
+
+    def _match(self, node, segments, index, matches):
+        '''
+            Collects the listeners of every pattern node that matches the
+            segments of an event name from index onwards
+        '''
+        children = node.children
+
+        globstar = children.get('**')
+        if globstar is not None:
+            for next_index in range(index, len(segments) + 1):
+                self._match(globstar, segments, next_index, matches)
+
+        if index == len(segments):
+            if node.listeners:
+                matches.append(node.listeners)
             return
-        
-        for callback in self.listeners[event_name]:
-            callback(event_data)
\ No newline at end of file
+
+        child = children.get(segments[index])
+        if child is not None:
+            self._match(child, segments, index + 1, matches)
+
+        star = children.get('*')
+        if star is not None:
+            self._match(star, segments, index + 1, matches)
+
+    def _compile(self, event_name):
+        '''
+            Resolves the listeners of an event name into a tuple of callbacks,
+            in order of priority and then in the order they were added, and the
+            function trigger calls them with
+
+            @return: what trigger calls, see _fuse
+        '''
+        exact = self.listeners.get(event_name)
+        matches = [exact] if exact else []
+        self._match(self.patterns, event_name.split('.'), 0, matches)
+
+        if len(matches) == 1:
+            ordered = matches[0]
+            if self.prioritized:
+                callbacks = tuple(sorted(ordered, key = ordered.get))
+            else:
+                # added in order, and all NORMAL
+                callbacks = tuple(ordered)
+        else:
+            ordered = {}
+            for listeners in matches:
+                for callback, order in listeners.items():
+                    if order < ordered.get(callback, order + 1):
+                        ordered[callback] = order
+            callbacks = tuple(sorted(ordered, key = ordered.get))
+
+        if self.prioritized:
+            callbacks = self._wrap_background(callbacks, ordered)
+
+        self._compiled[event_name] = callbacks
+        dispatch = self._dispatch[event_name] = _fuse(callbacks)
+        return dispatch
+
+    def _wrap_background(self, callbacks, ordered):
+        '''
+            Replaces the BACKGROUND callbacks with the _Deferrable_Listener
+            they are called through, so they can be deferred
+        '''
+        background = Event_Manager.BACKGROUND * Event_Manager.ORDER_SPAN
+        wrapped = []
+
+        for callback in callbacks:
+            if ordered[callback] >= background:
+                deferrable = self._deferrable.get(callback)
+                if deferrable is None:
+                    deferrable = self._deferrable[callback] = _Deferrable_Listener(self, callback)
+                callback = deferrable
+            wrapped.append(callback)
+
+        return tuple(wrapped)
+
+    def get_listeners(self, event_name):
+        '''
+            Returns the tuple of callbacks an event name resolves to
+        '''
+        callbacks = self._compiled.get(event_name)
+
+        if callbacks is None:
+            self._compile(event_name)
+            callbacks = self._compiled[event_name]
+
+        return callbacks
+
+    def trigger(self, event_name, event_data = None):
+
+        dispatch = self._dispatch.get(event_name)
+
+        if dispatch is None:
+            dispatch = self._compile(event_name)
+
+        if dispatch is not _no_listeners:
+            dispatch(event_data)
+
+    def set_profiler(self, profiler):
+        '''
+            Starts timing the events and listeners with a Profiler, or stops if
+            the profiler is None. trigger is only replaced while profiling or
+            recording.
+        '''
+        self.profiler = profiler
+        self._update_trigger()
+
+    def set_recorder(self, recorder):
+        '''
+            Starts recording the triggered events with a Flight_Recorder, or
+            stops if the recorder is None
+        '''
+        self.recorder = recorder
+        self._update_trigger()
+
+    def _update_trigger(self):
+        self.__dict__.pop('trigger', None)
+
+        if self.recorder is not None:
+            self.trigger = self._recorded_trigger
+        elif self.profiler is not None:
+            self.trigger = self._profiled_trigger
+
+    def _recorded_trigger(self, event_name, event_data = None):
+
+        self.recorder.record_event(event_name)
+
+        if self.profiler is not None:
+            self._profiled_trigger(event_name, event_data)
+        else:
+            Event_Manager.trigger(self, event_name, event_data)
+
+    def _profiled_trigger(self, event_name, event_data = None):
+
+        profiler = self.profiler
+        callbacks = self.get_listeners(event_name)
+
+        profiler.enter(event_name, profiler.EVENT)
+        try:
+            for callback in callbacks:
+                profiler.enter(callback, profiler.CALLBACK)
+                try:
+                    callback(event_data)
+                finally:
+                    profiler.exit()
+        finally:
+            profiler.exit()
+
+    def set_coalesce_policy(self, event_name, policy):
+        '''
+            Sets how posts of an event are queued
+
+            @param event_name: The name of the event
+            @param policy: KEEP_ALL or KEEP_LATEST
+        '''
+        self.coalesce_policies[event_name] = policy
+
+    @property
+    def queue_depth(self):
+        return self._queue_length
+
+    def post(self, event_name, event_data = None, key = None):
+        '''
+            Queues an event to be triggered the next time the queue is drained.
+
+            @param event_name: The name of the event
+            @param event_data: The data passed to the listeners
+            @param key: If the event is KEEP_LATEST, posts with the same key are
+            coalesced. Defaults to coalescing all posts of the event.
+            @return: False if the queue was full and the event was dropped
+        '''
+        if self.coalesce_policies.get(event_name) is Event_Manager.KEEP_LATEST:
+            key = event_name if key is None else (event_name, key)
+            index = self._queue_latest.get(key)
+            if index is not None:
+                self._queue_data[index] = event_data
+                self.coalesced_events += 1
+                return True
+        else:
+            key = None
+
+        if self._queue_length == self.queue_size:
+            self.dropped_events += 1
+            return False
+
+        index = (self._queue_head + self._queue_length) % self.queue_size
+        self._queue_names[index] = event_name
+        self._queue_data[index] = event_data
+        self._queue_keys[index] = key
+        self._queue_length += 1
+
+        if key is not None:
+            self._queue_latest[key] = index
+
+        return True
+
+    def drain(self, max_events = None):
+        '''
+            Triggers the queued events in the order they were posted. Events
+            posted while draining are left for the next drain. The BACKGROUND
+            listener calls deferred in the last tick are made after the queued
+            events, if the tick isn't over its budget by then.
+
+            @param max_events: The most events to trigger. Defaults to all of
+            the events queued when the drain started.
+            @return: The number of events triggered
+        '''
+        count = self._queue_length
+
+        if max_events is not None and max_events < count:
+            count = max_events
+
+        names = self._queue_names
+        datas = self._queue_data
+        keys = self._queue_keys
+
+        for i in range(count):
+            index = self._queue_head
+            event_name = names[index]
+            event_data = datas[index]
+            key = keys[index]
+            names[index] = datas[index] = keys[index] = None
+
+            self._queue_head = (index + 1) % self.queue_size
+            self._queue_length -= 1
+
+            if key is not None:
+                del self._queue_latest[key]
+
+            self.trigger(event_name, event_data)
+
+        ready_calls = self._ready_calls
+
+        if ready_calls:
+            self._ready_calls = []
+            over_budget = self.over_budget
+
+            for callback, event_data, deferred in ready_calls:
+                if deferred < self.max_deferred_ticks and over_budget is not None and over_budget():
+                    self._deferred_calls.append((callback, event_data, deferred + 1))
+                    self.deferred_listeners += 1
+                else:
+                    callback(event_data)
+
+        return count
+
+    def end_tick(self):
+        '''
+            Makes the BACKGROUND listener calls deferred this tick in the next
+            drain. The Process Manager does this at the end of every tick.
+        '''
+        if self._deferred_calls:
+            self._ready_calls.extend(self._deferred_calls)
+            del self._deferred_calls[:]
+
+    def clear_queue(self):
+        '''
+            Throws away all the queued events
+        '''
+        for i in range(self.queue_size):
+            self._queue_names[i] = self._queue_data[i] = self._queue_keys[i] = None
+
+        self._queue_head = 0
+        self._queue_length = 0
+        self._queue_latest = {}
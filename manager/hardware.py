@@ -0,0 +1,70 @@
+'''
+    The robot code gets the wpilib classes it uses from here, e.g.
+    hardware.CANTalon, instead of importing wpilib, so the same code runs on
+    the robot or on stand-ins without wpilib installed. A name is looked up
+    in the backend the first time it is used, so importing the robot code
+    doesn't import wpilib until a device or base class is needed.
+
+    The backend has to be set before the robot code that uses it is imported,
+    because classes like the subsystems take their base classes and constants
+    from it when they are defined.
+'''
+
+import importlib
+
+class Wpilib_Backend:
+
+    '''
+        Looks names up in wpilib, hal and networktables
+    '''
+
+    # name -> (module, attribute)
+    paths = {
+        'IterativeRobot' : ('wpilib', 'IterativeRobot'),
+        'RobotDrive' : ('wpilib', 'RobotDrive'),
+        'Talon' : ('wpilib', 'Talon'),
+        'CANJaguar' : ('wpilib', 'CANJaguar'),
+        'CANTalon' : ('wpilib', 'CANTalon'),
+        'DoubleSolenoid' : ('wpilib', 'DoubleSolenoid'),
+        'DigitalInput' : ('wpilib', 'DigitalInput'),
+        'Gyro' : ('wpilib', 'Gyro'),
+        'BuiltInAccelerometer' : ('wpilib', 'BuiltInAccelerometer'),
+        'Joystick' : ('wpilib', 'Joystick'),
+        'SmartDashboard' : ('wpilib', 'SmartDashboard'),
+        'SendableChooser' : ('wpilib', 'SendableChooser'),
+        'Subsystem' : ('wpilib.command', 'Subsystem'),
+        'run' : ('wpilib', 'run'),
+        'HALReport' : ('hal', 'HALReport'),
+        'HALUsageReporting' : ('hal', 'HALUsageReporting'),
+        'NetworkTable' : ('networktables', 'NetworkTable')
+    }
+
+    def __getattr__(self, name):
+        path = Wpilib_Backend.paths.get(name)
+
+        if path is None:
+            raise AttributeError('the hardware backend has no %s' % name)
+
+        value = getattr(importlib.import_module(path[0]), path[1])
+        # later lookups don't get here
+        setattr(self, name, value)
+        return value
+
+
+backend = Wpilib_Backend()
+
+def set_backend(new_backend):
+    '''
+        Changes where the names are looked up
+
+        @param new_backend: An object or module with the same names as wpilib,
+        like sim.fakes
+    '''
+    global backend
+    backend = new_backend
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+
+    return getattr(backend, name)
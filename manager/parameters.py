@@ -0,0 +1,327 @@
+import json
+import logging
+import os
+import threading
+from .coroutines import wait_seconds
+
+logger = logging.getLogger(__name__)
+
+class Parameter:
+
+    '''
+        A tunable value with a type and a range. Code that reads a parameter
+        every tick binds it to an attribute, which is set whenever the
+        parameter changes, so the hot path reads a plain attribute.
+    '''
+
+    __slots__ = ('store', 'name', 'kind', 'default', 'minimum', 'maximum', 'value', 'bindings', 'subscribers')
+
+    # the strings a bool parameter is read from, in lower case
+    TRUE_STRINGS = ('true', '1', 'yes', 'on')
+    FALSE_STRINGS = ('false', '0', 'no', 'off')
+
+    def __init__(self, store, name, default, minimum, maximum):
+        self.store = store
+        self.name = name
+        # bool, int, float or str, from the type of the default
+        self.kind = type(default)
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.value = default
+        # (object, attribute name) of the attributes set to the value
+        self.bindings = []
+        # called with the value when it changes
+        self.subscribers = []
+
+    def coerce(self, value):
+        '''
+            Converts a value to the parameter's type and clamps it to its range
+        '''
+        kind = self.kind
+
+        if kind is int:
+            value = int(round(float(value)))
+        elif kind is bool:
+            value = Parameter.parse_bool(value)
+        else:
+            value = kind(value)
+
+        if kind is not bool and kind is not str:
+            if self.minimum is not None and value < self.minimum:
+                value = kind(self.minimum)
+            elif self.maximum is not None and value > self.maximum:
+                value = kind(self.maximum)
+
+        return value
+
+    @staticmethod
+    def parse_bool(value):
+        '''
+            Reads a bool from a bool, a number, or a string like the ones the
+            dashboard and the saved parameters file hold. bool('False') would
+            be True, so strings are matched by their text.
+        '''
+        if isinstance(value, str):
+            text = value.strip().lower()
+
+            if text in Parameter.TRUE_STRINGS:
+                return True
+            if text in Parameter.FALSE_STRINGS:
+                return False
+
+            raise ValueError('not a bool: %r' % value)
+
+        if value is True or value is False:
+            return value
+
+        if value == 1:
+            return True
+        if value == 0:
+            return False
+
+        raise ValueError('not a bool: %r' % value)
+
+    def bind(self, target, attribute):
+        '''
+            Sets target.attribute to the value now and whenever it changes
+
+            @return: The parameter
+        '''
+        self.bindings.append((target, attribute))
+        setattr(target, attribute, self.value)
+        return self
+
+    def subscribe(self, callback):
+        '''
+            Calls callback with the value whenever it changes
+
+            @return: The parameter
+        '''
+        self.subscribers.append(callback)
+        return self
+
+    def set(self, value):
+        return self.store.set(self.name, value)
+
+
+class Parameter_Store:
+
+    '''
+        Holds the tunable values of the robot. Each parameter is added once
+        with its default and range, published to the dashboard, and changed
+        when it is edited there. Values that differ from their defaults are
+        saved to a JSON file a moment after they change and loaded from it
+        when the robot boots. The file is written by a background thread, so
+        a slow disk doesn't hold up the robot loop.
+    '''
+
+    # seconds after a change the file is saved, so dragging a slider on the
+    # dashboard saves once
+    save_delay = 1
+
+    def __init__(self, event_manager = None, process_manager = None, telemetry = None):
+        self.event_manager = event_manager
+        self.process_manager = process_manager
+        self.telemetry = telemetry
+        self.parameters = {}
+        # the file the values are saved to, None to not save them
+        self.path = None
+        # name -> value loaded from the file
+        self.saved = {}
+        self.listening = False
+        # (path, values) waiting to be written by the saving thread
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        # set while there is nothing left to write
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+
+    def load(self, path):
+        '''
+            Loads the saved values and saves changes to a file from now on
+
+            @param path: The JSON file, or None to not load or save values
+        '''
+        self.path = path
+        self.saved = {}
+
+        if path is None or not os.path.exists(path):
+            return
+
+        try:
+            with open(path) as file:
+                self.saved = json.load(file)
+        except (OSError, ValueError) as error:
+            logger.warning('could not load parameters from %s: %s', path, error)
+            return
+
+        for name, value in self.saved.items():
+            if name in self.parameters:
+                self.set(name, value)
+
+    def add_parameter(self, name, default, minimum = None, maximum = None):
+        '''
+            Adds a parameter, or gets it if it was already added
+
+            @param default: The value if none was saved. Its type is the type
+            of the parameter.
+            @param minimum: The smallest value allowed, None for no limit
+            @param maximum: The largest value allowed, None for no limit
+            @return: The Parameter
+        '''
+        parameter = self.parameters.get(name)
+
+        if parameter is not None:
+            return parameter
+
+        parameter = self.parameters[name] = Parameter(self, name, default, minimum, maximum)
+
+        if not self.listening and self.event_manager is not None:
+            self.event_manager.add_listener('dashboard.updated', self.setting_changed)
+            self.listening = True
+
+        if name in self.saved:
+            try:
+                parameter.value = parameter.coerce(self.saved[name])
+            except (TypeError, ValueError):
+                logger.warning('ignoring saved value %r of %s', self.saved[name], name)
+
+            self._record_loaded(parameter)
+
+        self._publish(parameter)
+        return parameter
+
+    def get(self, name):
+        return self.parameters[name].value
+
+    def set(self, name, value):
+        '''
+            Changes the value of a parameter, and updates its bindings and
+            subscribers if the value changed
+
+            @return: True if the value changed
+        '''
+        parameter = self.parameters[name]
+
+        try:
+            coerced = parameter.coerce(value)
+        except (TypeError, ValueError):
+            logger.warning('ignoring value %r of %s', value, name)
+            self._publish(parameter)
+            return False
+
+        if coerced == parameter.value:
+            if coerced != value:
+                # the dashboard shows a value out of range, put it back
+                self._publish(parameter)
+            return False
+
+        parameter.value = coerced
+
+        for target, attribute in parameter.bindings:
+            setattr(target, attribute, coerced)
+
+        for callback in parameter.subscribers:
+            callback(coerced)
+
+        self._publish(parameter)
+
+        if self.path is not None and self.process_manager is not None:
+            # a save that is already waiting saves this change too
+            self.process_manager.start(self.save_later, priority = self.process_manager.BACKGROUND)
+
+        return True
+
+    def setting_changed(self, event):
+        if event['key'] in self.parameters:
+            self.set(event['key'], event['value'])
+
+    def save_later(self, process):
+        yield wait_seconds(self.save_delay)
+        self.save()
+
+    def save(self):
+        '''
+            Hands the values that differ from their defaults to the saving
+            thread, which writes them to the file. Only the latest values
+            waiting to be written are kept.
+        '''
+        if self.path is None:
+            return
+
+        values = dict(self.saved)
+
+        for name, parameter in self.parameters.items():
+            if parameter.value != parameter.default:
+                values[name] = parameter.value
+            else:
+                values.pop(name, None)
+
+        with self._lock:
+            self._pending = (self.path, values)
+            self._idle.clear()
+
+        if self._thread is None:
+            self._thread = threading.Thread(target = self._save_loop, name = 'parameter store', daemon = True)
+            self._thread.start()
+
+        self._wake.set()
+
+    def wait_saved(self, timeout = None):
+        '''
+            Waits until the values handed to the saving thread are written
+
+            @return: False if the timeout ran out first
+        '''
+        return self._idle.wait(timeout)
+
+    def _save_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            with self._lock:
+                pending = self._pending
+                self._pending = None
+
+            if pending is not None:
+                self._write(*pending)
+
+            with self._lock:
+                if self._pending is None:
+                    self._idle.set()
+
+    @staticmethod
+    def _write(path, values):
+        temporary_path = path + '.tmp'
+
+        try:
+            with open(temporary_path, 'w') as file:
+                json.dump(values, file, indent = 4, sort_keys = True)
+            os.replace(temporary_path, path)
+        except OSError as error:
+            logger.warning('could not save parameters to %s: %s', path, error)
+
+    def _publish(self, parameter):
+        if self.telemetry is None:
+            return
+
+        telemetry = self.telemetry
+        kind = parameter.kind
+
+        if kind is bool:
+            telemetry.put(parameter.name, parameter.value, telemetry.BOOLEAN)
+        elif kind is str:
+            telemetry.put(parameter.name, parameter.value, telemetry.STRING)
+        else:
+            telemetry.put(parameter.name, parameter.value, telemetry.NUMBER)
+
+    def _record_loaded(self, parameter):
+        # a replay of the match has to start with the saved value too
+        recorder = self.event_manager.recorder if self.event_manager is not None else None
+
+        if recorder is not None and parameter.value != parameter.default:
+            recorder.record_dashboard(parameter.name, parameter.value)
@@ -0,0 +1,13 @@
+'''
+    The priority classes of processes and listeners. Critical work is run
+    first every tick, and background work is put off to the next tick when
+    the tick has used up its time budget.
+'''
+
+# e.g. feeding the drive and holding the lift
+CRITICAL = 0
+NORMAL = 1
+# e.g. logging, telemetry and syncing with the dashboard
+BACKGROUND = 2
+
+PRIORITIES = (CRITICAL, NORMAL, BACKGROUND)
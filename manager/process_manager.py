@@ -1,32 +1,109 @@
-import datetime
+import inspect
+import math
+import time
+from . import priority
+from .clock import Monotonic_Clock
+from .coroutines import Wait, Wait_Until, Coroutine_Process
+from .combinators import Sequence
+from .timer_wheel import Timer_Wheel
 
 class Process_Data:
-    
+
     '''
         Contains data about a process like its current state, its group and
         when it was started
     '''
-    
-    def __init__(self, process, group = None, group_default = False):
+
+    __slots__ = ('process', 'key', 'manager', 'state', 'group', 'group_default', 'start_time', 'last_run_time',
+                 'parent', 'children', 'step', 'index', 'run_tick', 'period', 'divisor', 'wake_time',
+                 'timer_deadline', 'waiting', 'resume_value', 'coroutine', 'priority', 'deferred', 'remaining')
+
+    def __init__(self, process, manager, group = None, group_default = False):
         '''
             Initializes the process data. The process data should only be modified by
             the Process Manager.
-        
-            @param process: A function that takes the process data as a single parameter.
+
+            @param process: A function that takes the process data as a single parameter,
+            or a generator or async def function.
+            @param manager: The Process Manager running the process.
             @param group: The name of the group the process belongs to.
             @param group_default: If True then this is the process that the group will default
             to if the group's currently running process finishes or is interrupted.
         '''
+        # The process as it was given to the Process Manager
+        self.key = process
+        # The callable that is run
         self.process = process
-        self.children = []
+        if inspect.isgeneratorfunction(process) or inspect.iscoroutinefunction(process):
+            self.process = Coroutine_Process(process)
+        self.manager = manager
         self.state = Process_Manager.STARTED
         self.group = group
         self.group_default = group_default
-        self.start_time = (datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)).total_seconds()
-        self.last_run_time = None       
+        self.start_time = manager.now
+        # The time of the tick the process was last run in
+        self.last_run_time = None
+        # The Process Data of the composite process this process was started by
+        self.parent = None
+        # The Process Data of the running processes this process started
+        self.children = None
+        # The position of a composite process in its processes
+        self.step = 0
+        # Position in the Process Manager's list of running processes, -1 if not running
+        self.index = -1
+        # The last tick the process was run in
+        self.run_tick = 0
+        # Seconds between runs of a process started with start_every
+        self.period = None
+        # The process is run once every divisor ticks
+        self.divisor = 1
+        # The time the process' timer is due
+        self.wake_time = 0.0
+        # The timer wheel tick the process' timer is due in, -1 if there is no timer
+        self.timer_deadline = -1
+        # The Wait the process is parked on
+        self.waiting = None
+        # The value the Wait the process was parked on ended with
+        self.resume_value = None
+        # Seconds left on the timer of a process interrupted while parked on one
+        self.remaining = None
+        # The generator or coroutine of a generator or async def process
+        self.coroutine = None
+        # CRITICAL, NORMAL or BACKGROUND
+        self.priority = priority.NORMAL
+        # Ticks in a row a BACKGROUND process has been deferred
+        self.deferred = 0
+
+    @property
+    def time_since_start(self):
+        return self.manager.now - self.start_time
+
+    @property
+    def time_since_last_run(self):
+        if self.last_run_time is None:
+            return None
+
+        return self.manager.now - self.last_run_time
+
+
+class Process_Group:
+
+    '''
+        A group of processes where only one can be running at a time
+    '''
+
+    __slots__ = ('name', 'current_process', 'default_process')
+
+    def __init__(self, name):
+        self.name = name
+        # Process Data of the process currently started in the group
+        self.current_process = None
+        # Process Data of the process the group runs when no other process is
+        self.default_process = None
+
 
 class Process_Manager:
-    
+
     # Only one process in a group can be running at a given point of time.
     # When a process in a group is started or resumed the process in the group
     # currently running is interrupted.
@@ -36,35 +113,110 @@ class Process_Manager:
     RESUMED = 2
     # This is the first state a process must have when added to the process manager.
     STARTED = 3
-    # When a process enters this state it is removed from the process manager.
+    # When a process enters this state it is removed from the process manager. A
+    # process can finish itself by returning FINISHED when it is called.
     FINISHED = 4
     # A process in this state is executed periodically.
     RUNNING = 5
-    
-    def __init__(self):
+    # A process started with start_after is in this state until its delay is
+    # over and it is STARTED. Processes are never called with this state.
+    SCHEDULED = 6
+
+    # Processes are run in order of priority. BACKGROUND processes are
+    # deferred to the next tick when the tick is over its budget.
+    CRITICAL = priority.CRITICAL
+    NORMAL = priority.NORMAL
+    BACKGROUND = priority.BACKGROUND
+
+    # The most ticks in a row a BACKGROUND process is deferred before it is
+    # run anyway
+    max_deferred_ticks = 10
+
+    def __init__(self, clock = None, event_manager = None, timer = time.perf_counter):
+        '''
+            @param clock: The clock processes are timed with. Defaults to a
+            Monotonic_Clock.
+            @param event_manager: The Event Manager processes can wait for events
+            from. Its BACKGROUND listeners are deferred when the tick is over
+            its budget too.
+            @param timer: Returns the time in seconds that the length of a tick
+            is measured with. A simulation passes its clock's now, so ticks
+            take no time and nothing is deferred.
+        '''
+        # The clock is read once per tick, so every process run in a tick sees
+        # the same time
+        self.clock = clock or Monotonic_Clock()
+        self.now = self.clock.now()
+        # Seconds between the last two ticks
+        self.dt = 0.0
+        # group name -> Process_Group
         self.process_groups = {}
-        self.single_processes = {}
-        self._time_of_last_run = None
+        # process -> Process_Data of every process that hasn't finished
+        self.processes = {}
+        # Process Data of the processes in the RUNNING state, a list for each
+        # priority. Processes are removed by moving the last process into
+        # their place, except from the list being run, where they leave a
+        # None until the run is over.
+        self.running = tuple([] for _ in priority.PRIORITIES)
+        self._running_now = None
+        self._holes = False
+        self.tick = 0
+        self.profiler = None
+        self.recorder = None
+        # Processes that run less often than every tick sleep in the timer wheel
+        # until they are due
+        self.timers = Timer_Wheel()
+        # The expected seconds between ticks, used to turn delays into ticks
+        self.tick_period = .02
+        self._due = []
+        # BACKGROUND processes whose timers are due, run by run_background
+        self._background_due = []
+        self.event_manager = event_manager
+        # event name -> Process Data of the processes waiting for the event
+        self.event_waiters = {}
+        self._event_listeners = {}
+        # Process Data of the processes waiting for a condition
+        self.condition_waiters = []
+
+        # Seconds a tick can take before BACKGROUND processes and listeners
+        # are deferred, None to never defer them
+        self.budget = None
+        self.timer = timer
+        self.tick_start = timer()
+        # Seconds the last tick took, and the ticks that went over the budget
+        self.tick_time = 0.0
+        self.overruns = 0
+        # Runs of BACKGROUND processes put off to a later tick
+        self.deferred_processes = 0
+
+        if event_manager is not None:
+            event_manager.over_budget = self.over_budget
+            event_manager.max_deferred_ticks = self.max_deferred_ticks
 
 
     def add_group(self, name, default_process = None):
+        '''
+            Adds a group of processes.
+
+            @param name: The name of the group
+            @param default_process: A process that is run whenever no other process
+            in the group is. It is started right away.
+        '''
 
-            process_data = Process_Data(default_process, name, True) if default_process else None
+        process_group = self.process_groups[name] = Process_Group(name)
 
-            self.process_groups = {
-                default_process : process_data,
-                current_process : None
-            }
+        if default_process:
+            process_data = Process_Data(default_process, self, name, True)
+            process_group.default_process = process_data
+            self.processes[default_process] = process_data
+            self._begin(process_data, Process_Manager.STARTED)
 
-            # call the process
-            self._call_process(process_data)
-    
-    
-    def start(self, process, group = None):
+
+    def start(self, process, group = None, divisor = 1, priority = NORMAL):
         '''
             Starts a process.
-            
-            @param process: A callable that the Process Data as its only parameter.  
+
+            @param process: A callable that the Process Data as its only parameter.
             The Process Data holds information like the process state and when it
             was last run. A process is called periodically if it is running. A
             process also called when it enters other states like STARTED or FINISHED.
@@ -72,152 +224,672 @@ class Process_Manager:
             one process can be running in a group at any point in time. The currently
             running process will be either INTERRUPTED if it is the group default or
             FINISHED if it isn't when this process starts.
+            @param divisor: The process is run once every divisor ticks instead of
+            every tick.
+            @param priority: CRITICAL, NORMAL or BACKGROUND
+            @return: False if the group doesn't exist or the process is already started
         '''
+        process_data = self._create(process, group, priority)
 
-        process_data = Process_Data(process, group, group_default)
-        
-        if group is None:
-            self.single_processes[process] = process_data
-            self._call_process(process_data)
+        if process_data is None:
+            return False
 
-        elif group in self.process_groups:
+        process_data.divisor = divisor
+        self._activate(process_data)
+        return True
+
+    def start_after(self, delay, process, group = None, priority = NORMAL):
+        '''
+            Starts a process after a delay. The process doesn't cost anything
+            until then.
+
+            @param delay: Seconds until the process is started
+            @param process: The process to start
+            @param group: The group the process belongs to
+            @param priority: CRITICAL, NORMAL or BACKGROUND
+            @return: False if the group doesn't exist or the process is already started
+        '''
+        process_data = self._create(process, group, priority)
 
-            process_group = self.process_groups[group]
+        if process_data is None:
+            return False
 
-            if process_group['current_process']:
-                process_group['current_process'].state = Process_Manager.FINISHED
-                self._call_process(process_group['current_process'])
+        process_data.state = Process_Manager.SCHEDULED
+        process_data.wake_time = self.now + delay
+        self._schedule(process_data, self._ticks_until(process_data.wake_time))
+        return True
 
-            process_group['current_process'] = process_data
+    def start_every(self, period, process, group = None, priority = NORMAL):
+        '''
+            Starts a process that is run once every period instead of every tick,
+            e.g. to log at 5Hz. The process doesn't cost anything between runs.
 
-            if process_group['default_process'] and process_group['default_process'].state is not Process_Manager.INTERRUPTED:
-                process_group['default_process'].state = Process_Manager.INTERRUPTED
-                self._call_process(process_group['default_process'])
+            @param period: Seconds between runs of the process
+            @param process: The process to start
+            @param group: The group the process belongs to
+            @param priority: CRITICAL, NORMAL or BACKGROUND
+            @return: False if the group doesn't exist or the process is already started
+        '''
+        process_data = self._create(process, group, priority)
 
-        else:
+        if process_data is None:
             return False
 
-        self._call_process(process_data)
+        process_data.period = period
+        self._activate(process_data)
         return True
 
     def start_sequence(self, processes, group = None):
-        ''' 
-            Creates a sequence of processes. If a group is given then each process
-            in belongs to that group.
-            
+        '''
+            Creates a sequence of processes. If a group is given then the sequence
+            belongs to that group.
+
             @param processes: A list of processes that will be run in sequence.
             @param group: A string representing a group of processes. No two processes
             in a group can be running at the same time.
         '''
-         
-        if len(processes) is 0:
-            return
-        
-        first_process = processes.pop(0)
-        
-        # Don't add the children if the process wasn't added
-        if self.start(first_process, group):
 
-            process_data = None
+        processes = tuple(processes)
 
-            if group in self.process_groups:
-                process_data = self.process_groups[group]['current_process']
-            else:
-                process_data = self.single_processes[first_process]
+        if len(processes) == 0:
+            return False
+
+        return self.start(Sequence(processes), group)
+
+    def _start_child(self, parent, process):
+        '''
+            Starts a process for a composite process. The child can be finished
+            with finish(process) unless the same process is already running.
+        '''
+        process_data = Process_Data(process, self)
+        process_data.parent = parent
+        process_data.priority = parent.priority
 
-            process_data.children = processes
-        
+        if parent.children is None:
+            parent.children = []
+        parent.children.append(process_data)
+
+        if process not in self.processes:
+            self.processes[process] = process_data
+
+        self._begin(process_data, Process_Manager.STARTED)
+        return process_data
+
+    def _create(self, process, group, priority):
+        '''
+            Creates the Process Data of a process that is about to be started.
+            Returns None if the group doesn't exist or the process is already
+            started.
+        '''
+        if process in self.processes:
+            return None
+
+        if group is not None and group not in self.process_groups:
+            return None
+
+        process_data = self.processes[process] = Process_Data(process, self, group)
+        process_data.priority = priority
+        return process_data
+
+    def _activate(self, process_data):
+        '''
+            Starts a process, finishing or interrupting the process running in its
+            group
+        '''
+        process_group = self.process_groups.get(process_data.group)
+
+        if process_group:
+            current_process = process_group.current_process
+            process_group.current_process = process_data
+
+            if current_process:
+                self._finish(current_process)
+
+            default_process = process_group.default_process
+
+            if default_process and default_process.state is not Process_Manager.INTERRUPTED:
+                self._interrupt(default_process)
+
+        self._begin(process_data, Process_Manager.STARTED)
 
-        
     def finish(self, process = None, group = None):
         '''
-            Ends the currently running process 
-            
-            @param process:
-            @param group:
+            Ends a process, or the process currently running in a group. If the process
+            was started by a composite process like a sequence, the composite decides
+            what runs next.
+
+            @param process: The process to finish
+            @param group: The group whose current process is finished if no process
+            is given
         '''
-        
-        if process in self.single_processes:
-            process_data = self.single_processes[process]
-            process_data.state = Process_Manager.FINISHED
-            self._call_process(process_data)
-            del self.single_processes[process_data]
-            self.start_sequence(process_data.children, None)
 
+        process_data = None
+
+        if process is not None:
+            process_data = self.processes.get(process)
         elif group in self.process_groups:
-            process_group = self.process_groups[group]
-            process_data = process_group['current_process']
-            if process_data:
-                if process_data.children and len(process_data.children) > 0:
-                    self.start_sequence(process_data.children, group)
-                else:
-                    process_data.state = Process_Manager.FINISHED
-                    self._call_process(process_data)
-                    process_group['current_process'] = None
-                    default_process_data = process_group['default_process']
-                    if default_process_data:
-                        default_process_data.state = Process_Manager.RESUMED
-                        self._call_process(default_process_data)
-        
-        
-    
-    def _get_group_default(self, group):
-        
-        if group in self.group_processes:
-            return self.group_processes[group]['default_process']
-                
-        return None
-        
-    
-    
-    def _call_process(self, process_data):
+            process_data = self.process_groups[group].current_process
+
         if process_data:
-            process_data.process(process_data)
-                       
+            self._finish(process_data)
+
+    def _begin(self, process_data, state):
+        '''
+            Calls a process with the STARTED or RESUMED state and then makes it
+            RUNNING
+        '''
+        process_data.state = state
+        process_data.run_tick = self.tick
+        result = self._call_process(process_data)
+
+        # The process may have been finished or parked while it was called
+        if process_data.state is state:
+            process_data.state = Process_Manager.RUNNING
+
+            if process_data.waiting is None:
+                self._make_runnable(process_data)
+
+                if result is not None:
+                    self._handle_result(process_data, result)
+
+    def _handle_result(self, process_data, result):
+        '''
+            Finishes a process that returned FINISHED, or parks a process that
+            returned a Wait
+        '''
+        if result is Process_Manager.FINISHED:
+            self._finish(process_data)
+        elif isinstance(result, Wait):
+            self._suspend(process_data)
+            process_data.waiting = result
+            result.park(self, process_data)
+
+    def _finish(self, process_data):
+        '''
+            Finishes a process and its children, then resumes its group's default
+            process or tells its parent
+        '''
+
+        if process_data.state is Process_Manager.FINISHED:
+            return
+
+        self._suspend(process_data)
+        was_started = process_data.state is not Process_Manager.SCHEDULED
+        process_data.state = Process_Manager.FINISHED
+
+        children = process_data.children
+        while children:
+            self._finish(children[-1])
+
+        if was_started:
+            self._call_process(process_data)
+
+        if self.processes.get(process_data.key) is process_data:
+            del self.processes[process_data.key]
+
+        parent = process_data.parent
+
+        if parent is not None:
+            parent.children.remove(process_data)
+
+            if parent.state is not Process_Manager.FINISHED:
+                parent.process.child_finished(self, parent, process_data)
+            return
+
+        process_group = self.process_groups.get(process_data.group)
+
+        if process_group:
+            if process_group.default_process is process_data:
+                process_group.default_process = None
+
+            elif process_group.current_process is process_data:
+                process_group.current_process = None
+                default_process = process_group.default_process
+
+                if default_process and default_process.state is Process_Manager.INTERRUPTED:
+                    self._resume(default_process)
+
+    def _interrupt(self, process_data):
+        '''
+            Stops running a process and its children until they are resumed. A
+            process parked on a Wait keeps it, and waits for the rest of it
+            when it is resumed.
+        '''
+        waiting = process_data.waiting
+
+        if waiting is not None and process_data.timer_deadline >= 0:
+            process_data.remaining = max(process_data.wake_time - self.now, 0.0)
+        else:
+            process_data.remaining = None
+
+        self._suspend(process_data)
+        process_data.waiting = waiting
+        process_data.state = Process_Manager.INTERRUPTED
+        self._call_process(process_data)
+
+        if process_data.children:
+            for child in process_data.children:
+                self._interrupt(child)
+
+    def _resume(self, process_data):
+        '''
+            Resumes an interrupted process and its children
+        '''
+        waiting = process_data.waiting
+        process_data.waiting = None
+        self._begin(process_data, Process_Manager.RESUMED)
+
+        if waiting is not None and process_data.state is Process_Manager.RUNNING and process_data.waiting is None:
+            # park the process on the wait it was interrupted in again
+            self._suspend(process_data)
+            process_data.waiting = waiting
+            remaining = process_data.remaining
+
+            if remaining is not None:
+                process_data.remaining = None
+                self._park_timer(process_data, self.now + remaining)
+            else:
+                waiting.park(self, process_data)
+
+        if process_data.children and process_data.state is not Process_Manager.FINISHED:
+            for child in tuple(process_data.children):
+                self._resume(child)
+
+    def _make_runnable(self, process_data):
+        '''
+            Adds a process that has become RUNNING to the running processes, or
+            to the timer wheel if it isn't run every tick
+        '''
+        if process_data.period is not None:
+            process_data.wake_time = self.now + process_data.period
+            self._schedule(process_data, self._ticks_until(process_data.wake_time))
+        elif process_data.divisor > 1:
+            self._schedule(process_data, process_data.divisor)
+        else:
+            self._add_running(process_data)
+
+    def _suspend(self, process_data):
+        '''
+            Stops running a process until it is made runnable again
+        '''
+        self._remove_running(process_data)
+        process_data.timer_deadline = -1
+        process_data.waiting = None
+
+    def _wake(self, process_data, value):
+        '''
+            Ends the wait a process is parked on
+        '''
+        process_data.waiting = None
+        process_data.resume_value = value
+        self._make_runnable(process_data)
+
+    def _park_timer(self, process_data, wake_time):
+        process_data.wake_time = wake_time
+        self._schedule(process_data, self._ticks_until(wake_time))
+
+    def _park_condition(self, process_data):
+        self.condition_waiters.append(process_data)
+
+    def _park_event(self, process_data, event_name):
+        waiters = self.event_waiters.get(event_name)
+
+        if waiters is None:
+            waiters = self.event_waiters[event_name] = []
+            listener = self._event_listeners[event_name] = lambda event_data: self._event_triggered(event_name, event_data)
+            self.event_manager.add_listener(event_name, listener)
+
+        waiters.append(process_data)
+
+    def _event_triggered(self, event_name, event_data):
+        '''
+            Wakes the processes waiting for an event
+        '''
+        waiters = self.event_waiters.pop(event_name)
+        self.event_manager.remove_listener(event_name, self._event_listeners.pop(event_name))
+
+        for process_data in waiters:
+            waiting = process_data.waiting
+            if waiting is not None and process_data.state is Process_Manager.RUNNING and \
+                    getattr(waiting, 'event_name', None) == event_name:
+                self._wake(process_data, event_data)
+
+    def _check_conditions(self):
+        '''
+            Wakes the processes whose conditions are True
+        '''
+        waiters = self.condition_waiters
+        i = 0
+
+        while i < len(waiters):
+            process_data = waiters[i]
+            waiting = process_data.waiting
+
+            if waiting is None or waiting.__class__ is not Wait_Until or process_data.state is not Process_Manager.RUNNING:
+                # an interrupted process is parked here again when it is resumed
+                done = True
+            elif waiting.condition():
+                done = True
+                self._wake(process_data, True)
+            else:
+                done = False
+
+            if done:
+                last_process = waiters.pop()
+                if i < len(waiters):
+                    waiters[i] = last_process
+            else:
+                i += 1
+
+    def _ticks_until(self, wake_time):
+        return int(math.ceil((wake_time - self.now) / self.tick_period - 1e-6))
+
+    def _schedule(self, process_data, ticks):
+        process_data.timer_deadline = self.timers.schedule(process_data, ticks)
+
+    def _timer_expired(self, process_data):
+        '''
+            Starts or runs a process whose timer is due
+        '''
+        process_data.timer_deadline = -1
+        state = process_data.state
+        waiting = process_data.waiting
+
+        # The loop may be running faster than expected
+        if (state is Process_Manager.SCHEDULED or process_data.period is not None or waiting is not None) and \
+                process_data.wake_time - self.now > self.tick_period / 2:
+            self._schedule(process_data, self._ticks_until(process_data.wake_time))
+            return
+
+        if waiting is not None:
+            self._wake(process_data, None)
+            return
+
+        if state is Process_Manager.SCHEDULED:
+            self._activate(process_data)
+            return
+
+        process_data.run_tick = self.tick
+        result = self._call_process(process_data)
+        process_data.last_run_time = self.now
+
+        if process_data.state is not Process_Manager.RUNNING or process_data.timer_deadline >= 0:
+            return
+
+        if result is not None:
+            self._handle_result(process_data, result)
+        elif process_data.period is not None:
+            process_data.wake_time += process_data.period
+            if process_data.wake_time <= self.now:
+                process_data.wake_time = self.now + process_data.period
+            self._schedule(process_data, self._ticks_until(process_data.wake_time))
+        else:
+            self._schedule(process_data, process_data.divisor)
+
+    def _add_running(self, process_data):
+        running = self.running[process_data.priority]
+        process_data.index = len(running)
+        running.append(process_data)
+
+    def _remove_running(self, process_data):
+        index = process_data.index
+
+        if index < 0:
+            return
+
+        running = self.running[process_data.priority]
+        process_data.index = -1
+
+        if running is self._running_now:
+            # moving the last process into an earlier place would skip it
+            running[index] = None
+            self._holes = True
+            return
+
+        last_process = running.pop()
+
+        if last_process is not process_data:
+            running[index] = last_process
+            last_process.index = index
+
+    def set_profiler(self, profiler):
+        '''
+            Starts timing the processes with a Profiler, or stops if the
+            profiler is None
+        '''
+        self.profiler = profiler
+        self._update_call_process()
+
+    def set_recorder(self, recorder):
+        '''
+            Starts recording the state changes of processes with a
+            Flight_Recorder, or stops if the recorder is None
+        '''
+        self.recorder = recorder
+        self._update_call_process()
+
+    def _update_call_process(self):
+        self.__dict__.pop('_call_process', None)
+
+        if self.recorder is not None:
+            self._call_process = self._recorded_call_process
+        elif self.profiler is not None:
+            self._call_process = self._profiled_call_process
+
+    def _call_process(self, process_data):
+        return process_data.process(process_data)
+
+    def _profiled_call_process(self, process_data):
+        self.profiler.enter(process_data.process, self.profiler.PROCESS)
+        try:
+            return process_data.process(process_data)
+        finally:
+            self.profiler.exit()
+
+    def _recorded_call_process(self, process_data):
+        # Running is the only state a process is called with every tick
+        if process_data.state is not Process_Manager.RUNNING:
+            self.recorder.record_state(process_data.process, process_data.state)
+
+        if self.profiler is not None:
+            return self._profiled_call_process(process_data)
+
+        return process_data.process(process_data)
+
+    def set_clock(self, clock):
+        '''
+            Changes the clock processes are timed with, e.g. to a Manual_Clock
+            for tests
+        '''
+        self.clock = clock
+        self.now = clock.now()
+        self.dt = 0.0
+
+    def update_time(self):
+        '''
+            Reads the clock. This is done at the start of every tick.
+        '''
+        now = self.clock.now()
+        self.dt = now - self.now
+        self.now = now
+
     def get_current_time(self):
-        return (datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)).total_seconds()  
-                
+        return self.now
+
     def time_since_last_run(self, process_data):
 
-        if process_data is None or process_data.last_run_time is None:
+        if process_data is None:
             return None
-        
-        return self.get_current_time() - process_data.last_run_time
-    
+
+        return process_data.time_since_last_run
+
     def time_since_start(self, process_data):
-        
+
         if process_data is None:
             return None
-        
-        return self.get_current_time() - process_data.start_time
-        
+
+        return process_data.time_since_start
+
+    def over_budget(self):
+        '''
+            @return: True if the current tick has taken longer than the budget
+        '''
+        if self.budget is None:
+            return False
+
+        return self.timer() - self.tick_start > self.budget
+
+    def end_tick(self):
+        '''
+            Measures how long the tick took. This is done at the end of every
+            tick.
+        '''
+        self.tick_time = self.timer() - self.tick_start
+
+        if self.budget is not None and self.tick_time > self.budget:
+            self.overruns += 1
+
+        if self.event_manager is not None:
+            self.event_manager.end_tick()
+
     def run(self):
         '''
-            Executes each running process
-        '''
-
-        # Run group processes
-        for group in self.group_processes.values():
-            if group.current_process and group.current_process.state is Process_Manager.RUNNING:
-                group.current_process.process(group.current_process)
-            elif group.default_process and group.default_process.state is Process_Manager.RUNNING:
-                group.default_process.process(group.default_process)
-
-        # Run single processes
-        running_processes = {}
-        
-        for process, process_data in self.single_processes.items():
-            if process_data.state is Process_Manager.RUNNING:
-                running_processes[process] = process_data
-        
-        for process, process_data in running_processes():
-            self._call_process(self, process)
-        
+            Executes each running process once, and the processes whose timers
+            are due. Processes started while running are first run on the next
+            call.
+
+            The CRITICAL processes are run first, then the NORMAL ones, then the
+            BACKGROUND ones, which are deferred to the next tick if the tick is
+            already over its budget.
+        '''
+        self.run_foreground()
+        self.run_background()
+
+    def run_foreground(self):
+        '''
+            Starts a tick and runs the CRITICAL and then the NORMAL processes.
+            run_background has to be called later in the tick to run the
+            BACKGROUND ones, so the robot loop can do its critical work like
+            feeding the drive in between.
+        '''
+
+        self.update_time()
+        self.tick_start = self.timer()
+        self.tick += 1
+
+        due = self._due
+        self.timers.advance(due)
+
+        if self.condition_waiters:
+            self._check_conditions()
+
+        critical, normal, background = self.running
+
+        if due:
+            self._expire_timers(due, priority.CRITICAL)
+        if critical:
+            self._run_processes(critical, False)
+
+        if due:
+            self._expire_timers(due, priority.NORMAL)
+
+            for process_data in due:
+                if process_data.priority is priority.BACKGROUND:
+                    self._background_due.append(process_data)
+            del due[:]
+
+        if normal:
+            self._run_processes(normal, False)
+
+    def run_background(self):
+        '''
+            Runs the BACKGROUND processes of the tick, deferring them to the
+            next tick if the tick is already over its budget
+        '''
+        defer = self.budget is not None
+        due = self._background_due
+
+        if due:
+            tick = self.tick
+
+            for process_data in due:
+                # the process may have been finished or rescheduled since
+                if 0 <= process_data.timer_deadline <= tick:
+                    if defer and self._defer(process_data):
+                        self._schedule(process_data, 1)
+                    else:
+                        self._timer_expired(process_data)
+            del due[:]
+
+        background = self.running[priority.BACKGROUND]
+
+        if background:
+            self._run_processes(background, defer)
+
+    def _expire_timers(self, due, process_priority):
+        '''
+            Runs the processes of a priority whose timers are due this tick
+        '''
+        tick = self.tick
+
+        for process_data in due:
+            if process_data.timer_deadline == tick and process_data.priority is process_priority:
+                self._timer_expired(process_data)
+
+    def _run_processes(self, running, background):
+        tick = self.tick
+        now = self.now
+        call_process = self._call_process
+        self._running_now = running
+        i = 0
+
+        # processes started while running are added to the end, and run next
+        # tick because their run_tick is this tick
+        while i < len(running):
+            process_data = running[i]
+            i += 1
+
+            if process_data is None or process_data.run_tick == tick:
+                continue
+
+            if background and self._defer(process_data):
+                continue
+
+            process_data.run_tick = tick
+
+            result = call_process(process_data)
+            process_data.last_run_time = now
+
+            if result is not None:
+                self._handle_result(process_data, result)
+
+        self._running_now = None
+
+        if self._holes:
+            self._holes = False
+            running[:] = [process_data for process_data in running if process_data is not None]
+
+            for index, process_data in enumerate(running):
+                process_data.index = index
+
+    def _defer(self, process_data):
+        '''
+            Decides whether a BACKGROUND process is put off to the next tick.
+            A process is only deferred max_deferred_ticks ticks in a row.
+        '''
+        if process_data.deferred >= self.max_deferred_ticks or not self.over_budget():
+            process_data.deferred = 0
+            return False
+
+        process_data.deferred += 1
+        self.deferred_processes += 1
+        return True
+
     def in_queue(self, process):
         return process in self.processes
-    
+
     def _get_process_data(self, process):
-        return None if process not in self.processes else self.processes[process]
-    
+        return self.processes.get(process)
+
     def get_state(self, process):
-        return None if not self.in_queue(process) else self.processes[process].state
\ No newline at end of file
+        return None if not self.in_queue(process) else self.processes[process].state
@@ -0,0 +1,204 @@
+import struct
+import time
+
+class Timing:
+
+    '''
+        Call count and latency statistics for one event or callback
+    '''
+
+    __slots__ = ('name', 'kind', 'count', 'total', 'max', 'samples', 'sample_index')
+
+    def __init__(self, name, kind, sample_count):
+        self.name = name
+        self.kind = kind
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # the most recent latencies, used to estimate the percentiles
+        self.samples = [0.0] * sample_count
+        self.sample_index = 0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.samples[self.sample_index] = elapsed
+        self.sample_index = (self.sample_index + 1) % len(self.samples)
+
+    def percentile(self, percent):
+        '''
+            Estimates a latency percentile from the most recent samples
+        '''
+        samples = sorted(self.samples[:min(self.count, len(self.samples))])
+
+        if not samples:
+            return 0.0
+
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+
+class Overrun:
+
+    '''
+        A tick that took longer than the budget. The chain is the stack of
+        event and callback names that were running when the most time was
+        spent, outermost first.
+    '''
+
+    __slots__ = ('tick', 'elapsed', 'chain', 'chain_time')
+
+    def __init__(self, tick, elapsed, chain, chain_time):
+        self.tick = tick
+        self.elapsed = elapsed
+        self.chain = chain
+        self.chain_time = chain_time
+
+    def __repr__(self):
+        return 'Overrun(tick=%d, elapsed=%.2fms, chain=%s, chain_time=%.2fms)' % (
+            self.tick, self.elapsed * 1000, ' -> '.join(self.chain), self.chain_time * 1000)
+
+
+class Profiler:
+
+    '''
+        Records how long events, listeners and processes take to run and which
+        ticks of the robot loop go over a time budget.
+
+        A tick starts when end_tick is called, which EventRobot does at the
+        start of every robot loop before any process runs, and includes
+        everything that runs until the next call. The profiler is only called
+        while it is attached to the Event Manager or Process Manager, see
+        manager.enable_profiling.
+    '''
+
+    EVENT = 'event'
+    CALLBACK = 'callback'
+    PROCESS = 'process'
+
+    _record = struct.Struct('<BIdddd')
+
+    def __init__(self, budget = .02, sample_count = 512, max_overruns = 256, clock = time.perf_counter):
+        '''
+            @param budget: The number of seconds a tick can take before it is
+            recorded as an overrun.
+            @param sample_count: The number of recent latencies kept for each
+            event and callback to estimate percentiles.
+            @param max_overruns: The number of overruns kept.
+            @param clock: A monotonic clock returning seconds.
+        '''
+        self.budget = budget
+        self.sample_count = sample_count
+        self.max_overruns = max_overruns
+        self.clock = clock
+        # key -> Timing, where the key is the event name or the callable
+        self.timings = {}
+        self.overruns = []
+        self.ticks = 0
+        self.overrun_count = 0
+        # frames of [key, kind, start time, time spent in nested calls]
+        self._stack = []
+        self._tick_time = 0.0
+        self._worst_time = 0.0
+        self._worst_chain = ()
+
+    @staticmethod
+    def get_name(key):
+        if isinstance(key, str):
+            return key
+
+        name = getattr(key, '__qualname__', None)
+        if name is None:
+            name = type(key).__qualname__
+        return name
+
+    def enter(self, key, kind):
+        self._stack.append([key, kind, self.clock(), 0.0])
+
+    def exit(self):
+        now = self.clock()
+        stack = self._stack
+        frame = stack.pop()
+        key = frame[0]
+        elapsed = now - frame[2]
+
+        timing = self.timings.get(key)
+        if timing is None:
+            timing = self.timings[key] = Timing(Profiler.get_name(key), frame[1], self.sample_count)
+        timing.add(elapsed)
+
+        own_time = elapsed - frame[3]
+        if own_time > self._worst_time:
+            self._worst_time = own_time
+            self._worst_chain = tuple(Profiler.get_name(outer[0]) for outer in stack) + (timing.name,)
+
+        if stack:
+            stack[-1][3] += elapsed
+        else:
+            self._tick_time += elapsed
+
+    def end_tick(self):
+        '''
+            Checks the tick that just finished against the budget and starts
+            a new one
+        '''
+        if self._tick_time > self.budget:
+            self.overrun_count += 1
+            if len(self.overruns) >= self.max_overruns:
+                del self.overruns[0]
+            self.overruns.append(Overrun(self.ticks, self._tick_time, self._worst_chain, self._worst_time))
+
+        self.ticks += 1
+        self._tick_time = 0.0
+        self._worst_time = 0.0
+        self._worst_chain = ()
+
+    def get_timing(self, name):
+        '''
+            Gets the statistics of an event or callback by name
+        '''
+        for timing in self.timings.values():
+            if timing.name == name:
+                return timing
+        return None
+
+    def get_slowest(self, count = 10, key = 'total'):
+        '''
+            Gets the statistics that are the highest for an attribute of the
+            Timing, like 'total', 'max' or 'p99'
+        '''
+        return sorted(self.timings.values(), key = lambda timing: getattr(timing, key), reverse = True)[:count]
+
+    def dump(self, path):
+        '''
+            Writes the statistics to a file. If the path ends in .csv a CSV file
+            is written, otherwise a binary file where each record is the name
+            length, call count, total, max, mean and p99 latencies in seconds
+            followed by the utf-8 name.
+        '''
+        timings = sorted(self.timings.values(), key = lambda timing: timing.total, reverse = True)
+
+        if path.endswith('.csv'):
+            with open(path, 'w') as f:
+                f.write('kind,name,count,total,max,mean,p99\n')
+                for timing in timings:
+                    f.write('%s,"%s",%d,%.9f,%.9f,%.9f,%.9f\n' % (timing.kind, timing.name, timing.count,
+                            timing.total, timing.max, timing.mean, timing.p99))
+        else:
+            with open(path, 'wb') as f:
+                f.write(b'EVPF')
+                f.write(struct.pack('<I', len(timings)))
+                for timing in timings:
+                    name = timing.name.encode('utf-8')[:255]
+                    f.write(Profiler._record.pack(len(name), timing.count, timing.total, timing.max,
+                                                  timing.mean, timing.p99))
+                    f.write(name)
@@ -0,0 +1,290 @@
+import mmap
+import struct
+import threading
+from array import array
+from .profiler import Profiler
+
+class Flight_Recorder:
+
+    '''
+        Records triggered events, process state changes and published telemetry
+        into a ring of fixed width binary records in a memory mapped file, so
+        the last few minutes of a match can be looked at afterwards.
+
+        Recording a record only packs it into the memory map. The names the
+        records refer to are interned, and a background thread writes the new
+        names to '<path>.names' and flushes the memory map to disk, so the
+        control loop never waits on the disk.
+
+        The file starts with a header of the magic b'EVFR', the format
+        version, the record size, the capacity in records and the number of
+        records written when the file was last flushed. Each record is the
+        time, the tick, the name id, the kind, a code and a value, see
+        read_recording.
+    '''
+
+    EVENT = 1
+    # code is the state the process was called with
+    STATE = 2
+    # value is the published number, or the name id of a published string
+    TELEMETRY = 3
+    # a joystick reading that changed, code is the axis number or BUTTONS for
+    # the button bitmask
+    INPUT = 4
+    # a value written to a motor or solenoid
+    OUTPUT = 5
+    # a dashboard value that changed, code is the type of the value, see
+    # DASHBOARD_TYPES
+    DASHBOARD = 6
+
+    BUTTONS = 255
+    DASHBOARD_TYPES = (float, bool, str)
+
+    MAGIC = b'EVFR'
+    VERSION = 2
+
+    _header = struct.Struct('<4sHHIQ')
+    _record = struct.Struct('<dIIBBd')
+    HEADER_SIZE = 32
+    RECORD_SIZE = _record.size
+
+    def __init__(self, path, manager, capacity = 65536, flush_interval = .5):
+        '''
+            @param path: The file to record to. It is overwritten.
+            @param manager: The Process Manager the time and tick of each record
+            are read from.
+            @param capacity: The number of records kept. The oldest records are
+            overwritten once the file is full.
+            @param flush_interval: Seconds between flushes to disk.
+        '''
+        self.path = path
+        self.manager = manager
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        # the total number of records recorded, including overwritten ones
+        self.count = 0
+        self.flushed_count = 0
+
+        # event name, process or channel name -> name id
+        self.name_ids = {}
+        self._string_ids = {}
+        self._names = []
+        # the number of names written to the names file
+        self._written_names = 0
+
+        # The whole file is written up front so recording never grows it
+        size = Flight_Recorder.HEADER_SIZE + capacity * Flight_Recorder.RECORD_SIZE
+        self._file = open(path, 'w+b')
+        self._file.write(bytes(size))
+        self._file.flush()
+        self.buffer = mmap.mmap(self._file.fileno(), size)
+        Flight_Recorder._header.pack_into(self.buffer, 0, Flight_Recorder.MAGIC, Flight_Recorder.VERSION,
+                                          Flight_Recorder.RECORD_SIZE, capacity, 0)
+
+        self._names_file = open(path + '.names', 'w', encoding = 'utf-8')
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target = self._flush_loop, name = 'flight recorder', daemon = True)
+        self._thread.start()
+
+    def _intern(self, key):
+        '''
+            Gives a name id to an event name, process or channel name
+        '''
+        name = Profiler.get_name(key)
+        name_id = self._string_ids.get(name)
+
+        if name_id is None:
+            name_id = self._string_ids[name] = len(self._names)
+            self._names.append(name)
+
+        self.name_ids[key] = name_id
+        return name_id
+
+    def record(self, kind, key, code = 0, value = 0.0):
+        '''
+            Records a record at the current time and tick of the Process Manager
+
+            @param kind: EVENT, STATE, TELEMETRY, INPUT, OUTPUT or DASHBOARD
+            @param key: The event name, process or channel name
+        '''
+        name_id = self.name_ids.get(key)
+
+        if name_id is None:
+            name_id = self._intern(key)
+
+        offset = Flight_Recorder.HEADER_SIZE + (self.count % self.capacity) * Flight_Recorder.RECORD_SIZE
+        manager = self.manager
+        Flight_Recorder._record.pack_into(self.buffer, offset, manager.now, manager.tick, name_id, kind, code, value)
+        self.count += 1
+
+    def record_event(self, event_name):
+        self.record(Flight_Recorder.EVENT, event_name)
+
+    def record_state(self, process, state):
+        self.record(Flight_Recorder.STATE, process, state)
+
+    def _get_string_id(self, value):
+        string_id = self.name_ids.get(value)
+        if string_id is None:
+            string_id = self._intern(value)
+        return string_id
+
+    def record_value(self, name, value):
+        if isinstance(value, str):
+            value = self._get_string_id(value)
+        self.record(Flight_Recorder.TELEMETRY, name, 0, value)
+
+    def record_input(self, name, code, value):
+        self.record(Flight_Recorder.INPUT, name, code, value)
+
+    def record_output(self, name, value):
+        self.record(Flight_Recorder.OUTPUT, name, 0, value)
+
+    def record_dashboard(self, key, value):
+        '''
+            Records a dashboard value. Values that aren't numbers or booleans
+            are recorded as strings.
+        '''
+        if isinstance(value, bool):
+            self.record(Flight_Recorder.DASHBOARD, key, 1, value)
+        elif isinstance(value, (int, float)):
+            self.record(Flight_Recorder.DASHBOARD, key, 0, value)
+        else:
+            self.record(Flight_Recorder.DASHBOARD, key, 2, self._get_string_id(str(value)))
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        '''
+            Writes the new names and the records to disk. The names are written
+            first so a flushed record never refers to a name that isn't.
+        '''
+        with self._lock:
+            if self.buffer.closed:
+                return
+
+            # Every name a counted record refers to was interned before it was
+            # recorded, so it is already in the names. Names are only ever
+            # appended, so the ones after those written are the new ones.
+            count = self.count
+            names = self._names
+            written = self._written_names
+            new_names = names[written:]
+
+            if new_names:
+                self._names_file.write(''.join(name.replace('\n', ' ') + '\n' for name in new_names))
+                self._names_file.flush()
+                self._written_names = written + len(new_names)
+
+            if count != self.flushed_count:
+                Flight_Recorder._header.pack_into(self.buffer, 0, Flight_Recorder.MAGIC, Flight_Recorder.VERSION,
+                                                  Flight_Recorder.RECORD_SIZE, self.capacity, count)
+                self.buffer.flush()
+                self.flushed_count = count
+
+    def close(self):
+        '''
+            Stops the background thread, flushes the last records and closes
+            the file
+        '''
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+        with self._lock:
+            self.buffer.close()
+            self._file.close()
+            self._names_file.close()
+
+
+class Recording:
+
+    '''
+        The records of a flight recorder file as columns, oldest first. Each
+        column is an array with one item per record.
+    '''
+
+    def __init__(self, names):
+        self.names = names
+        self.time = array('d')
+        self.tick = array('I')
+        self.name_id = array('I')
+        self.kind = array('B')
+        self.code = array('B')
+        self.value = array('d')
+
+    def __len__(self):
+        return len(self.time)
+
+    def get_name(self, index):
+        return self.names[self.name_id[index]]
+
+    def get_dashboard_value(self, index):
+        '''
+            Gets the value of a DASHBOARD record as the type it was recorded as
+        '''
+        value_type = Flight_Recorder.DASHBOARD_TYPES[self.code[index]]
+
+        if value_type is str:
+            return self.names[int(self.value[index])]
+
+        return value_type(self.value[index])
+
+    def rows(self, kind = None, name = None):
+        '''
+            Yields (time, tick, name, kind, code, value) for each record,
+            optionally only the records of a kind or name
+        '''
+        name_id = self.names.index(name) if name is not None else None
+
+        for i in range(len(self.time)):
+            if kind is not None and self.kind[i] != kind:
+                continue
+            if name_id is not None and self.name_id[i] != name_id:
+                continue
+            yield (self.time[i], self.tick[i], self.names[self.name_id[i]], self.kind[i], self.code[i], self.value[i])
+
+
+def read_recording(path, chunk_records = 4096):
+    '''
+        Reads a flight recorder file into a Recording. The file is read a chunk
+        of records at a time.
+    '''
+    with open(path + '.names', encoding = 'utf-8') as f:
+        names = f.read().split('\n')[:-1]
+
+    recording = Recording(names)
+    record = Flight_Recorder._record
+
+    with open(path, 'rb') as f:
+        magic, version, record_size, capacity, count = Flight_Recorder._header.unpack(
+            f.read(Flight_Recorder._header.size))
+
+        if magic != Flight_Recorder.MAGIC or version != Flight_Recorder.VERSION or record_size != record.size:
+            raise ValueError('%s is not a flight recorder file' % path)
+
+        # the oldest record is the one after the newest once the ring has wrapped
+        if count > capacity:
+            first = count % capacity
+            spans = ((first, capacity), (0, first))
+        else:
+            spans = ((0, count),)
+
+        columns = (recording.time, recording.tick, recording.name_id, recording.kind, recording.code, recording.value)
+
+        for start, end in spans:
+            f.seek(Flight_Recorder.HEADER_SIZE + start * record_size)
+
+            while start < end:
+                chunk = min(chunk_records, end - start)
+                data = f.read(chunk * record_size)
+                unpacked = tuple(zip(*record.iter_unpack(data)))
+                for column, values in zip(columns, unpacked):
+                    column.extend(values)
+                start += chunk
+
+    return recording
@@ -0,0 +1,67 @@
+from . import Event_Manager, Process_Manager, Telemetry, Parameters, hardware
+
+class EventRobot(hardware.IterativeRobot):
+    
+    # seconds a tick can take before the BACKGROUND processes and listeners
+    # and the telemetry are put off to the next tick, leaving room in the
+    # 20ms loop so the motor safety watchdogs are fed on time
+    tick_budget = .015
+    
+    def __init__(self):
+        super().__init__()
+        Event_Manager.remove_all_listeners()
+        Parameters.listening = False
+        Process_Manager.budget = self.tick_budget
+    
+    def disabledInit(self):
+        self._init('disabled.init')
+    
+    def disabledPeriodic(self):
+        self._periodic('disabled.periodic')
+    
+    def autonomousInit(self):
+        self._init('auto.init')
+    
+    def autonomousPeriodic(self):
+        self._periodic('auto.periodic')
+    
+    def teleopInit(self):
+        self._init('teleop.init')
+    
+    def teleopPeriodic(self):
+        self._periodic('teleop.periodic')
+        
+    def _init(self, event_name):
+        '''
+            Enters a mode. The time is updated first so processes started by the
+            init event are timed from when the mode started.
+        '''
+        Process_Manager.update_time()
+        Event_Manager.trigger(event_name)
+        
+    def _periodic(self, event_name):
+        '''
+            Runs one robot loop. The CRITICAL and NORMAL processes are run
+            first, and the events posted to the event queue during the loop are
+            triggered after the periodic event, so the drive is fed before any
+            BACKGROUND work is done. The BACKGROUND processes are run next, and
+            the telemetry set during the loop is published last, in one batch,
+            unless the loop is already over its budget.
+            
+            A profiler's tick is ended before the processes run, so it is
+            timed from the same point as the Process Manager's tick.
+        '''
+        profiler = Process_Manager.profiler
+        
+        if profiler is not None:
+            profiler.end_tick()
+            
+        Process_Manager.run_foreground()
+        Event_Manager.trigger(event_name)
+        Event_Manager.drain()
+        Process_Manager.run_background()
+        
+        if not (Process_Manager.over_budget() and Telemetry.defer()):
+            Telemetry.flush(Process_Manager.now)
+        
+        Process_Manager.end_tick()
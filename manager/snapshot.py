@@ -0,0 +1,65 @@
+import threading
+
+class Snapshot:
+
+    '''
+        Hands the latest value of each key from a thread like the
+        NetworkTables thread to the robot loop. The other thread puts values
+        and the robot loop takes all of the values put since it last took
+        them, once per tick. A key put several times between takes is only
+        taken once with its latest value.
+
+        Both sides hold the lock for a dict operation and nothing else, and
+        take swaps in a new dict instead of copying.
+    '''
+
+    def __init__(self, max_keys = 256):
+        '''
+            @param max_keys: The most keys that can be waiting to be taken.
+            Puts of other keys are dropped until the values are taken, so the
+            other thread can't make a tick do more than max_keys updates.
+        '''
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._values = {}
+        # values put, puts that replaced a value that hadn't been taken yet,
+        # and puts dropped because max_keys were waiting
+        self.puts = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def put(self, key, value):
+        '''
+            @return: False if the value was dropped
+        '''
+        with self._lock:
+            values = self._values
+
+            if key in values:
+                self.merged += 1
+            elif len(values) >= self.max_keys:
+                self.dropped += 1
+                return False
+
+            values[key] = value
+            self.puts += 1
+            return True
+
+    def take(self):
+        '''
+            @return: A dict of key -> latest value of the keys put since the
+            last take, or None if nothing was put
+        '''
+        # reading whether the dict is empty without the lock is safe, and a put
+        # that is missed is taken next tick
+        if not self._values:
+            return None
+
+        with self._lock:
+            values = self._values
+            self._values = {}
+
+        return values
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,183 @@
+
+class Channel:
+
+    '''
+        A value published to the SmartDashboard. Setting a channel only marks
+        it to be published at the end of the tick, and only if it changed more
+        than epsilon since it was last published and it hasn't been published
+        more often than its max rate.
+    '''
+
+    __slots__ = ('telemetry', 'name', 'kind', 'epsilon', 'min_interval', 'value', 'sent_value', 'sent_time',
+                 'dirty', 'sent', 'suppressed')
+
+    def __init__(self, telemetry, name, kind, epsilon, max_rate):
+        self.telemetry = telemetry
+        self.name = name
+        self.kind = kind
+        self.epsilon = epsilon
+        self.min_interval = 1 / max_rate if max_rate else 0
+        # the value waiting to be published
+        self.value = None
+        self.sent_value = None
+        self.sent_time = None
+        self.dirty = False
+        self.sent = 0
+        self.suppressed = 0
+
+    def is_changed(self, value):
+        sent_value = self.sent_value
+
+        if sent_value is None:
+            return True
+
+        if self.epsilon:
+            return abs(value - sent_value) > self.epsilon
+
+        return value != sent_value
+
+    def set(self, value):
+        if self.dirty:
+            # the pending value is replaced before it was published
+            self.suppressed += 1
+            self.telemetry.suppressed += 1
+        elif not self.is_changed(value):
+            self.suppressed += 1
+            self.telemetry.suppressed += 1
+            return
+        else:
+            self.dirty = True
+            self.telemetry._dirty.append(self)
+
+        self.value = value
+
+
+class Telemetry:
+
+    '''
+        Publishes values to the SmartDashboard in one batch per tick, skipping
+        the values that haven't changed and limiting how often each value is
+        published to cut down on NetworkTables traffic.
+    '''
+
+    NUMBER = 'putNumber'
+    BOOLEAN = 'putBoolean'
+    STRING = 'putString'
+
+    # the most flushes in a row that are deferred before one is done anyway
+    max_deferred_flushes = 10
+
+    def __init__(self, sink = None):
+        '''
+            @param sink: An object with putNumber, putBoolean and putString
+            methods. Defaults to the SmartDashboard of the hardware backend.
+        '''
+        self.sink = sink
+        # channel name -> Channel
+        self.channels = {}
+        self._dirty = []
+        self._deferred = []
+        self.sent = 0
+        self.suppressed = 0
+        self.recorder = None
+        # flushes put off to a later tick, and how many in a row
+        self.deferred_flushes = 0
+        self._flushes_deferred = 0
+
+    def set_recorder(self, recorder):
+        '''
+            Starts recording the published values with a Flight_Recorder, or
+            stops if the recorder is None
+        '''
+        self.recorder = recorder
+
+    def add_channel(self, name, kind = NUMBER, epsilon = 0, max_rate = None):
+        '''
+            Adds a channel, or returns the channel if it was already added
+
+            @param name: The SmartDashboard key
+            @param kind: NUMBER, BOOLEAN or STRING
+            @param epsilon: Numbers that changed by this much or less aren't published
+            @param max_rate: The most times per second the channel is published
+        '''
+        channel = self.channels.get(name)
+
+        if channel is None:
+            channel = self.channels[name] = Channel(self, name, kind, epsilon, max_rate)
+
+        return channel
+
+    def put(self, name, value, kind = NUMBER):
+        '''
+            Sets the value of a channel, adding the channel if it doesn't exist
+        '''
+        channel = self.channels.get(name)
+
+        if channel is None:
+            channel = self.add_channel(name, kind)
+
+        channel.set(value)
+
+    def defer(self):
+        '''
+            Leaves the channels set this tick to be published by the next
+            flush, when the tick is over its budget
+
+            @return: False if too many flushes in a row were deferred, and this
+            one has to be done
+        '''
+        if not self._dirty:
+            return True
+
+        if self._flushes_deferred >= self.max_deferred_flushes:
+            return False
+
+        self._flushes_deferred += 1
+        self.deferred_flushes += 1
+        return True
+
+    def flush(self, now):
+        '''
+            Publishes the channels that were set since the last flush
+
+            @param now: The current time in seconds
+        '''
+        if not self._dirty:
+            return
+
+        self._flushes_deferred = 0
+
+        if self.sink is None:
+            from . import hardware
+            self.sink = hardware.SmartDashboard
+
+        sink = self.sink
+        recorder = self.recorder
+        dirty = self._dirty
+        deferred = self._deferred
+
+        for channel in dirty:
+            if channel.sent_time is not None and now - channel.sent_time < channel.min_interval:
+                deferred.append(channel)
+                continue
+
+            channel.dirty = False
+
+            if not channel.is_changed(channel.value):
+                channel.suppressed += 1
+                self.suppressed += 1
+                continue
+
+            getattr(sink, channel.kind)(channel.name, channel.value)
+            channel.sent_value = channel.value
+            channel.sent_time = now
+            channel.sent += 1
+            self.sent += 1
+
+            if recorder is not None:
+                recorder.record_value(channel.name, channel.value)
+
+        # the channels published too recently are published in a later flush
+        del dirty[:]
+        self._dirty = deferred
+        self._deferred = dirty
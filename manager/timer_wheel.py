@@ -0,0 +1,52 @@
+
+class Timer_Wheel:
+
+    '''
+        A hashed timer wheel. Timers are put in the slot their deadline tick
+        hashes to, so advancing the wheel one tick only looks at the timers in
+        one slot instead of every timer. Timers more than a full turn of the
+        wheel away stay in their slot until the turn they are due in.
+    '''
+
+    def __init__(self, size = 256):
+        self.size = size
+        # each slot is a list of (deadline tick, item)
+        self.slots = [[] for i in range(size)]
+        self.tick = 0
+        self.count = 0
+
+    def schedule(self, item, ticks):
+        '''
+            Adds a timer.
+
+            @param item: The item returned by advance when the timer is due
+            @param ticks: The number of ticks from now the timer is due in. At
+            least one.
+            @return: The tick the timer is due in
+        '''
+        deadline = self.tick + max(1, ticks)
+        self.slots[deadline % self.size].append((deadline, item))
+        self.count += 1
+        return deadline
+
+    def advance(self, due):
+        '''
+            Moves the wheel forward one tick.
+
+            @param due: A list the items of the timers that are due are added to
+        '''
+        self.tick += 1
+        tick = self.tick
+        slot = self.slots[tick % self.size]
+
+        i = 0
+        while i < len(slot):
+            timer = slot[i]
+            if timer[0] <= tick:
+                due.append(timer[1])
+                last_timer = slot.pop()
+                if i < len(slot):
+                    slot[i] = last_timer
+                self.count -= 1
+            else:
+                i += 1
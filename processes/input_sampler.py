@@ -0,0 +1,159 @@
+from manager import *
+
+class Joystick_Sampler:
+
+    '''
+        A process that samples a joystick once per tick. All of the buttons are
+        read as one bitmask and compared with the previous tick's bitmask to
+        find the buttons that were pressed or released, and all of the axes
+        are read and deadbanded in one pass.
+
+        For each named button the sampler triggers the events
+        '<name>.<button>.when_pressed', '.when_released', '.while_pressed' and
+        '.while_released', but only the ones that have listeners.
+    '''
+
+    def __init__(self, joystick, name, buttons, axes = None, deadband = .1):
+        '''
+            @param joystick: The wpilib Joystick to sample
+            @param name: The first segment of the event names, e.g. 'joystick'
+            @param buttons: A dict of button name -> button number
+            @param axes: A dict of axis name -> axis number
+            @param deadband: Axis values smaller than this are read as 0
+        '''
+        self.joystick = joystick
+        self.name = name
+        self.deadband = deadband
+        self.button_numbers = tuple(buttons.values())
+        self.axis_names = tuple(axes.keys()) if axes else ()
+        self.axis_numbers = tuple(axes.values()) if axes else ()
+        self.axis_values = [0] * len(self.axis_numbers)
+        # bitmask of the buttons that are currently pressed, bit n - 1 is button n
+        self.buttons = 0
+        self.button_mask = 0
+        # the raw readings last recorded to the flight recorder
+        self.recorded_buttons = None
+        self.recorded_axes = [None] * len(self.axis_numbers)
+
+        # button number -> event name, for each kind of event
+        self.event_names = {}
+        for kind in ('when_pressed', 'when_released', 'while_pressed', 'while_released'):
+            self.event_names[kind] = names = {}
+            for button_name, button in buttons.items():
+                names[button] = '%s.%s.%s' % (name, button_name, kind)
+                self.button_mask |= 1 << (button - 1)
+
+        # bitmasks of the buttons whose events have listeners
+        self.listener_masks = dict.fromkeys(self.event_names, 0)
+        self.listener_version = None
+
+        # Read the buttons straight from the driver station as a bitmask if it can
+        self.ds = getattr(joystick, 'ds', None)
+        self.port = getattr(joystick, 'port', None)
+        # the inputs are recorded as 'stick<port>' so a replay knows which
+        # joystick to feed them to
+        self.input_name = 'stick%d' % (self.port or 0)
+        if self.ds is not None and self.port is not None and hasattr(self.ds, 'getStickButtons'):
+            self.read_buttons = self._read_button_bitmask
+        else:
+            self.read_buttons = self._read_each_button
+
+    def _read_button_bitmask(self):
+        return self.ds.getStickButtons(self.port)
+
+    def _read_each_button(self):
+        buttons = 0
+        for button in self.button_numbers:
+            if self.joystick.getRawButton(button):
+                buttons |= 1 << (button - 1)
+        return buttons
+
+    def read_axes(self):
+        joystick = self.joystick
+        deadband = self.deadband
+        values = self.axis_values
+
+        recorder = Event_Manager.recorder
+
+        for i, axis in enumerate(self.axis_numbers):
+            value = joystick.getRawAxis(axis)
+            values[i] = value if abs(value) >= deadband else 0
+
+            if recorder is not None and value != self.recorded_axes[i]:
+                self.recorded_axes[i] = value
+                recorder.record_input(self.input_name, axis, value)
+
+    def _record_buttons(self, buttons):
+        recorder = Event_Manager.recorder
+
+        if recorder is not None and buttons != self.recorded_buttons:
+            self.recorded_buttons = buttons
+            recorder.record_input(self.input_name, recorder.BUTTONS, buttons)
+
+    def post_axes(self):
+        '''
+            Posts the '<name>.axis.updated' event with the axis values of this
+            tick as a dict of axis name -> value
+        '''
+        Event_Manager.post(self.name + '.axis.updated', dict(zip(self.axis_names, self.axis_values)))
+
+    def _update_listener_masks(self):
+        '''
+            Finds the buttons whose events have listeners
+        '''
+        for kind, names in self.event_names.items():
+            mask = 0
+            for button, event_name in names.items():
+                if Event_Manager.get_listeners(event_name):
+                    mask |= 1 << (button - 1)
+            self.listener_masks[kind] = mask
+
+        self.listener_version = Event_Manager.version
+
+    def _trigger(self, kind, buttons):
+        '''
+            Triggers an event for each button in a bitmask
+        '''
+        names = self.event_names[kind]
+
+        while buttons:
+            lowest_button = buttons & -buttons
+            Event_Manager.trigger(names[lowest_button.bit_length()])
+            buttons ^= lowest_button
+
+    def __call__(self, process):
+
+        # Process has started
+        if process.state is Process_Manager.STARTED:
+            buttons = self.read_buttons()
+            self._record_buttons(buttons)
+            self.buttons = buttons & self.button_mask
+            self.read_axes()
+            return
+
+        # Do nothing if process isn't being started or run
+        elif process.state is not Process_Manager.RUNNING:
+            return
+
+        if self.listener_version != Event_Manager.version:
+            self._update_listener_masks()
+
+        # Process is running
+        previous_buttons = self.buttons
+        buttons = self.read_buttons()
+        self._record_buttons(buttons)
+        buttons = self.buttons = buttons & self.button_mask
+        changed = buttons ^ previous_buttons
+        masks = self.listener_masks
+
+        self.read_axes()
+
+        if masks['while_pressed'] & buttons:
+            self._trigger('while_pressed', masks['while_pressed'] & buttons)
+
+        if masks['while_released'] & ~buttons:
+            self._trigger('while_released', masks['while_released'] & ~buttons)
+
+        if changed:
+            self._trigger('when_pressed', masks['when_pressed'] & changed & buttons)
+            self._trigger('when_released', masks['when_released'] & changed & ~buttons)
@@ -1,21 +1,27 @@
+import os
 import manager
-from subsystems import *
-import wpilib
+import subsystems
+from manager import hardware
 from common import port_values as pv
 
 
 class MyRobot(manager.EventRobot):
     
+    # the parameters tuned on the dashboard are saved next to the robot code
+    parameters_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parameters.json')
+    
     def robotInit(self):
         '''
             Initialize robot components here
         '''
+        manager.Parameters.load(self.parameters_path)
         
-        self.drive = Drive(self)
-        self.grabber_lift = Grabber_Lift(self)
-        self.oi = OI(self)
-        self.autonomous = Autonomous(self)
-        self.teleop = Teleop(self)
+        self.sensors = subsystems.Sensors(self)
+        self.drive = subsystems.Drive(self)
+        self.grabber_lift = subsystems.Grabber_Lift(self)
+        self.oi = subsystems.OI(self)
+        self.autonomous = subsystems.Autonomous(self)
+        self.teleop = subsystems.Teleop(self)
 
 if __name__ == '__main__':
-    wpilib.run(MyRobot)
\ No newline at end of file
+    hardware.run(MyRobot)
\ No newline at end of file
@@ -0,0 +1,6 @@
+'''
+    Stand-ins for wpilib, hal and networktables, and the tools that run the
+    robot code on them without a robot
+'''
+
+from .fakes import install, hardware
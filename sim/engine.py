@@ -0,0 +1,157 @@
+'''
+    Runs the robot code headless on the stand-in hardware and a Manual_Clock,
+    as fast as it can, with a physics model in place of the robot.
+
+    Run a match from the root of the project with:
+
+        python -m sim.engine [autonomous routine] [teleop seconds]
+'''
+
+import sys
+import time
+from .fakes import install, hardware, Driver_Station, NetworkTable
+
+install()
+
+from .physics import Physics_Model
+from manager import Event_Manager, Process_Manager, Telemetry, Parameters, stop_recording
+from manager.clock import Manual_Clock
+
+
+# the first segment of the mode events -> the EventRobot init and periodic methods
+MODES = {
+    'disabled' : ('disabledInit', 'disabledPeriodic'),
+    'auto' : ('autonomousInit', 'autonomousPeriodic'),
+    'teleop' : ('teleopInit', 'teleopPeriodic')
+}
+
+
+def reset(clock):
+    '''
+        Puts the managers and the stand-in hardware back the way they are when
+        the robot boots
+    '''
+    stop_recording()
+    hardware.reset()
+    Event_Manager.__init__()
+    Process_Manager.__init__(clock, Event_Manager, clock.now)
+    Telemetry.__init__()
+    Parameters.__init__(Event_Manager, Process_Manager, Telemetry)
+
+
+class Simulator:
+
+    '''
+        Boots an EventRobot on the stand-in hardware and runs its modes tick by
+        tick on a Manual_Clock. After each tick the physics model is moved
+        forward one tick period.
+
+        A driver is a function called with the simulator and the seconds since
+        the mode started before each tick, that sets the joysticks through
+        simulator.ds.
+    '''
+
+    def __init__(self, robot_class = None, physics_class = Physics_Model, tick_period = .02, **physics_kwargs):
+        '''
+            @param robot_class: The EventRobot to run. Defaults to robot.MyRobot.
+            @param physics_class: Called with the robot and physics_kwargs to
+            create the physics model.
+            @param tick_period: The simulated seconds between ticks.
+        '''
+        self.tick_period = tick_period
+        self.clock = Manual_Clock(0.0)
+        reset(self.clock)
+
+        if robot_class is None:
+            from robot import MyRobot as robot_class
+
+        self.robot = robot_class()
+        # runs don't depend on or change the values tuned on the robot
+        self.robot.parameters_path = None
+        self.robot.robotInit()
+        self.physics = physics_class(self.robot, **physics_kwargs)
+        self.ds = Driver_Station.getInstance()
+        self.dashboard = NetworkTable.getTable('SmartDashboard')
+        self.mode = None
+        self.ticks = 0
+        # wall clock seconds spent running ticks
+        self.seconds = 0.0
+
+    @property
+    def time(self):
+        return self.clock.now()
+
+    @property
+    def ticks_per_second(self):
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+    def set_dashboard(self, key, value):
+        '''
+            Changes a dashboard value the way the driver station would
+        '''
+        self.dashboard.put_remote(key, value)
+
+    def run_mode(self, mode, seconds, driver = None):
+        '''
+            Enters a mode and runs it for a number of simulated seconds
+
+            @param mode: 'disabled', 'auto' or 'teleop'
+        '''
+        init, periodic = MODES[mode]
+        periodic = getattr(self.robot, periodic)
+        physics = self.physics
+        clock = self.clock
+        tick_period = self.tick_period
+        mode_start = clock.now()
+        ticks = int(round(seconds / tick_period))
+
+        self.mode = mode
+        start = time.perf_counter()
+        getattr(self.robot, init)()
+
+        for i in range(ticks):
+            clock.advance(tick_period)
+
+            if driver is not None:
+                driver(self, clock.now() - mode_start)
+
+            periodic()
+            physics.update(tick_period)
+
+        self.seconds += time.perf_counter() - start
+        self.ticks += ticks
+
+    def run_match(self, auto_seconds = 15, teleop_seconds = 135, driver = None, disabled_seconds = .1):
+        '''
+            Runs a short disabled period, autonomous and then teleop
+        '''
+        self.run_mode('disabled', disabled_seconds)
+        self.run_mode('auto', auto_seconds)
+        self.run_mode('teleop', teleop_seconds, driver)
+
+
+def drive_in_circles(simulator, seconds):
+    '''
+        A driver that drives forward while turning
+    '''
+    ds = simulator.ds
+    ds.set_axis(0, 1, -.5)
+    ds.set_axis(0, 3, .3)
+
+def main():
+    simulator = Simulator()
+
+    if len(sys.argv) > 1:
+        simulator.set_dashboard('autonomous_mode', sys.argv[1])
+
+    teleop_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 135
+    simulator.run_match(teleop_seconds = teleop_seconds, driver = drive_in_circles)
+
+    physics = simulator.physics
+    print('ran %d ticks (%.0f simulated seconds) in %.2f s, %.0f ticks/s' % (
+        simulator.ticks, simulator.time, simulator.seconds, simulator.ticks_per_second))
+    print('robot at (%.1f, %.1f) ft heading %.0f deg, lift at %d' % (
+        physics.x, physics.y, physics.heading % 360, physics.lift.analog_position))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,554 @@
+import math
+import sys
+import types
+from enum import IntEnum
+
+class Hardware:
+
+    '''
+        Keeps track of the stand-in devices the robot code creates, so a
+        simulation can read what was written to the outputs and set what the
+        sensors read
+    '''
+
+    def __init__(self):
+        # device name -> device, e.g. 'CANTalon[0]'
+        self.devices = {}
+        # the number of writes to all of the outputs
+        self.writes = 0
+
+    def add(self, device):
+        self.devices[device.name] = device
+
+    def get(self, name):
+        return self.devices.get(name)
+
+    def outputs(self):
+        '''
+            Returns a dict of output device name -> the value last written
+        '''
+        return {name : device.value for name, device in self.devices.items() if isinstance(device, Output)}
+
+    def reset(self):
+        self.devices.clear()
+        self.writes = 0
+        Driver_Station.instance = None
+        SmartDashboard.table = None
+        NetworkTable.tables.clear()
+
+hardware = Hardware()
+
+
+class Device:
+
+    def __init__(self, name):
+        self.name = name
+        hardware.add(self)
+
+
+class Output(Device):
+
+    '''
+        A device the robot writes to. The value last written is kept, and the
+        number of writes is counted.
+    '''
+
+    def __init__(self, name, value = 0.0):
+        super().__init__(name)
+        self.value = value
+        self.writes = 0
+
+    def _write(self, value):
+        self.value = value
+        self.writes += 1
+        hardware.writes += 1
+
+
+class Speed_Controller(Output):
+
+    def __init__(self, channel):
+        super().__init__('%s[%d]' % (type(self).__name__, channel))
+        self.channel = channel
+        self.inverted = False
+
+    def set(self, speed, sync_group = 0):
+        self._write(speed)
+
+    def get(self):
+        return self.value
+
+    def setInverted(self, inverted):
+        self.inverted = inverted
+
+    def disable(self):
+        self._write(0.0)
+
+
+class Talon(Speed_Controller):
+    pass
+
+
+class CANJaguar(Speed_Controller):
+
+    @staticmethod
+    def updateSyncGroup(sync_group):
+        pass
+
+
+class CANTalon(Speed_Controller):
+
+    '''
+        A CANTalon in percent vbus, position or follower mode. In position mode
+        the value is the goal position, and the closed loop error is read from
+        the analog position, which a simulation sets.
+    '''
+
+    class ControlMode(IntEnum):
+        PercentVbus = 0
+        Position = 1
+        Speed = 2
+        Current = 3
+        Voltage = 4
+        Follower = 5
+
+    class FeedbackDevice(IntEnum):
+        QuadEncoder = 0
+        AnalogPot = 2
+        AnalogEncoder = 3
+
+    def __init__(self, device_number):
+        super().__init__(device_number)
+        self.device_number = device_number
+        self.control_mode = CANTalon.ControlMode.PercentVbus
+        self.feedback_device = None
+        self.p = self.i = self.d = 0.0
+        self.reversed = False
+        self.brake = False
+        # the raw 0 - 1023 reading of the analog pot
+        self.analog_position = 0
+
+    def changeControlMode(self, mode):
+        self.control_mode = mode
+
+    def getControlMode(self):
+        return self.control_mode
+
+    def setFeedbackDevice(self, device):
+        self.feedback_device = device
+
+    def setPID(self, p, i, d, *args):
+        self.p, self.i, self.d = p, i, d
+
+    def setP(self, p):
+        self.p = p
+
+    def setI(self, i):
+        self.i = i
+
+    def setD(self, d):
+        self.d = d
+
+    def reverseOutput(self, reversed):
+        self.reversed = reversed
+
+    def getDeviceID(self):
+        return self.device_number
+
+    def enableBrakeMode(self, brake):
+        self.brake = brake
+
+    def getClosedLoopError(self):
+        if self.control_mode == CANTalon.ControlMode.Position:
+            return int(self.value - self.analog_position)
+        return 0
+
+    def getAnalogInPosition(self):
+        return self.analog_position
+
+    def getAnalogInRaw(self):
+        return int(self.analog_position)
+
+    def setForwardSoftLimit(self, limit):
+        pass
+
+    def setReverseSoftLimit(self, limit):
+        pass
+
+    def setCloseLoopRampRate(self, rate):
+        pass
+
+
+class DoubleSolenoid(Output):
+
+    class Value(IntEnum):
+        kOff = 0
+        kForward = 1
+        kReverse = 2
+
+    def __init__(self, *args):
+        # (forward channel, reverse channel) or (module, forward channel, reverse channel)
+        super().__init__('DoubleSolenoid[%s]' % ','.join(str(arg) for arg in args), DoubleSolenoid.Value.kOff)
+
+    def set(self, value):
+        self._write(value)
+
+    def get(self):
+        return self.value
+
+
+class DigitalInput(Device):
+
+    def __init__(self, channel):
+        super().__init__('DigitalInput[%d]' % channel)
+        self.value = False
+
+    def get(self):
+        return self.value
+
+
+class Gyro(Device):
+
+    def __init__(self, channel):
+        super().__init__('Gyro[%d]' % channel)
+        self.angle = 0.0
+        self.rate = 0.0
+
+    def getAngle(self):
+        return self.angle
+
+    def getRate(self):
+        return self.rate
+
+    def reset(self):
+        self.angle = 0.0
+
+
+class BuiltInAccelerometer(Device):
+
+    def __init__(self, *args):
+        super().__init__('BuiltInAccelerometer')
+        self.x = 0.0
+        self.y = 0.0
+        self.z = 1.0
+
+    def getX(self):
+        return self.x
+
+    def getY(self):
+        return self.y
+
+    def getZ(self):
+        return self.z
+
+
+class Driver_Station:
+
+    '''
+        The joystick buttons and axes the robot reads, set by a simulation or
+        a replay
+    '''
+
+    instance = None
+    kJoystickPorts = 6
+
+    @staticmethod
+    def getInstance():
+        if Driver_Station.instance is None:
+            Driver_Station.instance = Driver_Station()
+        return Driver_Station.instance
+
+    def __init__(self):
+        self.stick_buttons = [0] * Driver_Station.kJoystickPorts
+        self.stick_axes = [[0.0] * 12 for port in range(Driver_Station.kJoystickPorts)]
+
+    def getStickButtons(self, port):
+        return self.stick_buttons[port]
+
+    def getStickAxis(self, port, axis):
+        return self.stick_axes[port][axis]
+
+    def set_button(self, port, button, pressed):
+        if pressed:
+            self.stick_buttons[port] |= 1 << (button - 1)
+        else:
+            self.stick_buttons[port] &= ~(1 << (button - 1))
+
+    def set_axis(self, port, axis, value):
+        self.stick_axes[port][axis] = value
+
+
+class Joystick:
+
+    def __init__(self, port):
+        self.port = port
+        self.ds = Driver_Station.getInstance()
+
+    def getRawButton(self, button):
+        return (self.ds.getStickButtons(self.port) >> (button - 1)) & 1 == 1
+
+    def getRawAxis(self, axis):
+        return self.ds.getStickAxis(self.port, axis)
+
+    getAxis = getRawAxis
+
+
+class RobotDrive:
+
+    '''
+        The parts of RobotDrive the robot code uses. The motors are created
+        as Talons when they are given as channels.
+    '''
+
+    class MotorType(IntEnum):
+        kFrontLeft = 0
+        kFrontRight = 1
+        kRearLeft = 2
+        kRearRight = 3
+
+    kMaxNumberOfMotors = 4
+    kMecanumCartesian_Reported = False
+    kTank_Reported = False
+
+    def __init__(self, front_left, rear_left, front_right, rear_right):
+        motors = []
+        for motor in (front_left, rear_left, front_right, rear_right):
+            motors.append(Talon(motor) if isinstance(motor, int) else motor)
+        self.frontLeftMotor, self.rearLeftMotor, self.frontRightMotor, self.rearRightMotor = motors
+        self.invertedMotors = [1] * RobotDrive.kMaxNumberOfMotors
+        self.maxOutput = 1.0
+        self.syncGroup = 0
+
+    def getNumMotors(self):
+        return 4
+
+    def setInvertedMotor(self, motor, is_inverted):
+        self.invertedMotors[motor] = -1 if is_inverted else 1
+
+    def setMaxOutput(self, max_output):
+        self.maxOutput = max_output
+
+    def feed(self):
+        pass
+
+    @staticmethod
+    def limit(value):
+        return max(-1.0, min(1.0, value))
+
+    @staticmethod
+    def normalize(wheel_speeds):
+        max_magnitude = max(abs(speed) for speed in wheel_speeds)
+        if max_magnitude > 1.0:
+            for i in range(len(wheel_speeds)):
+                wheel_speeds[i] = wheel_speeds[i] / max_magnitude
+
+    @staticmethod
+    def rotateVector(x, y, angle):
+        cos_a = math.cos(math.radians(angle))
+        sin_a = math.sin(math.radians(angle))
+        return x * cos_a - y * sin_a, x * sin_a + y * cos_a
+
+    def tankDrive(self, left, right, squared_inputs = True):
+        left = RobotDrive.limit(left)
+        right = RobotDrive.limit(right)
+
+        if squared_inputs:
+            left = math.copysign(left * left, left)
+            right = math.copysign(right * right, right)
+
+        self.setLeftRightMotorOutputs(left, right)
+
+    def setLeftRightMotorOutputs(self, left, right):
+        MotorType = RobotDrive.MotorType
+        self.frontLeftMotor.set(RobotDrive.limit(left) * self.invertedMotors[MotorType.kFrontLeft] * self.maxOutput)
+        self.rearLeftMotor.set(RobotDrive.limit(left) * self.invertedMotors[MotorType.kRearLeft] * self.maxOutput)
+        self.frontRightMotor.set(-RobotDrive.limit(right) * self.invertedMotors[MotorType.kFrontRight] * self.maxOutput)
+        self.rearRightMotor.set(-RobotDrive.limit(right) * self.invertedMotors[MotorType.kRearRight] * self.maxOutput)
+        self.feed()
+
+
+class Table:
+
+    '''
+        A NetworkTables table. Listeners are only told about the values put by
+        put_remote, the way a dashboard would change them.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.values = {}
+        self.listeners = []
+        self.puts = 0
+
+    def addTableListener(self, listener, immediate_notify = False):
+        self.listeners.append(listener)
+        if immediate_notify:
+            for key, value in self.values.items():
+                listener(self, key, value, True)
+
+    def _put(self, key, value):
+        self.values[key] = value
+        self.puts += 1
+
+    putNumber = putBoolean = putString = putValue = _put
+
+    def getValue(self, key, default = None):
+        return self.values.get(key, default)
+
+    getNumber = getBoolean = getString = getValue
+
+    def put_remote(self, key, value):
+        '''
+            Changes a value the way the dashboard would and tells the listeners
+        '''
+        is_new = key not in self.values
+        self.values[key] = value
+        for listener in self.listeners:
+            listener(self, key, value, is_new)
+
+
+class NetworkTable:
+
+    tables = {}
+
+    @staticmethod
+    def getTable(name):
+        table = NetworkTable.tables.get(name)
+        if table is None:
+            table = NetworkTable.tables[name] = Table(name)
+        return table
+
+
+class SmartDashboard:
+
+    table = None
+
+    @staticmethod
+    def getTable():
+        if SmartDashboard.table is None:
+            SmartDashboard.table = NetworkTable.getTable('SmartDashboard')
+        return SmartDashboard.table
+
+    @staticmethod
+    def putNumber(key, value):
+        SmartDashboard.getTable().putNumber(key, value)
+
+    @staticmethod
+    def putBoolean(key, value):
+        SmartDashboard.getTable().putBoolean(key, value)
+
+    @staticmethod
+    def putString(key, value):
+        SmartDashboard.getTable().putString(key, value)
+
+    @staticmethod
+    def putData(key, data):
+        SmartDashboard.getTable().putValue(key, data)
+
+    @staticmethod
+    def getNumber(key, default = None):
+        return SmartDashboard.getTable().getValue(key, default)
+
+    getBoolean = getString = getNumber
+
+
+class SendableChooser:
+
+    def __init__(self):
+        self.choices = {}
+        self.default = None
+        self.selected = None
+
+    def addObject(self, name, value):
+        self.choices[name] = value
+
+    def addDefault(self, name, value):
+        self.choices[name] = value
+        self.default = name
+
+    def getSelected(self):
+        return self.choices.get(self.selected or self.default)
+
+
+class Subsystem:
+
+    def __init__(self, name = None):
+        self.name = name or type(self).__name__
+
+
+class IterativeRobot:
+
+    def __init__(self):
+        pass
+
+    def robotInit(self):
+        pass
+
+
+def run(robot_class):
+    raise RuntimeError('The robot can\'t be run on the stand-in wpilib, use the sim engine instead')
+
+
+class HALUsageReporting:
+    kResourceType_RobotDrive = 0
+    kRobotDrive_MecanumCartesian = 0
+    kRobotDrive_Tank = 0
+
+def HALReport(*args):
+    pass
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+def install():
+    '''
+        Binds the hardware layer of the robot code to the stand-ins, and puts
+        them in sys.modules in place of wpilib, hal and networktables for code
+        that imports those directly. This has to be done before the robot code
+        is imported.
+    '''
+    from manager import hardware as hardware_layer
+    hardware_layer.set_backend(sys.modules[__name__])
+
+    if getattr(sys.modules.get('wpilib'), 'IS_STAND_IN', False):
+        return
+
+    joystick = _module('wpilib.joystick', Joystick = Joystick)
+    sendable_chooser = _module('wpilib.sendablechooser', SendableChooser = SendableChooser)
+    smart_dashboard = _module('wpilib.smartdashboard', SmartDashboard = SmartDashboard)
+    command = _module('wpilib.command', Subsystem = Subsystem)
+
+    wpilib = _module('wpilib',
+        IS_STAND_IN = True,
+        IterativeRobot = IterativeRobot,
+        RobotDrive = RobotDrive,
+        Talon = Talon,
+        CANJaguar = CANJaguar,
+        CANTalon = CANTalon,
+        DoubleSolenoid = DoubleSolenoid,
+        DigitalInput = DigitalInput,
+        Gyro = Gyro,
+        BuiltInAccelerometer = BuiltInAccelerometer,
+        DriverStation = Driver_Station,
+        Joystick = Joystick,
+        SmartDashboard = SmartDashboard,
+        SendableChooser = SendableChooser,
+        run = run,
+        joystick = joystick,
+        sendablechooser = sendable_chooser,
+        smartdashboard = smart_dashboard,
+        command = command
+    )
+    wpilib.__path__ = []
+
+    sys.modules.update({
+        'wpilib' : wpilib,
+        'wpilib.joystick' : joystick,
+        'wpilib.sendablechooser' : sendable_chooser,
+        'wpilib.smartdashboard' : smart_dashboard,
+        'wpilib.command' : command,
+        'hal' : _module('hal', HALReport = HALReport, HALUsageReporting = HALUsageReporting),
+        'networktables' : _module('networktables', NetworkTable = NetworkTable)
+    })
@@ -0,0 +1,171 @@
+import math
+from custom.cached_outputs import Cached_Output
+
+# feet / second / second in one g
+GRAVITY = 32.174
+
+def get_device(output):
+    '''
+        Gets the stand-in device an output the robot writes to wraps, so the
+        simulation reads and sets the device itself
+    '''
+    while isinstance(output, Cached_Output):
+        output = output.output
+    return output
+
+class Physics_Model:
+
+    '''
+        Moves a simulated robot based on what the robot code last wrote to the
+        stand-in motors and solenoids, and sets what the stand-in gyro,
+        accelerometer, lift pot and box sensor read.
+
+        The drive is a mecanum drive that reaches drive_speed in feet/second
+        and turn_rate in degrees/second at full output, with no inertia. The
+        lift moves at lift_speed pot bits/second at full output, and lags
+        behind the motor with a time constant of lift_time_constant. In position
+        mode the Talon's closed loop output is its P gain times the error, and
+        the lift sags when its brake is off and nothing drives it. Totes sit
+        at field positions in feet, and the box sensor sees one when it is
+        within grab_distance of the front of the robot. A clamped tote moves
+        with the robot.
+    '''
+
+    def __init__(self, robot, drive_speed = 10.0, turn_rate = 180.0, lift_speed = 600.0, sag_speed = 20.0,
+                 lift_time_constant = .15, totes = ((0.0, 3.0),), grab_distance = .5, robot_length = 2.5):
+        self.robot = robot
+        self.drive_speed = drive_speed
+        self.turn_rate = turn_rate
+        self.lift_speed = lift_speed
+        self.sag_speed = sag_speed
+        self.lift_time_constant = lift_time_constant
+        self.grab_distance = grab_distance
+        self.robot_length = robot_length
+
+        # field position in feet, heading in degrees clockwise
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self.vx = 0.0
+        self.vy = 0.0
+
+        self.totes = [list(tote) for tote in totes]
+        self.carried_tote = None
+
+        drive = robot.drive
+        self.robot_drive = drive.robot_drive
+        self.gyro = drive.gyro
+        self.accel = drive.accel
+
+        grabber_lift = robot.grabber_lift
+        self.lift = get_device(grabber_lift.motor_master)
+        self.grabber = get_device(grabber_lift.grabber)
+        self.box_sensor = grabber_lift.box_sensor
+        self.lift_position = float(self.lift.analog_position)
+        self.lift_velocity = 0.0
+
+    def get_wheel_speeds(self):
+        '''
+            Gets the wheel speeds from the drive motors as front left, front
+            right, rear left and rear right, with the inversions undone
+        '''
+        robot_drive = self.robot_drive
+        inverted = robot_drive.invertedMotors
+        MotorType = robot_drive.MotorType
+        return (
+            get_device(robot_drive.frontLeftMotor).value * inverted[MotorType.kFrontLeft],
+            get_device(robot_drive.frontRightMotor).value * inverted[MotorType.kFrontRight],
+            get_device(robot_drive.rearLeftMotor).value * inverted[MotorType.kRearLeft],
+            get_device(robot_drive.rearRightMotor).value * inverted[MotorType.kRearRight]
+        )
+
+    def update_drive(self, dt):
+        front_left, front_right, rear_left, rear_right = self.get_wheel_speeds()
+
+        # the inverse of the mecanum mixing in KwarqsDriveMech
+        forward = (front_left + front_right + rear_left + rear_right) / 4
+        strafe = (front_left - front_right - rear_left + rear_right) / 4
+        rotation = (front_left - front_right + rear_left - rear_right) / 4
+
+        self.heading += rotation * self.turn_rate * dt
+
+        angle = math.radians(self.heading)
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        vx = (strafe * cos_a + forward * sin_a) * self.drive_speed
+        vy = (forward * cos_a - strafe * sin_a) * self.drive_speed
+
+        if dt > 0:
+            # the accelerometer reads in g's along the robot's axes
+            ax = (vx - self.vx) / dt / GRAVITY
+            ay = (vy - self.vy) / dt / GRAVITY
+            self.accel.x = ax * cos_a - ay * sin_a
+            self.accel.y = ax * sin_a + ay * cos_a
+
+        self.vx = vx
+        self.vy = vy
+        self.x += vx * dt
+        self.y += vy * dt
+
+        self.gyro.rate = rotation * self.turn_rate
+        self.gyro.angle = self.heading
+
+    def update_lift(self, dt):
+        lift = self.lift
+
+        if lift.control_mode == lift.ControlMode.Position:
+            output = max(-1.0, min(1.0, lift.p * (lift.value - self.lift_position) / 1023))
+        elif lift.control_mode == lift.ControlMode.PercentVbus:
+            output = max(-1.0, min(1.0, lift.value))
+        else:
+            output = 0.0
+
+        # the lift takes lift_time_constant seconds to get most of the way to
+        # the speed the motor is driving it at
+        speed = output * self.lift_speed
+        if self.lift_time_constant > 0:
+            speed = self.lift_velocity + (speed - self.lift_velocity) * min(1.0, dt / self.lift_time_constant)
+        self.lift_velocity = speed
+
+        if abs(output) < .05 and not lift.brake:
+            speed -= self.sag_speed
+
+        self.lift_position = max(0.0, min(1023.0, self.lift_position + speed * dt))
+        if self.lift_position in (0.0, 1023.0):
+            self.lift_velocity = 0.0
+        lift.analog_position = round(self.lift_position)
+
+    def get_grab_point(self):
+        angle = math.radians(self.heading)
+        distance = self.robot_length / 2
+        return self.x + math.sin(angle) * distance, self.y + math.cos(angle) * distance
+
+    def update_totes(self):
+        grab_x, grab_y = self.get_grab_point()
+        clamped = self.grabber.value == self.grabber.Value.kForward
+
+        if self.carried_tote is not None:
+            if clamped:
+                self.carried_tote[0] = grab_x
+                self.carried_tote[1] = grab_y
+            else:
+                self.carried_tote = None
+
+        seen = None
+        for tote in self.totes:
+            if math.hypot(tote[0] - grab_x, tote[1] - grab_y) <= self.grab_distance:
+                seen = tote
+                break
+
+        if clamped and self.carried_tote is None and seen is not None:
+            self.carried_tote = seen
+
+        self.box_sensor.value = seen is not None
+
+    def update(self, dt):
+        '''
+            Moves the simulation forward dt seconds
+        '''
+        self.update_drive(dt)
+        self.update_lift(dt)
+        self.update_totes()
@@ -0,0 +1,217 @@
+'''
+    Replays a match recorded with manager.start_recording against the robot
+    code, on the stand-in hardware and a Manual_Clock, as fast as it can. The
+    recorded joystick readings, dashboard values and mode changes are fed to
+    the robot at the ticks they were recorded in, and the motor and solenoid
+    outputs the robot writes are compared with the recorded ones.
+
+    Run from the root of the project with:
+
+        python -m sim.replay match.evfr
+'''
+
+import os
+import sys
+import tempfile
+import time
+from .fakes import Driver_Station, NetworkTable
+from .engine import MODES, reset
+
+from manager import Process_Manager, start_recording, stop_recording, read_recording
+from manager.clock import Manual_Clock
+from manager.recorder import Flight_Recorder
+
+
+class Step:
+
+    '''
+        An init or periodic call of the robot loop
+    '''
+
+    __slots__ = ('index', 'tick', 'time', 'method', 'is_periodic')
+
+    def __init__(self, index, tick, time, method, is_periodic):
+        self.index = index
+        self.tick = tick
+        self.time = time
+        self.method = method
+        self.is_periodic = is_periodic
+
+
+class Mismatch:
+
+    __slots__ = ('tick', 'name', 'recorded', 'replayed')
+
+    def __init__(self, tick, name, recorded, replayed):
+        self.tick = tick
+        self.name = name
+        self.recorded = recorded
+        self.replayed = replayed
+
+    def __repr__(self):
+        return 'Mismatch(tick=%d, name=%s, recorded=%r, replayed=%r)' % (self.tick, self.name, self.recorded,
+                                                                          self.replayed)
+
+
+class Replay_Result:
+
+    def __init__(self, ticks, seconds, outputs_compared, mismatches):
+        self.ticks = ticks
+        self.seconds = seconds
+        self.outputs_compared = outputs_compared
+        self.mismatches = mismatches
+
+    @property
+    def ticks_per_second(self):
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+    @property
+    def matched(self):
+        return not self.mismatches
+
+
+def get_steps(recording):
+    '''
+        Finds the init and periodic calls of the robot loop from the mode
+        events in a recording
+    '''
+    steps = []
+
+    for i in range(len(recording)):
+        if recording.kind[i] != Flight_Recorder.EVENT:
+            continue
+
+        mode, separator, phase = recording.get_name(i).partition('.')
+
+        if mode in MODES and phase in ('init', 'periodic'):
+            is_periodic = phase == 'periodic'
+            steps.append(Step(i, recording.tick[i], recording.time[i], MODES[mode][is_periodic], is_periodic))
+
+    return steps
+
+def get_outputs(recording, first_tick, tick_map = None):
+    '''
+        Returns a dict of (tick, output name) -> the last value written that
+        tick, from the first tick on
+    '''
+    outputs = {}
+
+    for i in range(len(recording)):
+        if recording.kind[i] != Flight_Recorder.OUTPUT:
+            continue
+
+        tick = recording.tick[i]
+        if tick_map is not None:
+            tick = tick_map.get(tick)
+
+        if tick is not None and tick >= first_tick:
+            outputs[(tick, recording.get_name(i))] = recording.value[i]
+
+    return outputs
+
+def apply_input(recording, index):
+    ds = Driver_Station.getInstance()
+    port = int(recording.get_name(index)[len('stick'):])
+
+    if recording.code[index] == Flight_Recorder.BUTTONS:
+        ds.stick_buttons[port] = int(recording.value[index])
+    else:
+        ds.stick_axes[port][recording.code[index]] = recording.value[index]
+
+def replay(path, robot_class = None, tolerance = 1e-9):
+    '''
+        Replays a recording and compares the outputs
+
+        @param path: The flight recorder file of the match
+        @param robot_class: The EventRobot to replay. Defaults to robot.MyRobot.
+        @param tolerance: How far a replayed output can be from the recorded one
+        @return: A Replay_Result
+    '''
+    recording = read_recording(path)
+    steps = get_steps(recording)
+
+    if not steps:
+        raise ValueError('%s has no mode events to replay' % path)
+
+    clock = Manual_Clock(recording.time[0])
+    reset(clock)
+
+    if robot_class is None:
+        from robot import MyRobot as robot_class
+
+    dashboard_table = NetworkTable.getTable('SmartDashboard')
+    # the replay is recorded to a file that is only needed to compare it
+    with tempfile.TemporaryDirectory() as directory:
+        replay_path = os.path.join(directory, os.path.basename(path))
+        start_recording(replay_path, capacity = max(65536, 2 * len(recording)))
+
+        dashboard = [i for i in range(len(recording)) if recording.kind[i] == Flight_Recorder.DASHBOARD]
+        dashboard_index = 0
+
+        # replayed tick -> recorded tick
+        tick_map = {Process_Manager.tick : recording.tick[0]}
+        index = 0
+        robot = None
+        ticks = 0
+        start = time.perf_counter()
+
+        for step in steps:
+            # The joystick readings are recorded while the processes run, before
+            # the mode event of their tick
+            while index < step.index:
+                if recording.kind[index] == Flight_Recorder.INPUT:
+                    apply_input(recording, index)
+                index += 1
+
+            if robot is None:
+                robot = robot_class()
+                # the values saved by the match were recorded with its dashboard values
+                robot.parameters_path = None
+                robot.robotInit()
+
+            # Dashboard values are recorded when the queue is drained at the end of
+            # their tick, so they are put before the tick is run
+            if step.is_periodic:
+                while dashboard_index < len(dashboard) and recording.tick[dashboard[dashboard_index]] <= step.tick:
+                    i = dashboard[dashboard_index]
+                    dashboard_table.put_remote(recording.get_name(i), recording.get_dashboard_value(i))
+                    dashboard_index += 1
+                ticks += 1
+
+            clock.set(step.time)
+            getattr(robot, step.method)()
+            tick_map[Process_Manager.tick] = step.tick
+
+        seconds = time.perf_counter() - start
+        stop_recording()
+
+        first_tick = steps[0].tick
+        recorded = get_outputs(recording, first_tick)
+        replayed = get_outputs(read_recording(replay_path), first_tick, tick_map)
+
+    mismatches = []
+    for key in sorted(recorded.keys() | replayed.keys()):
+        recorded_value = recorded.get(key)
+        replayed_value = replayed.get(key)
+
+        if recorded_value is None or replayed_value is None or abs(recorded_value - replayed_value) > tolerance:
+            mismatches.append(Mismatch(key[0], key[1], recorded_value, replayed_value))
+
+    return Replay_Result(ticks, seconds, len(recorded), mismatches)
+
+def main():
+    if len(sys.argv) < 2:
+        print('usage: python -m sim.replay <recording>')
+        return 2
+
+    result = replay(sys.argv[1])
+    print('replayed %d ticks in %.2f s (%.0f ticks/s)' % (result.ticks, result.seconds, result.ticks_per_second))
+    print('%d outputs compared, %d mismatches' % (result.outputs_compared, len(result.mismatches)))
+
+    for mismatch in result.mismatches[:20]:
+        print('  %r' % mismatch)
+
+    return 0 if result.matched else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,29 @@
-from .drive import Drive
-from .grabber_lift import Grabber_Lift
-from .oi import OI
-from .autonomous import Autonomous
-from .teleop import Teleop
\ No newline at end of file
+'''
+    The subsystems are imported the first time they are used, so importing
+    the package doesn't import every subsystem and the hardware they use.
+'''
+
+import importlib
+
+# subsystem -> the module it is in
+_modules = {
+    'Sensors' : '.sensors',
+    'Drive' : '.drive',
+    'Grabber_Lift' : '.grabber_lift',
+    'OI' : '.oi',
+    'Autonomous' : '.autonomous',
+    'Teleop' : '.teleop'
+}
+
+__all__ = list(_modules)
+
+def __getattr__(name):
+    module = _modules.get(name)
+
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    subsystem = getattr(importlib.import_module(module, __name__), name)
+    # later lookups find it without getting here
+    globals()[name] = subsystem
+    return subsystem
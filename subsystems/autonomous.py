@@ -1,61 +1,99 @@
-import wpilib
 from manager import *
-from enum import Enum
-from common import height_levels as hl
+from common.routines import Routine_Registry
 
 
 class Autonomous:
-    
-    Modes = Enum('Modes', 'DO_NOTHING MOVE_FORWARD ONE_OBJECT')
-    
-    def auto_move_forward(self, process):
-        
-        if process.state is Process_Manager.START:
-            self.robot.drive.tank(1, 1)
-        
-        elif data.state is Process_Manager.RUNNING:
-            if process.time_since_start > 3:
-                self.robot.drive.tank(0, 0)
-                return Process_Manager.FINISHED
-
-    def auto_one_object(self, process):
-        
-        if state is Process_Manager.START:
-            self.robot.grabber_lift.clamp()
-            process.step = 1
-            
-        elif state is Process_Manager.RUNNING:
-            if process.step is 1 and process.time_since_start > 1:
-                self.robot.grabber_lift.prepare_to_move_to_position(hl.START_HEIGHT + hl.TOTE_HEIGHT)
-                self.robot.grabber_lift.move_to_position()
-                process.step = 2
-                
-            if process.step is 2:
-                return Process_Manager.FINISHED
-    
+
+    '''
+        Lists the routines in the autonomous_routines package on the
+        dashboard, and builds the one that is chosen while the robot is
+        disabled, so autonomous starts it right away.
+
+        A routine can be chosen with the dashboard's chooser, or by setting
+        'autonomous_mode' to its name.
+    '''
+
+    DO_NOTHING = 'Do Nothing'
+
     def __init__(self, robot):
-        self.mode = Autonomous.Modes.DO_NOTHING
-        
+        self.robot = robot
+        self.registry = Routine_Registry('autonomous_routines')
+
+        # the name of the chosen routine, and the routine it was built into
+        self.selected = self.registry.get_default() or Autonomous.DO_NOTHING
+        self.built_name = None
+        self.routine = None
+
+        # add the routines to the chooser on the dashboard
+        self.chooser = hardware.SendableChooser()
+        self.chooser.addDefault(self.selected, self.selected)
+        for name in [Autonomous.DO_NOTHING] + self.registry.get_names():
+            if name != self.selected:
+                self.chooser.addObject(name, name)
+        hardware.SmartDashboard.putData('Autonomous Mode', self.chooser)
+        self.chooser_selected = self.selected
+
+        self.selected_channel = Telemetry.add_channel('autonomous_routine', Telemetry.STRING)
+        self.selected_channel.set(self.selected)
+        # the last name chosen on the dashboard that isn't a routine, cleared
+        # when a routine is chosen
+        self.unknown_channel = Telemetry.add_channel('autonomous_unknown', Telemetry.STRING)
+
         # Change the autonomous mode that is run if the user selects one on the dashboard
         Event_Manager.add_listener('dashboard.updated', self.auto_mode_changed)
-        
+
+        # Build the chosen routine while waiting for the match to start
+        Event_Manager.add_listener('disabled.periodic', self.prepare_auto)
+
         # Run the autonomous mode that is selected
         Event_Manager.add_listener('auto.init', self.start_auto)
-        
+
     def auto_mode_changed(self, event):
-        if event['key'] is 'Autonomous Mode':
-            self.mode = event['value']
-            
+        if event['key'] == 'autonomous_mode':
+            self.select(event['value'])
+
+    def select(self, name):
+        if name != Autonomous.DO_NOTHING and name not in self.registry.routines:
+            self.unknown_channel.set(name)
+            return
+
+        self.selected = name
+        self.selected_channel.set(name)
+        self.unknown_channel.set('')
+
+    def prepare_auto(self, data):
+
+        # the chooser is read here instead of in a NetworkTables listener; a
+        # new choice goes through the dashboard event so it's recorded
+        chooser_selected = self.chooser.getSelected()
+
+        if chooser_selected != self.chooser_selected:
+            self.chooser_selected = chooser_selected
+            Event_Manager.post('dashboard.updated', {
+                'source' : None,
+                'key' : 'autonomous_mode',
+                'value' : chooser_selected,
+                'is_new' : False
+            }, 'autonomous_mode')
+
+        if self.built_name != self.selected:
+            self.build()
+
+    def build(self):
+        self.built_name = self.selected
+        self.routine = None
+
+        if self.selected != Autonomous.DO_NOTHING:
+            self.routine = self.registry.build(self.selected, self.robot)
+
     def start_auto(self, event):
-        
-        autonomous = None
-        
-        if self.mode is Autonomous.Modes.DO_NOTHING: 
-            pass
-        elif self.mode is Autonomous.Modes.MOVE_FORWARD: 
-            autonomous = Auto_Move_Forward() 
-        elif self.mode is Autonomous.Modes.ONE_OBJECT: 
-            autonomous = Auto_One_Object()
-        
-        if autonomous:   
-            Process_Manager.start(autonomous)
\ No newline at end of file
+
+        # autonomous was started without the robot being disabled first
+        if self.built_name != self.selected:
+            self.build()
+
+        if self.routine:
+            Process_Manager.start(self.routine)
+
+        # build a fresh routine the next time the robot is disabled
+        self.built_name = None
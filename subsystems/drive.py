@@ -1,6 +1,7 @@
-import wpilib
 from custom.kwarqs_drive_mech import KwarqsDriveMech
 from common import port_values as pv
+from common.input_shaping import Deadband, Expo, Scale, Pipeline, Vector_Rate_Limit
+from manager import *
 
 class Drive: 
     '''
@@ -9,9 +10,13 @@ class Drive:
         precise angle measure
     '''
     
-    kP_default = 5
-    kI_default = 0
-    kD_default = 0
+    # the longest tick the rate limits allow for, so the speed can't jump
+    # after a pause like the first tick of a mode
+    max_dt = .1
+    
+    # degrees/second the robot has to be turning slower than before the
+    # heading it stopped at is held
+    heading_settle_rate = 10
     
     def __init__(self, robot):
         '''
@@ -22,86 +27,133 @@ class Drive:
              
         self.robot = robot
         self.robot_drive = KwarqsDriveMech(pv.CAN_LIFT_TALON_FL, pv.CAN_LIFT_TALON_BL, pv.CAN_LIFT_TALON_FR, pv.CAN_LIFT_TALON_BR)
-        self.robot_drive.setInvertedMotor(wpilib.RobotDrive.MotorType.kFrontRight, True)
-        self.robot_drive.setInvertedMotor(wpilib.RobotDrive.MotorType.kRearRight, True)
-        self.gyro = wpilib.Gyro(pv.AI_GIRO)
-        self.accel = wpilib.BuiltInAccelerometer() 
+        self.robot_drive.setInvertedMotor(hardware.RobotDrive.MotorType.kFrontRight, True)
+        self.robot_drive.setInvertedMotor(hardware.RobotDrive.MotorType.kRearRight, True)
+        self.sensors = robot.sensors
+        self.gyro = self.sensors.gyro
+        self.accel = self.sensors.accel
+        
+        # the heading held while the driver isn't turning the robot
+        self.held_heading = None
+        
         self.curr_x = 0
         self.curr_y = 0
         self.curr_z = 0
         
-        self.max_change = .1
-        
-#         self.gyro_pid = wpilib.PIDController(p, i, d, self.gyro, self.rb_motor)
-#         
-#         # we are using a continuous sensor here 
-#         self.gyro_pid.setContinuous()
-#         
-#         # sets input range from zero to 360, dont know if that is right just yet
-#         # todo testing for correctness
-#         self.gyro_pid.setInputRange(0, 360)
-#         
-#         # output normilized to motor settings
-#         self.gyro_pid.setOutputRange(-1, 1)
-#         
-#         # percent tolerance for now is 5% should probably be a lot less
-#         self.gyro_pid.setPercentTolerance(5)
-#         
-    
+        # each axis is shaped on its own, then x, y and z are rate limited
+        # together so the robot keeps heading where the driver is pointing
+        self.deadband = Deadband(0)
+        self.expo = Expo(0)
+        self.speed_limit = Scale(.75)
+        self.axis_shaping = Pipeline(self.deadband, self.expo, self.speed_limit)
+        self.rate_limit = Vector_Rate_Limit(5, 3)
+        self.speeds = [0.0, 0.0, 0.0]
+        
+        # the settings that can be tuned from the dashboard
+        Parameters.add_parameter('drive_deadband', 0.0, 0, .5).bind(self.deadband, 'width')
+        Parameters.add_parameter('drive_expo', 0.0, 0, 1).bind(self.expo, 'amount')
+        Parameters.add_parameter('drive_speed_limit', .75, 0, 1).bind(self.speed_limit, 'factor')
+        Parameters.add_parameter('drive_max_accel', 5.0, 0, 50).bind(self.rate_limit, 'rate')
+        # drive relative to the field instead of the robot
+        Parameters.add_parameter('drive_field_oriented', False).bind(self, 'field_oriented')
+        # keep the robot pointed the same way while the driver isn't turning it
+        Parameters.add_parameter('drive_heading_hold', False).bind(self, 'heading_hold')
+        # rotation per degree off the held heading, and the most rotation used
+        # to hold it
+        Parameters.add_parameter('drive_heading_kP', .02, 0, .2).bind(self, 'heading_kP')
+        Parameters.add_parameter('drive_max_heading_correction', .5, 0, 1).bind(self, 'max_heading_correction')
+        
+        self.angle_channel = Telemetry.add_channel('angle', epsilon = .1)
+        self.x_channel = Telemetry.add_channel('x axis', epsilon = .005)
+        self.y_channel = Telemetry.add_channel('y axis', epsilon = .005)
+        self.z_channel = Telemetry.add_channel('z axis', epsilon = .005)
+        self.accel_x_channel = Telemetry.add_channel('acceleration_x', epsilon = .01, max_rate = 5)
+        self.accel_y_channel = Telemetry.add_channel('acceleration_y', epsilon = .01, max_rate = 5)
+        self.accel_z_channel = Telemetry.add_channel('acceleration_z', epsilon = .01, max_rate = 5)
         
     def pid_output(self, output):
         self.robot_drive.mecanumDrive_Cartesian(0, 0, output, 0)
     
     
     def tank(self, left, right):
-        self.robot_drive.tankDrive(-1 * left * .75, right * .75)
+        '''
+            Drives the left and right sides like a tank. The sides are shaped
+            like the axes of robot_move but not rate limited, because tank is
+            used by autonomous modes that stop the robot with a single call.
+        '''
+        left = -1 * self.axis_shaping(left, 0)
+        right = self.axis_shaping(right, 0)
+        record_output('drive.left', left)
+        record_output('drive.right', right)
+        self.robot_drive.tankDrive(left, right)
 
     
     
-    def robot_move(self, x, y, z, angle, weight_modifier = None):
+    def robot_move(self, x, y, z, angle = None, weight_modifier = None):
         '''
             this function is used to control the
             power/speed/torque of our robot/drive/motors
+            
+            @param angle: The gyro angle to drive relative to. Defaults to the
+            heading when driving field oriented, otherwise 0.
         '''
-        #self.gyro_pid.disable()
+        if angle is None:
+            angle = self.sensors.get_angle() if self.field_oriented else 0
+        
+        dt = min(Process_Manager.dt, Drive.max_dt)
+        axis_shaping = self.axis_shaping
+        speeds = self.speeds
         
-        speed_limit = .75
+        speeds[0] = axis_shaping(x, dt)
+        speeds[1] = axis_shaping(y, dt)
+        speeds[2] = axis_shaping(z, dt)
         
-        self.curr_x = self.slow_change(self.curr_x, x * speed_limit)
-        self.curr_y = self.slow_change(self.curr_y, y * speed_limit)
-        self.curr_z = self.slow_change(self.curr_z, z * speed_limit)
+        if self.heading_hold:
+            speeds[2] = self.hold_heading(speeds[2])
+        
+        self.rate_limit(speeds, dt)
+        
+        self.curr_x = speeds[0]
+        self.curr_y = speeds[1]
+        self.curr_z = speeds[2]
 
         self.robot_drive.set_multiplier(weight_modifier)
         
         self.robot_drive.mecanumDrive_Cartesian(self.curr_x, self.curr_y, self.curr_z, angle)
 
-        wpilib.SmartDashboard.putNumber("x axis", self.curr_x)
-        wpilib.SmartDashboard.putNumber("y axis", self.curr_y)
-        wpilib.SmartDashboard.putNumber("z axis", self.curr_z)
+        self.x_channel.set(self.curr_x)
+        self.y_channel.set(self.curr_y)
+        self.z_channel.set(self.curr_z)
         
-    def slow_change(self, val, goal):
+    def hold_heading(self, rotation):
         '''
-            make speed ups or slow downs less intense to prevent power drain 
+            Returns the rotation that turns the robot back to the heading it was
+            at when the driver stopped turning it. The driver's rotation is
+            returned unchanged while they are turning.
         '''
-        diff = val - goal
-        if diff < (-1 * self.max_change) :
-            #goal is greater then self.max_change more than current val
-            return val + self.max_change
+        if rotation != 0:
+            self.held_heading = None
+            return rotation
+        
+        sensors = self.sensors
         
-        elif diff > self.max_change:
-            #goal is less then max_change less the current_val
-            return val - self.max_change
+        if self.held_heading is None:
+            # wait until the robot stops turning to pick the heading to hold
+            if abs(sensors.get_rate()) > Drive.heading_settle_rate:
+                return 0
+            self.held_heading = sensors.get_angle()
         
-        else:
-            return goal
+        max_correction = self.max_heading_correction
+        correction = self.heading_kP * (self.held_heading - sensors.get_angle())
+        return max(-max_correction, min(max_correction, correction))
     
     def log(self):
         '''
             log records various things about the robot
         '''
-        self.gyro.getAngle()
-        #wpilib.SmartDashboard.putNumber("angle", self.gyro.getAngle())
-        wpilib.SmartDashboard.putNumber("acceleration_x", self.accel.getX())
-        wpilib.SmartDashboard.putNumber("acceleration_y", self.accel.getY())
-        wpilib.SmartDashboard.putNumber("acceleration_z", self.accel.getZ())
+        self.angle_channel.set(self.sensors.get_angle())
+        accel_x, accel_y, accel_z = self.sensors.get_acceleration()
+        self.accel_x_channel.set(accel_x)
+        self.accel_y_channel.set(accel_y)
+        self.accel_z_channel.set(accel_z)
     
\ No newline at end of file
@@ -1,25 +1,25 @@
-import wpilib
-from wpilib.command import Subsystem
 from common import height_levels as hl
 from common import port_values as pv
+from common.motion_profile import Trapezoid_Profile
+from custom.cached_outputs import Cached_CAN_Talon, Cached_Solenoid
+from manager import *
 
-class Grabber_Lift(Subsystem):
+class Grabber_Lift(hardware.Subsystem):
     '''
         Used to mobilize grabby thing and lift up the item
         grabbied
     '''    
-    kForward = wpilib.DoubleSolenoid.Value.kForward
-    kOff = wpilib.DoubleSolenoid.Value.kOff
-    kReverse = wpilib.DoubleSolenoid.Value.kReverse
-    kAnalogPot = wpilib.CANTalon.FeedbackDevice.AnalogPot
+    kForward = hardware.DoubleSolenoid.Value.kForward
+    kOff = hardware.DoubleSolenoid.Value.kOff
+    kReverse = hardware.DoubleSolenoid.Value.kReverse
+    kAnalogPot = hardware.CANTalon.FeedbackDevice.AnalogPot
     
-    mPercentVbus = wpilib.CANTalon.ControlMode.PercentVbus
-    mPostion     = wpilib.CANTalon.ControlMode.Position
-    mFollower    = wpilib.CANTalon.ControlMode.Follower
+    mPercentVbus = hardware.CANTalon.ControlMode.PercentVbus
+    mPostion     = hardware.CANTalon.ControlMode.Position
+    mFollower    = hardware.CANTalon.ControlMode.Follower
     
-    kP_default = 15
-    kI_default = 0
-    kD_default = 0
+    # the preset pot positions of the lift, from the floor up a tote at a time
+    levels = (hl.FLOOR_HEIGHT_BITS,) + tuple(hl.START_HEIGHT_BITS + tote * hl.TOTE_HEIGHT_BITS for tote in range(5))
     
     #
     # map used for printing the control mode
@@ -36,20 +36,36 @@ class Grabber_Lift(Subsystem):
         '''
         super().__init__()
         self.robot = robot
-        self.motor_master = wpilib.CANTalon(pv.CAN_LIFT_TALON_MASTER)
-        self.motor_slave  = wpilib.CANTalon(pv.CAN_LIFT_TALON_SLAVE)
-        self.grabber = wpilib.DoubleSolenoid(pv.CAN_PCM, pv.SOLENOID_0, pv.SOLENOID_1)
-        self.box_sensor = wpilib.DigitalInput(pv.DIO_BOX_SENSOR)
+        # only changes are sent to the talons and the solenoid, so the buttons
+        # that are handled every tick while held don't flood the CAN bus
+        self.motor_master = Cached_CAN_Talon(hardware.CANTalon(pv.CAN_LIFT_TALON_MASTER))
+        self.motor_slave  = Cached_CAN_Talon(hardware.CANTalon(pv.CAN_LIFT_TALON_SLAVE))
+        self.grabber = Cached_Solenoid(hardware.DoubleSolenoid(pv.CAN_PCM, pv.SOLENOID_0, pv.SOLENOID_1))
+        self.box_sensor = hardware.DigitalInput(pv.DIO_BOX_SENSOR)
         self.goal_position = 0
         self.mode = None
+        # the move being streamed to the talon, and its current setpoint
+        self.profile = None
+        self.setpoint = 0
+        self.moving = False
+        Process_Manager.add_group('lift')
         # set master PID settings
         self.motor_master.setFeedbackDevice(Grabber_Lift.kAnalogPot)
-        self.motor_master.setPID(Grabber_Lift.kP_default, Grabber_Lift.kI_default, Grabber_Lift.kD_default)
+        kP = Parameters.add_parameter('lift_kP', 15.0, 0, 100).subscribe(self.update_p)
+        kI = Parameters.add_parameter('lift_kI', 0.0, 0, 10).subscribe(self.update_i)
+        kD = Parameters.add_parameter('lift_kD', 0.0, 0, 1000).subscribe(self.update_d)
+        self.motor_master.setPID(kP.value, kI.value, kD.value)
         self.motor_master.reverseOutput(True)
    #     self.motor_master.setForwardSoftLimit(900)
   #      self.motor_master.setReverseSoftLimit(100)
         #self.motor_master.setCloseLoopRampRate(.5)
-        self.tolerance = 15
+        Parameters.add_parameter('lift_tolerance', 15, 1, 100).bind(self, 'tolerance')
+        # pot bits/second and bits/second/second of the moves between positions
+        Parameters.add_parameter('lift_max_velocity', 600.0, 1, 1000).bind(self, 'max_velocity')
+        Parameters.add_parameter('lift_max_acceleration', 2500.0, 1, 10000).bind(self, 'max_acceleration')
+        # seconds ahead of the profile the setpoint is sent, so the talon's loop
+        # doesn't trail the move by the lift's lag
+        Parameters.add_parameter('lift_profile_lead', .2, 0, 1).bind(self, 'profile_lead')
         #set master control mode to default %vbus
         self.set_mode(Grabber_Lift.mPercentVbus)
         
@@ -63,6 +79,12 @@ class Grabber_Lift(Subsystem):
         
         #
         self.clamped = False
+        
+        self.box_sensor_channel = Telemetry.add_channel('box_sensor', Telemetry.BOOLEAN)
+        self.lift_error_channel = Telemetry.add_channel('lift_error', epsilon = 1)
+        self.lift_position_channel = Telemetry.add_channel('lift_position', epsilon = 1)
+        self.lift_mode_channel = Telemetry.add_channel('lift_mode', Telemetry.STRING)
+        self.goal_position_channel = Telemetry.add_channel('actual_goal_pos')
     
         
         
@@ -71,6 +93,7 @@ class Grabber_Lift(Subsystem):
             Grabber arm clamps so it can hold totes/bins.
         '''
         self.grabber.set(Grabber_Lift.kForward)
+        record_output('grabber', Grabber_Lift.kForward)
         self.clamped = True
     
     def release (self):
@@ -78,6 +101,7 @@ class Grabber_Lift(Subsystem):
             Grabber arm releases so it can let go of bins/totes.
         '''
         self.grabber.set(Grabber_Lift.kReverse)
+        record_output('grabber', Grabber_Lift.kReverse)
         self.clamped = False
         
     def is_clamped(self):
@@ -87,8 +111,10 @@ class Grabber_Lift(Subsystem):
         '''
             Moves lifter based off direct input to motor
         '''
+        self.stop_move()
         self.set_mode(Grabber_Lift.mPercentVbus)
         self.motor_master.set(speed)
+        record_output('lift.speed', speed)
         self.change_break_mode(False)
         
     def prepare_to_move_to_position(self,position):
@@ -100,19 +126,93 @@ class Grabber_Lift(Subsystem):
         
     def move_to_position(self):
         ''' 
-            Moves lifter to a specified position 
+            Moves lifter to the goal position, streaming the setpoints of a
+            trapezoid profile from where it is now to the talon every tick.
+            Each setpoint is taken profile_lead seconds ahead of the move.
         '''
+        self.stop_move()
+        self.profile = Trapezoid_Profile(self.pot_reading(), self.goal_position,
+                                         self.max_velocity, self.max_acceleration)
         self.set_mode(Grabber_Lift.mPostion)
-        self.motor_master.set(self.goal_position)
         self.change_break_mode(False)
+        self.moving = True
+        Process_Manager.start(self.follow_profile, 'lift', priority = Process_Manager.CRITICAL)
+        
+    def follow_profile(self, process):
+        '''
+            A process that sends the setpoints of the current move
+        '''
+        profile = self.profile
+        
+        while True:
+            time = process.time_since_start + self.profile_lead
+            self.set_setpoint(profile.get_position(time))
+            
+            if profile.is_finished(time):
+                break
+            
+            yield
+            
+        self.moving = False
+        
+    def stop_move(self):
+        '''
+            Stops streaming the setpoints of a move
+        '''
+        if self.moving:
+            self.moving = False
+            Process_Manager.finish(self.follow_profile)
+        
+    def hold_position(self):
+        '''
+            Holds the lift where it is with the brakes on
+        '''
+        self.stop_move()
+        self.goal_position = self.pot_reading()
+        self.set_mode(Grabber_Lift.mPostion)
+        self.set_setpoint(self.goal_position)
+        self.change_break_mode(True)
+        
+    def set_setpoint(self, setpoint):
+        self.setpoint = setpoint
+        self.motor_master.set(setpoint)
+        record_output('lift.setpoint', setpoint)
+        
+    def move_to_level(self, level):
+        '''
+            Moves the lift to one of the preset levels
+        '''
+        level = max(0, min(len(Grabber_Lift.levels) - 1, level))
+        self.prepare_to_move_to_position(Grabber_Lift.levels[level])
+        self.move_to_position()
+        
+    def level_up(self):
+        '''
+            Moves the lift to the first preset level above its goal
+        '''
+        for level, position in enumerate(Grabber_Lift.levels):
+            if position > self.goal_position + self.tolerance:
+                self.move_to_level(level)
+                return
+        
+    def level_down(self):
+        '''
+            Moves the lift to the first preset level below its goal
+        '''
+        for level in reversed(range(len(Grabber_Lift.levels))):
+            if Grabber_Lift.levels[level] < self.goal_position - self.tolerance:
+                self.move_to_level(level)
+                return
         
     def is_at_position(self):
         '''
-            compares the actual position of robot to current
-            position of the robot
+            True once the move is over and the lift is within tolerance of the
+            goal
         '''
-        #self.motor_master.getClosedLoopError() < self.tolerance
-        return False
+        if self.moving or self.mode != Grabber_Lift.mPostion:
+            return False
+        
+        return abs(self.motor_master.getClosedLoopError()) < self.tolerance
     
     def set_mode (self, mode):
         '''
@@ -130,12 +230,21 @@ class Grabber_Lift(Subsystem):
         
     def update_pid(self, p = None, i = None, d = None):
         '''
-            Updates the PID coefficients
+            Updates the PID coefficients. Only the coefficients that are given
+            are sent, and the talon skips the ones that haven't changed.
         '''
-        print('updating PID P: ', p ,'i: ', i, 'd:', d)
-        if p: self.motor_master.setP(p)      
-        if i: self.motor_master.setI(i)        
-        if d: self.motor_master.setD(d)
+        if p is not None: self.motor_master.setP(p)
+        if i is not None: self.motor_master.setI(i)
+        if d is not None: self.motor_master.setD(d)
+        
+    def update_p(self, p):
+        self.update_pid(p = p)
+        
+    def update_i(self, i):
+        self.update_pid(i = i)
+        
+    def update_d(self, d):
+        self.update_pid(d = d)
         
     def change_break_mode(self, yes_or_no_break):
         '''
@@ -144,15 +253,16 @@ class Grabber_Lift(Subsystem):
         '''
         self.motor_master.enableBrakeMode(yes_or_no_break)
         self.motor_slave.enableBrakeMode(yes_or_no_break)
+        record_output('lift.brake', yes_or_no_break)
         
     def pot_reading(self):  
         return self.motor_master.getAnalogInRaw() #removing conflicts
 
     def log(self):
-        wpilib.SmartDashboard.putBoolean('box_sensor', self.box_sensor.get())     
-        wpilib.SmartDashboard.putNumber('lift_error', self.motor_master.getClosedLoopError())
-        wpilib.SmartDashboard.putNumber('lift_position', self.motor_master.getAnalogInPosition())
-        wpilib.SmartDashboard.putString('lift_mode', Grabber_Lift.control_mode_map[self.mode])
-        wpilib.SmartDashboard.putNumber('actual_goal_pos', self.goal_position)
+        self.box_sensor_channel.set(self.box_sensor.get())
+        self.lift_error_channel.set(self.motor_master.getClosedLoopError())
+        self.lift_position_channel.set(self.motor_master.getAnalogInPosition())
+        self.lift_mode_channel.set(Grabber_Lift.control_mode_map[self.mode])
+        self.goal_position_channel.set(self.goal_position)
         #wpilib.SmartDashboard.putNumber('actual_goal_pos', hl.bits_to_inches(self.goal_position))
     
\ No newline at end of file
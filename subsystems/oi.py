@@ -1,11 +1,7 @@
-from networktables import NetworkTable
-from wpilib.joystick import Joystick
-from processes.joystick_button import Joystick_Button
+from processes.input_sampler import Joystick_Sampler
 from common import logitec_controller as lc
 from manager import *
-from subsystems.autonomous import Autonomous
-from wpilib.sendablechooser import SendableChooser
-from wpilib.smartdashboard import SmartDashboard
+from custom.cached_outputs import Cached_Output
 
 class OI:
     
@@ -13,73 +9,89 @@ class OI:
         self.robot = robot
         
         
-        # update OI with logs
-        Event_Manager.add_listeners({
-            'auto.periodic' : self.log,
-            'teleop.periodic' : self.log
-        })
+        self.output_writes_channel = Telemetry.add_channel('output_writes')
+        self.output_writes_suppressed_channel = Telemetry.add_channel('output_writes_suppressed')
         
-        # notify listeners when SmartDashboard is updated
-        sd = NetworkTable.getTable('SmartDashboard')
-        sd.addTableListener(self.dashboard_listener, True)
+        # how long the loop takes, and the work put off because it took too long
+        self.tick_time_channel = Telemetry.add_channel('tick_time_ms', epsilon = .1)
+        self.tick_overruns_channel = Telemetry.add_channel('tick_overruns')
+        self.deferred_processes_channel = Telemetry.add_channel('deferred_processes')
+        self.deferred_listeners_channel = Telemetry.add_channel('deferred_listeners')
+        self.deferred_flushes_channel = Telemetry.add_channel('deferred_flushes')
         
-        # add autonomous mode chooser to smartdashboard
-        self.auto_choose = SendableChooser()
-        self.auto_choose.addObject('Auto Do Nothing', Autonomous.Modes.DO_NOTHING)
-        self.auto_choose.addObject('Auto Move Forward', Autonomous.Modes.MOVE_FORWARD)
-        self.auto_choose.addObject('Auto One Object', Autonomous.Modes.ONE_OBJECT)
-        SmartDashboard.putData('Autonomous Mode', self.auto_choose)
+        # update OI with logs 5 times a second
+        Process_Manager.start_every(.2, self.log, priority = Process_Manager.BACKGROUND)
+        
+        # only the latest axis values matter each loop. Dashboard updates are
+        # already one per key and tick, see apply_dashboard_updates.
+        Event_Manager.set_coalesce_policy('joystick.axis.updated', Event_Manager.KEEP_LATEST)
+        
+        # notify listeners when SmartDashboard is updated. The NetworkTables
+        # thread only stores the latest value of each key, and the robot loop
+        # triggers the updates once per tick.
+        self.dashboard_updates = Snapshot()
+        sd = hardware.NetworkTable.getTable('SmartDashboard')
+        sd.addTableListener(self.dashboard_listener, True)
+        Process_Manager.start(self.apply_dashboard_updates, priority = Process_Manager.BACKGROUND)
+        Event_Manager.add_listener('dashboard.updated', self.record_dashboard)
         
         # joystick events
-        self.joystick = Joystick(0)
-        l_bumper = Joystick_Button(self.joystick, lc.L_BUMPER)
-        l_trigger = Joystick_Button(self.joystick, lc.L_TRIGGER)
-        r_bumper = Joystick_Button(self.joystick, lc.R_BUMPER)
-        r_trigger = Joystick_Button(self.joystick, lc.R_TRIGGER)
-        btn_one   = Joystick_Button(self.joystick, 1)
-        btn_two   = Joystick_Button(self.joystick, 2)
+        self.joystick = hardware.Joystick(0)
+        self.joystick_sampler = Joystick_Sampler(self.joystick, 'joystick', {
+            'l_bumper' : lc.L_BUMPER,
+            'l_trigger' : lc.L_TRIGGER,
+            'r_bumper' : lc.R_BUMPER,
+            'r_trigger' : lc.R_TRIGGER,
+            'btn_one' : 1,
+            'btn_two' : 2
+        }, {
+            'x_left' : lc.L_AXIS_X,
+            'y_left' : lc.L_AXIS_Y,
+            'x_right' : lc.R_AXIS_X,
+            'y_right' : lc.R_AXIS_Y
+        })
+        Process_Manager.start(self.joystick_sampler, priority = Process_Manager.CRITICAL)
         
         # update the joysick axis periodically
-        Event_Manager.add_listener('teleop.periodic', self.update_axis)
-        
-        l_bumper.while_pressed(lambda: Event_Manager.trigger('joystick.l_bumper.while_pressed'))
-        l_trigger.while_pressed(lambda: Event_Manager.trigger('joystick.l_trigger.while_pressed'))
-        l_bumper.when_pressed(lambda: Event_Manager.trigger('joystick.l_bumper.when_pressed'))
-        l_trigger.when_pressed(lambda: Event_Manager.trigger('joystick.l_trigger.when_pressed'))
-        l_bumper.when_released(lambda: Event_Manager.trigger('joystick.l_bumper.when_released'))
-        l_trigger.when_released(lambda: Event_Manager.trigger('joystick.l_trigger.when_released'))
-        r_bumper.when_pressed(lambda: Event_Manager.trigger('joystick.r_bumper.when_pressed'))
-        btn_two.when_pressed(lambda: Event_Manager.trigger('joystick.btn_two.when_pressed'))
-        btn_one.when_pressed(lambda: Event_Manager.trigger('joystick.btn_one.when_pressed'))
+        Event_Manager.add_listener('teleop.periodic', self.update_axis, Event_Manager.CRITICAL)
         
         
         
     def log(self, data):
         self.robot.drive.log()
         self.robot.grabber_lift.log()
+        self.output_writes_channel.set(Cached_Output.total_writes)
+        self.output_writes_suppressed_channel.set(Cached_Output.total_suppressed)
+        self.tick_time_channel.set(Process_Manager.tick_time * 1000)
+        self.tick_overruns_channel.set(Process_Manager.overruns)
+        self.deferred_processes_channel.set(Process_Manager.deferred_processes)
+        self.deferred_listeners_channel.set(Event_Manager.deferred_listeners)
+        self.deferred_flushes_channel.set(Telemetry.deferred_flushes)
         
     def dashboard_listener(self, source, key, value, is_new):
-        Event_Manager.trigger('dashboard.updated', {
-            'source' : source,
-            'key' : key,
-            'value' : value,
-            'is_new' : is_new                                     
-        })
+        # called on the NetworkTables thread
+        self.dashboard_updates.put(key, (source, value, is_new))
+        
+    def apply_dashboard_updates(self, process):
+        updates = self.dashboard_updates.take()
+        
+        if updates is None:
+            return
+        
+        for key, (source, value, is_new) in updates.items():
+            Event_Manager.trigger('dashboard.updated', {
+                'source' : source,
+                'key' : key,
+                'value' : value,
+                'is_new' : is_new
+            })
+        
+    def record_dashboard(self, event):
+        # dashboard values are recorded from the robot loop, not the NetworkTables thread
+        recorder = Event_Manager.recorder
+        
+        if recorder is not None:
+            recorder.record_dashboard(event['key'], event['value'])
         
     def update_axis(self, data):
-        Event_Manager.trigger('joystick.axis.updated', {
-            'x_left' : self._get_axis(self.joystick, lc.L_AXIS_X)(),
-            'y_left' : self._get_axis(self.joystick, lc.L_AXIS_Y)(),
-            'x_right' : self._get_axis(self.joystick, lc.R_AXIS_X)(),
-            'y_right' : self._get_axis(self.joystick, lc.R_AXIS_Y)()       
-        })                                                  
-                                                  
-    def _get_axis(self, joystick, axis):
-        def axis_func():
-            val = joystick.getAxis(axis)
-            if abs(val) >= .1:
-                return val
-            else:
-                return 0
-        
-        return axis_func
\ No newline at end of file
+        self.joystick_sampler.post_axes()
@@ -0,0 +1,104 @@
+from common import port_values as pv
+from manager import *
+
+class Sensors:
+    '''
+        Reads the gyro and the accelerometer at most once per tick, the
+        first time a value is asked for, and keeps the readings for the rest
+        of the tick so every subsystem sees the same values.
+
+        While the robot is disabled it sits still, so any change in the gyro
+        angle is drift. The drift rate is estimated then and subtracted from
+        the angle from then on.
+    '''
+
+    # seconds the robot has to be disabled before the drift is estimated
+    min_drift_time = 2
+    # drift faster than this in degrees/second means the robot was moved
+    max_drift_rate = 1
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.gyro = hardware.Gyro(pv.AI_GIRO)
+        self.accel = hardware.BuiltInAccelerometer()
+
+        # the tick the sensors were last read in
+        self.sample_tick = None
+        self.sample_time = None
+        self.raw_angle = 0.0
+        self.angle = 0.0
+        self.rate = 0.0
+        self.accel_x = 0.0
+        self.accel_y = 0.0
+        self.accel_z = 0.0
+
+        # degrees/second the gyro drifts, and the total drift subtracted so far
+        self.drift_rate = 0.0
+        self.drift = 0.0
+        self.drift_start_time = None
+        self.drift_start_angle = 0.0
+
+        Event_Manager.add_listener('disabled.init', self.start_drift_estimate)
+        Event_Manager.add_listener('disabled.periodic', self.estimate_drift)
+
+    def sample(self):
+        '''
+            Reads the sensors if they haven't been read this tick
+        '''
+        if self.sample_tick == Process_Manager.tick:
+            return
+
+        now = Process_Manager.now
+
+        if self.sample_time is not None:
+            self.drift += self.drift_rate * (now - self.sample_time)
+
+        self.sample_tick = Process_Manager.tick
+        self.sample_time = now
+        self.raw_angle = self.gyro.getAngle()
+        self.angle = self.raw_angle - self.drift
+        self.rate = self.gyro.getRate() - self.drift_rate
+        self.accel_x = self.accel.getX()
+        self.accel_y = self.accel.getY()
+        self.accel_z = self.accel.getZ()
+
+    def get_angle(self):
+        '''
+            The heading in degrees with the drift taken out
+        '''
+        self.sample()
+        return self.angle
+
+    def get_rate(self):
+        self.sample()
+        return self.rate
+
+    def get_acceleration(self):
+        '''
+            The x, y and z acceleration in g's
+        '''
+        self.sample()
+        return self.accel_x, self.accel_y, self.accel_z
+
+    def start_drift_estimate(self, data):
+        self.sample()
+        self.drift_start_time = Process_Manager.now
+        self.drift_start_angle = self.raw_angle
+
+    def estimate_drift(self, data):
+        if self.drift_start_time is None:
+            return self.start_drift_estimate(data)
+
+        self.sample()
+        elapsed = Process_Manager.now - self.drift_start_time
+
+        if elapsed < Sensors.min_drift_time:
+            return
+
+        drift_rate = (self.raw_angle - self.drift_start_angle) / elapsed
+
+        if abs(drift_rate) <= Sensors.max_drift_rate:
+            self.drift_rate = drift_rate
+        else:
+            # the robot was moved, start over
+            self.start_drift_estimate(data)
@@ -4,6 +4,7 @@ class Teleop:
     
     def __init__(self, robot):
         self.robot = robot
+        Parameters.add_parameter('teleop_lift_speed', .7, 0, 1).bind(self, 'lift_speed')
         
         # Start teleop when initialized
         Event_Manager.add_listener('teleop.init', self.start_teleop)
@@ -13,7 +14,7 @@ class Teleop:
     def start_teleop(self, event):
         
         # set the wheel speeds every time the joystick axis are updated
-        Event_Manager.add_listener('joystick.axis.updated', self.set_wheel_motors)
+        Event_Manager.add_listener('joystick.axis.updated', self.set_wheel_motors, Event_Manager.CRITICAL)
         
         # Set break mode on for grabber lift  when lifter starts moving up or down
         Event_Manager.add_listener('joystick.l_bumper.when_pressed', self.set_break_mode)
@@ -23,7 +24,7 @@ class Teleop:
         Event_Manager.add_listener('joystick.l_bumper.while_pressed', self.move_lifter_down)
         
         # Move lifter up when left trigger is held down
-        Event_Manager.add_listener('joystick.l_trigger.while_pressed.', self.move_lifter_up)
+        Event_Manager.add_listener('joystick.l_trigger.while_pressed', self.move_lifter_up)
         
         # Stop lifter when left trigger/bumper is released
         Event_Manager.add_listener('joystick.l_bumper.when_released', self.stop_lifter)
@@ -31,29 +32,35 @@ class Teleop:
         
         # Toggle claw when right bumper is pressed
         Event_Manager.add_listener('joystick.r_bumper.when_pressed', self.toggle_claw)
+        
+        # Move the lift a preset level up or down
+        Event_Manager.add_listener('joystick.btn_two.when_pressed', self.lift_level_up)
+        Event_Manager.add_listener('joystick.btn_one.when_pressed', self.lift_level_down)
 
         
     def set_wheel_motors(self, axis):
-        self.robot.drive.robot_move(axis['x_left'], axis['y_left'], axis['x_right'], 0)
+        self.robot.drive.robot_move(axis['x_left'], axis['y_left'], axis['x_right'])
         
     def move_lifter_down(self, data):
-        self.robot.grabber_lift.move_lifter(-.7)
+        self.robot.grabber_lift.move_lifter(-self.lift_speed)
         
     def move_lifter_up(self, data):
-        self.robot.grabber_lift.move_lifter(.7)
+        self.robot.grabber_lift.move_lifter(self.lift_speed)
         
     def set_break_mode(self, data):
         self.robot.grabber_lift.change_break_mode(True)
         
     def stop_lifter(self, data):
-        self.robot.grabber_lift.change_break_mode(True)
-        self.robot.grabber_lift.move_lifter(0)
-        position = self.grabber_lift.pot_reading()
-        self.robot.grabber_lift.prepare_to_move_to_position(position)
-        self.robot.grabber_lift.move_to_position()
+        self.robot.grabber_lift.hold_position()
+        
+    def lift_level_up(self, data):
+        self.robot.grabber_lift.level_up()
+        
+    def lift_level_down(self, data):
+        self.robot.grabber_lift.level_down()
         
     def toggle_claw(self, data):
-        if self.grabber_lift.is_clamped():
+        if self.robot.grabber_lift.is_clamped():
             self.robot.grabber_lift.release()
         else:
             self.robot.grabber_lift.clamp()
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# the tests import the framework from the root of the project
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manager.clock import Manual_Clock
+from manager.event_manager import Event_Manager
+from manager.process_manager import Process_Manager
+
+
+class Robot_Loop:
+
+    '''
+        An Event Manager and a Process Manager timed with a Manual_Clock, run
+        a tick at a time like the robot loop runs them
+    '''
+
+    def __init__(self):
+        self.clock = Manual_Clock()
+        self.event_manager = Event_Manager()
+        self.process_manager = Process_Manager(self.clock, self.event_manager, self.clock.now)
+
+    def tick(self, seconds = .02):
+        self.clock.advance(seconds)
+        self.process_manager.run_foreground()
+        self.event_manager.drain()
+        self.process_manager.run_background()
+        self.process_manager.end_tick()
+
+    def run_for(self, seconds, period = .02):
+        for i in range(int(round(seconds / period))):
+            self.tick(period)
+
+
+@pytest.fixture
+def loop():
+    return Robot_Loop()
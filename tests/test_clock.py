@@ -0,0 +1,21 @@
+from manager.clock import Manual_Clock
+
+
+def test_manual_clock():
+    clock = Manual_Clock(1.0)
+    clock.advance(.5)
+    assert clock.now() == 1.5
+
+    clock.set(3.0)
+    assert clock.now() == 3.0
+
+def test_processes_are_timed_with_the_clock(loop):
+    times = []
+    loop.process_manager.start(lambda process_data: times.append(
+        (process_data.time_since_start, process_data.time_since_last_run)))
+    loop.run_for(.06)
+
+    # the time only moves at the start of a tick
+    assert [round(since_start, 6) for since_start, since_last_run in times] == [0.0, .02, .04, .06]
+    assert [round(since_last_run, 6) for since_start, since_last_run in times[2:]] == [.02, .02]
+    assert abs(loop.process_manager.dt - .02) < 1e-9
@@ -0,0 +1,141 @@
+from manager.combinators import sequence, parallel, race, timeout, repeat
+from manager.coroutines import wait_seconds
+from manager.process_manager import Process_Manager
+
+
+def timed(loop, log, name, seconds = None):
+    '''
+        A process that logs the time and state it is called with, and finishes
+        once it has run for a number of seconds, or never if seconds is None
+    '''
+    def process(process_data):
+        log.append((name, process_data.state, round(loop.clock.now(), 6)))
+
+        if seconds is not None and process_data.state is Process_Manager.RUNNING and \
+                process_data.time_since_start >= seconds - 1e-9:
+            return Process_Manager.FINISHED
+    return process
+
+def states(log, name):
+    return [state for process_name, state, time in log if process_name == name]
+
+def times(log, name, state):
+    return [time for process_name, process_state, time in log if process_name == name and process_state is state]
+
+
+def test_sequence_runs_one_after_the_other(loop):
+    log = []
+    composite = sequence(timed(loop, log, 'a', .1), timed(loop, log, 'b', .1))
+    loop.process_manager.start(composite)
+    loop.run_for(.5)
+
+    assert times(log, 'a', Process_Manager.FINISHED) == [.1]
+    assert times(log, 'b', Process_Manager.STARTED) == [.1]
+    assert times(log, 'b', Process_Manager.FINISHED) == [.2]
+    assert not loop.process_manager.in_queue(composite)
+
+def test_parallel_finishes_when_all_of_them_have(loop):
+    log = []
+    composite = parallel(timed(loop, log, 'a', .1), timed(loop, log, 'b', .3))
+    loop.process_manager.start(composite)
+    loop.run_for(.2)
+
+    assert times(log, 'a', Process_Manager.STARTED) == times(log, 'b', Process_Manager.STARTED) == [0.0]
+    assert times(log, 'a', Process_Manager.FINISHED) == [.1]
+    assert loop.process_manager.in_queue(composite)
+
+    loop.run_for(.2)
+    assert times(log, 'b', Process_Manager.FINISHED) == [.3]
+    assert not loop.process_manager.in_queue(composite)
+
+def test_race_finishes_the_losers(loop):
+    log = []
+    composite = race(timed(loop, log, 'a', .1), timed(loop, log, 'b'))
+    loop.process_manager.start(composite)
+    loop.run_for(.5)
+
+    assert times(log, 'a', Process_Manager.FINISHED) == [.1]
+    assert times(log, 'b', Process_Manager.FINISHED) == [.1]
+    assert states(log, 'b')[-1] is Process_Manager.FINISHED
+    assert not loop.process_manager.in_queue(composite)
+
+def test_timeout_finishes_a_process_that_takes_too_long(loop):
+    log = []
+    composite = timeout(.2, timed(loop, log, 'a'))
+    loop.process_manager.start(composite)
+    loop.run_for(.5)
+
+    assert times(log, 'a', Process_Manager.FINISHED) == [.2]
+    assert not loop.process_manager.in_queue(composite)
+
+def test_timeout_finishes_with_a_process_that_is_on_time(loop):
+    log = []
+    composite = timeout(.5, timed(loop, log, 'a', .1))
+    loop.process_manager.start(composite)
+    loop.run_for(.2)
+
+    assert times(log, 'a', Process_Manager.FINISHED) == [.1]
+    assert not loop.process_manager.in_queue(composite)
+
+def test_repeat_runs_a_process_a_number_of_times(loop):
+    log = []
+    composite = repeat(timed(loop, log, 'a', .1), 3)
+    loop.process_manager.start(composite)
+    loop.run_for(1.0)
+
+    assert times(log, 'a', Process_Manager.STARTED) == [0.0, .1, .2]
+    assert times(log, 'a', Process_Manager.FINISHED) == [.1, .2, .3]
+    assert not loop.process_manager.in_queue(composite)
+
+def test_repeat_starts_a_process_that_finishes_at_once_on_the_next_tick(loop):
+    runs = []
+
+    def at_once(process_data):
+        if process_data.state is Process_Manager.STARTED:
+            runs.append(loop.process_manager.tick)
+            return Process_Manager.FINISHED
+
+    loop.process_manager.start(repeat(at_once, 3))
+    loop.run_for(.2)
+
+    assert runs == [0, 1, 2]
+
+def test_repeat_forever(loop):
+    log = []
+    composite = repeat(timed(loop, log, 'a', .1))
+    loop.process_manager.start(composite)
+    loop.run_for(1.0)
+
+    assert len(times(log, 'a', Process_Manager.FINISHED)) == 10
+    assert loop.process_manager.in_queue(composite)
+
+def test_finishing_a_composite_finishes_its_children(loop):
+    log = []
+    composite = parallel(timed(loop, log, 'a'), sequence(timed(loop, log, 'b')))
+    loop.process_manager.start(composite)
+    loop.run_for(.1)
+    loop.process_manager.finish(composite)
+
+    assert states(log, 'a')[-1] is Process_Manager.FINISHED
+    assert states(log, 'b')[-1] is Process_Manager.FINISHED
+    assert not loop.process_manager.processes
+
+def test_interrupting_a_composite_interrupts_its_children(loop):
+    log = []
+    composite = sequence(timed(loop, log, 'a', .3), timed(loop, log, 'b', .1))
+    loop.process_manager.add_group('group', composite)
+    loop.run_for(.1)
+
+    def other(process_data):
+        yield wait_seconds(.2)
+
+    loop.process_manager.start(other, 'group')
+    loop.run_for(.1)
+    assert states(log, 'a')[-1] is Process_Manager.INTERRUPTED
+
+    # resumed when the other process finishes
+    loop.run_for(.2)
+    assert Process_Manager.RESUMED in states(log, 'a')
+    loop.run_for(.5)
+    assert states(log, 'b')[-1] is Process_Manager.FINISHED
+    assert loop.process_manager.get_state(composite) is None
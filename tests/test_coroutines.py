@@ -0,0 +1,70 @@
+from manager.coroutines import wait_seconds, wait_until, wait_event
+
+
+def test_wait_seconds(loop):
+    times = []
+
+    def process(process_data):
+        times.append(loop.clock.now())
+        yield wait_seconds(.1)
+        times.append(loop.clock.now())
+
+    loop.process_manager.start(process)
+    loop.run_for(.5)
+
+    assert len(times) == 2
+    assert abs(times[1] - times[0] - .1) < 1e-9
+
+def test_wait_until(loop):
+    ready = [False]
+    steps = []
+
+    def process(process_data):
+        yield wait_until(lambda: ready[0])
+        steps.append(loop.clock.now())
+
+    loop.process_manager.start(process)
+    loop.run_for(.1)
+    assert steps == []
+
+    ready[0] = True
+    loop.tick()
+    assert len(steps) == 1
+
+def test_wait_event_returns_the_event_data(loop):
+    received = []
+
+    def process(process_data):
+        received.append((yield wait_event('lift.arrived')))
+
+    loop.process_manager.start(process)
+    loop.run_for(.1)
+    loop.event_manager.trigger('lift.other', 1)
+    loop.event_manager.trigger('lift.arrived', 235)
+    loop.tick()
+
+    assert received == [235]
+
+def test_coroutine_process(loop):
+    steps = []
+
+    async def process(process_data):
+        steps.append('start')
+        await wait_seconds(.04)
+        steps.append('waited')
+
+    loop.process_manager.start(process)
+    loop.run_for(.2)
+
+    assert steps == ['start', 'waited']
+    assert loop.process_manager.get_state(process) is None
+
+def test_process_finishes_when_it_returns(loop):
+
+    def process(process_data):
+        yield
+
+    loop.process_manager.start(process)
+    loop.run_for(.1)
+
+    assert not loop.process_manager.in_queue(process)
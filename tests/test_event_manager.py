@@ -0,0 +1,173 @@
+import pytest
+
+from manager.event_manager import Event_Manager
+
+
+def recorder(calls, name):
+    def listener(data):
+        calls.append((name, data))
+    return listener
+
+@pytest.mark.parametrize('count', [0, 1, 2, 3, 4, 10])
+def test_listeners_are_called_in_the_order_they_were_added(count):
+    event_manager = Event_Manager()
+    calls = []
+
+    for i in range(count):
+        event_manager.add_listener('teleop.periodic', recorder(calls, i))
+
+    event_manager.trigger('teleop.periodic', 'data')
+
+    assert calls == [(i, 'data') for i in range(count)]
+    assert len(event_manager.get_listeners('teleop.periodic')) == count
+
+def test_patterns():
+    event_manager = Event_Manager()
+    calls = []
+    event_manager.add_listener('joystick.*.when_pressed', recorder(calls, 'star'))
+    event_manager.add_listener('joystick.**', recorder(calls, 'globstar'))
+    event_manager.add_listener('joystick.l_bumper.when_pressed', recorder(calls, 'exact'))
+
+    event_manager.trigger('joystick.l_bumper.when_pressed')
+    event_manager.trigger('joystick.l_bumper.while_pressed')
+
+    assert [name for name, data in calls] == ['star', 'globstar', 'exact', 'globstar']
+
+def test_removed_listener_is_not_called():
+    event_manager = Event_Manager()
+    calls = []
+    listener = recorder(calls, 'a')
+    event_manager.add_listener('a', listener)
+    event_manager.trigger('a')
+    event_manager.remove_listener('a', listener)
+    event_manager.trigger('a')
+
+    assert len(calls) == 1
+
+def test_listeners_run_in_order_of_priority():
+    event_manager = Event_Manager()
+    calls = []
+    event_manager.add_listener('a', recorder(calls, 'background'), Event_Manager.BACKGROUND)
+    event_manager.add_listener('a', recorder(calls, 'normal'))
+    event_manager.add_listener('a', recorder(calls, 'critical'), Event_Manager.CRITICAL)
+    event_manager.trigger('a')
+
+    assert [name for name, data in calls] == ['critical', 'normal', 'background']
+
+def test_adding_again_changes_the_priority():
+    event_manager = Event_Manager()
+    calls = []
+    first = recorder(calls, 'first')
+    event_manager.add_listener('a', first, Event_Manager.BACKGROUND)
+    event_manager.add_listener('a', recorder(calls, 'second'))
+    event_manager.add_listener('a', first)
+    event_manager.trigger('a')
+
+    # back to NORMAL, and in the place it was first added in
+    assert [name for name, data in calls] == ['first', 'second']
+    assert event_manager.prioritized == 0
+    assert event_manager._deferrable == {}
+
+def test_removing_forgets_the_priority():
+    event_manager = Event_Manager()
+    listener = recorder([], 'a')
+    event_manager.add_listener('a', listener, Event_Manager.BACKGROUND)
+    event_manager.trigger('a')
+    event_manager.remove_listener('a', listener)
+
+    assert event_manager.prioritized == 0
+    assert event_manager._deferrable == {}
+
+    event_manager.add_listener('b', listener, Event_Manager.CRITICAL)
+    event_manager.remove_all_listeners('b')
+    assert event_manager.prioritized == 0
+
+def test_background_wrapper_is_reused():
+    event_manager = Event_Manager()
+    event_manager.add_listener('a', recorder([], 'a'), Event_Manager.BACKGROUND)
+    wrapper = event_manager.get_listeners('a')[0]
+    event_manager.add_listener('a', recorder([], 'b'))
+
+    assert event_manager.get_listeners('a')[-1] is wrapper
+
+def test_deferred_listener_is_called_within_the_limit():
+    event_manager = Event_Manager()
+    calls = []
+    event_manager.over_budget = lambda: True
+    event_manager.add_listener('a', recorder(calls, 'a'), Event_Manager.BACKGROUND)
+    event_manager.trigger('a', 1)
+
+    ticks = 0
+    while not calls:
+        event_manager.end_tick()
+        event_manager.drain()
+        ticks += 1
+
+    assert ticks == Event_Manager.max_deferred_ticks
+    assert calls == [('a', 1)]
+
+def test_deferred_listener_is_called_when_under_budget():
+    event_manager = Event_Manager()
+    calls = []
+    over_budget = [True]
+    event_manager.over_budget = lambda: over_budget[0]
+    event_manager.add_listener('a', recorder(calls, 'a'), Event_Manager.BACKGROUND)
+    event_manager.trigger('a', 1)
+    assert calls == []
+
+    over_budget[0] = False
+    event_manager.end_tick()
+    event_manager.drain()
+    assert calls == [('a', 1)]
+
+def test_queued_events_are_triggered_before_deferred_listeners():
+    event_manager = Event_Manager()
+    calls = []
+    over_budget = [True]
+    event_manager.over_budget = lambda: over_budget[0]
+    event_manager.add_listener('a', recorder(calls, 'a'), Event_Manager.BACKGROUND)
+    event_manager.add_listener('drive', recorder(calls, 'drive'), Event_Manager.CRITICAL)
+    event_manager.trigger('a', 1)
+
+    over_budget[0] = False
+    event_manager.end_tick()
+    event_manager.post('drive', 2)
+    event_manager.drain()
+    assert calls == [('drive', 2), ('a', 1)]
+
+def test_deferred_listener_waits_when_the_queue_uses_up_the_budget():
+    event_manager = Event_Manager()
+    calls = []
+    over_budget = [True]
+    event_manager.over_budget = lambda: over_budget[0]
+    event_manager.add_listener('a', recorder(calls, 'a'), Event_Manager.BACKGROUND)
+
+    def slow_drive(data):
+        calls.append(('drive', data))
+        over_budget[0] = True
+
+    event_manager.add_listener('drive', slow_drive, Event_Manager.CRITICAL)
+    event_manager.trigger('a', 1)
+
+    over_budget[0] = False
+    event_manager.end_tick()
+    event_manager.post('drive', 2)
+    event_manager.drain()
+    assert calls == [('drive', 2)]
+
+    over_budget[0] = False
+    event_manager.end_tick()
+    event_manager.drain()
+    assert calls == [('drive', 2), ('a', 1)]
+
+def test_keep_latest_posts_are_coalesced():
+    event_manager = Event_Manager()
+    calls = []
+    event_manager.add_listener('axis.updated', recorder(calls, 'axis'))
+    event_manager.set_coalesce_policy('axis.updated', Event_Manager.KEEP_LATEST)
+
+    for i in range(3):
+        event_manager.post('axis.updated', i)
+    event_manager.drain()
+
+    assert calls == [('axis', 2)]
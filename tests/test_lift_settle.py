@@ -0,0 +1,10 @@
+from benchmarks.bench_lift_settle import measure, step_move, profiled_move
+
+
+def test_profiled_moves_settle_as_fast_as_step_moves():
+    step = measure(step_move)
+    profiled = measure(profiled_move)
+
+    for (start, goal, step_time, step_overshoot), (_, _, profiled_time, profiled_overshoot) in zip(step, profiled):
+        assert profiled_time <= step_time + 1e-9, 'the move from %d to %d settled slower' % (start, goal)
+        assert profiled_overshoot <= step_overshoot + 1e-9, 'the move from %d to %d overshot more' % (start, goal)
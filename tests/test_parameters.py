@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from manager.parameters import Parameter_Store
+
+
+@pytest.fixture
+def store(loop):
+    return Parameter_Store(loop.event_manager, loop.process_manager)
+
+def test_numbers_are_coerced_and_clamped(store):
+    count = store.add_parameter('count', 3, 0, 10)
+    gain = store.add_parameter('gain', 1.5, 0, 2)
+
+    assert count.coerce('4.6') == 5
+    assert count.coerce(42) == 10
+    assert gain.coerce('0.25') == .25
+    assert gain.coerce(-1) == 0.0
+    assert type(count.coerce(2.0)) is int
+
+@pytest.mark.parametrize('value, expected', [
+    ('False', False), ('false', False), ('0', False), (' no ', False), ('OFF', False),
+    ('True', True), ('true', True), ('1', True), ('yes', True), ('on', True),
+    (True, True), (False, False), (0, False), (1, True), (1.0, True)
+])
+def test_bools_are_parsed(store, value, expected):
+    assert store.add_parameter('enabled', True, None, None).coerce(value) is expected
+
+@pytest.mark.parametrize('value', ['', 'maybe', 2, None])
+def test_values_that_are_not_bools_are_ignored(store, value, caplog):
+    enabled = store.add_parameter('enabled', True, None, None)
+
+    assert not store.set('enabled', value)
+    assert enabled.value is True
+    assert 'ignoring value %r of enabled' % (value,) in caplog.text
+
+def test_set_updates_bindings_and_subscribers(store):
+    class Target:
+        pass
+
+    target = Target()
+    changes = []
+    store.add_parameter('gain', 1.0, 0, 2).bind(target, 'gain').subscribe(changes.append)
+
+    assert store.set('gain', '1.5')
+    assert not store.set('gain', 1.5)
+    assert target.gain == 1.5
+    assert changes == [1.5]
+
+def test_dashboard_updates_change_parameters(loop, store):
+    enabled = store.add_parameter('enabled', True, None, None)
+    loop.event_manager.trigger('dashboard.updated', {'key' : 'enabled', 'value' : 'False'})
+
+    assert enabled.value is False
+
+def test_changes_are_saved_and_loaded(loop, tmp_path):
+    path = str(tmp_path / 'parameters.json')
+    store = Parameter_Store(loop.event_manager, loop.process_manager)
+    store.load(path)
+    store.add_parameter('enabled', True, None, None)
+    store.add_parameter('gain', 1.0, 0, 2)
+    store.set('enabled', 'false')
+    store.set('gain', 1.25)
+    loop.run_for(Parameter_Store.save_delay + .1)
+    assert store.wait_saved(5)
+
+    with open(path) as file:
+        assert json.load(file) == {'enabled' : False, 'gain' : 1.25}
+
+    loaded = Parameter_Store()
+    loaded.load(path)
+    assert loaded.add_parameter('enabled', True, None, None).value is False
+    assert loaded.add_parameter('gain', 1.0, 0, 2).value == 1.25
+
+def test_files_are_written_by_the_saving_thread(tmp_path):
+    path = str(tmp_path / 'parameters.json')
+    store = Parameter_Store()
+    store.load(path)
+    store.add_parameter('gain', 1.0, 0, 2)
+    store.set('gain', 1.5)
+    store.save()
+    store.set('gain', 1.75)
+    store.save()
+    assert store.wait_saved(5)
+
+    with open(path) as file:
+        assert json.load(file) == {'gain' : 1.75}
@@ -0,0 +1,180 @@
+from manager.clock import Manual_Clock
+from manager.coroutines import wait_seconds, wait_event
+from manager.process_manager import Process_Manager
+
+
+def test_process_is_started_run_and_finished(loop):
+    states = []
+
+    def process(process_data):
+        states.append(process_data.state)
+
+    loop.process_manager.start(process)
+    loop.tick()
+    loop.tick()
+    loop.process_manager.finish(process)
+
+    assert states == [Process_Manager.STARTED, Process_Manager.RUNNING,
+                      Process_Manager.RUNNING, Process_Manager.FINISHED]
+    assert not loop.process_manager.in_queue(process)
+    assert loop.process_manager.get_state(process) is None
+
+def test_process_started_while_running_runs_on_the_next_tick(loop):
+    runs = []
+
+    def child(process_data):
+        runs.append(('child', process_data.state))
+
+    def parent(process_data):
+        if process_data.state is Process_Manager.RUNNING and not loop.process_manager.in_queue(child):
+            loop.process_manager.start(child)
+
+    loop.process_manager.start(parent)
+    loop.tick()
+    assert runs == [('child', Process_Manager.STARTED)]
+
+    loop.tick()
+    assert runs[1:] == [('child', Process_Manager.RUNNING)]
+
+def test_finishing_an_earlier_process_skips_none(loop):
+    runs = []
+
+    def make_process(name):
+        def process(process_data):
+            if process_data.state is Process_Manager.RUNNING:
+                runs.append(name)
+
+                if name == 'b':
+                    loop.process_manager.finish(processes['a'])
+        return process
+
+    processes = dict((name, make_process(name)) for name in 'abcd')
+
+    for name in 'abcd':
+        loop.process_manager.start(processes[name])
+    loop.tick()
+    assert runs == ['a', 'b', 'c', 'd']
+
+    loop.tick()
+    assert runs[4:] == ['b', 'c', 'd']
+
+def test_runs_in_order_of_priority(loop):
+    runs = []
+
+    def make_process(name):
+        def process(process_data):
+            runs.append(name)
+        return process
+
+    loop.process_manager.start(make_process('background'), priority = Process_Manager.BACKGROUND)
+    loop.process_manager.start(make_process('normal'))
+    loop.process_manager.start(make_process('critical'), priority = Process_Manager.CRITICAL)
+    loop.tick()
+    del runs[:]
+    loop.tick()
+
+    assert runs == ['critical', 'normal', 'background']
+
+def test_start_every(loop):
+    runs = []
+    loop.process_manager.start_every(.1, lambda process_data: runs.append(loop.clock.now()))
+    loop.run_for(1.0)
+
+    assert 9 <= len(runs) <= 11
+    assert all(abs(b - a - .1) < 1e-6 for a, b in zip(runs[1:], runs[2:]))
+
+def test_start_after(loop):
+    runs = []
+    loop.process_manager.start_after(.5, lambda process_data: runs.append(loop.clock.now()))
+    loop.run_for(.4)
+    assert runs == []
+
+    loop.run_for(.2)
+    assert runs and runs[0] >= .5 - 1e-9
+
+def interrupting(loop, seconds):
+    '''
+        Runs another process in the default process's group for a number of
+        seconds, interrupting the default process
+    '''
+    def other(process_data):
+        yield wait_seconds(seconds)
+
+    loop.process_manager.start(other, 'group')
+
+def test_interrupted_timer_wait_keeps_its_remaining_time(loop):
+    woke = []
+
+    def default(process_data):
+        yield wait_seconds(1.0)
+        woke.append(loop.clock.now())
+        while True:
+            yield
+
+    loop.process_manager.add_group('group', default)
+    loop.run_for(.4)
+    interrupting(loop, .2)
+    loop.run_for(.4)
+
+    # resumed at about .6 with about .6 left on its wait
+    assert woke == []
+    loop.run_for(1.0)
+    assert len(woke) == 1
+    assert 1.1 < woke[0] < 1.4
+
+def test_interrupted_event_wait_is_kept(loop):
+    received = []
+
+    def default(process_data):
+        received.append((yield wait_event('go')))
+        while True:
+            yield
+
+    loop.process_manager.add_group('group', default)
+    loop.run_for(.1)
+    interrupting(loop, .1)
+    loop.tick()
+    # triggered while the process is interrupted
+    loop.event_manager.trigger('go', 'early')
+    loop.run_for(.2)
+
+    assert received == []
+    loop.event_manager.trigger('go', 'late')
+    loop.tick()
+    assert received == ['late']
+
+def over_budget_loop(loop, tick_work):
+    '''
+        Makes every tick of the loop take tick_work seconds of a work clock the
+        budget is measured with
+    '''
+    work = Manual_Clock()
+    process_manager = loop.process_manager
+    process_manager.timer = work.now
+    process_manager.budget = .015
+
+    def busy(process_data):
+        work.advance(tick_work)
+
+    process_manager.start(busy)
+
+def test_background_is_deferred_when_over_budget(loop):
+    runs = []
+    over_budget_loop(loop, .02)
+    loop.process_manager.start(lambda process_data: runs.append(loop.process_manager.tick),
+                               priority = Process_Manager.BACKGROUND)
+    loop.run_for(2.0)
+
+    # every run is put off as many ticks as it can be and no more
+    limit = Process_Manager.max_deferred_ticks
+    assert len(runs) > 5
+    assert all(b - a == limit + 1 for a, b in zip(runs, runs[1:]))
+    assert loop.process_manager.deferred_processes > 0
+
+def test_critical_and_normal_run_when_over_budget(loop):
+    runs = []
+    over_budget_loop(loop, .02)
+    loop.process_manager.start(lambda process_data: runs.append(process_data.state), priority = Process_Manager.CRITICAL)
+    loop.run_for(.2)
+
+    assert runs.count(Process_Manager.RUNNING) == 10
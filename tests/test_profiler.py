@@ -0,0 +1,50 @@
+from sim import install
+
+install()
+
+from sim.engine import Simulator
+from manager import Event_Manager, Process_Manager, enable_profiling, disable_profiling
+from manager.clock import Manual_Clock
+from manager.robot import EventRobot
+
+
+class Busy_Robot(EventRobot):
+
+    '''
+        Spends 4ms of a work clock in a process and 4ms in a listener of the
+        periodic event, but only in one tick
+    '''
+
+    busy_tick = 10
+
+    def __init__(self):
+        super().__init__()
+        self.work = Manual_Clock()
+
+    def robotInit(self):
+        Process_Manager.start(self.busy)
+        Event_Manager.add_listener('teleop.periodic', self.busy)
+
+    def busy(self, data):
+        if Process_Manager.tick == Busy_Robot.busy_tick:
+            self.work.advance(.004)
+
+
+class No_Physics:
+
+    def __init__(self, robot):
+        pass
+
+    def update(self, seconds):
+        pass
+
+
+def test_processes_run_before_the_periodic_event_count_in_its_tick():
+    simulator = Simulator(Busy_Robot, No_Physics)
+    profiler = enable_profiling(.006, clock = simulator.robot.work.now)
+    simulator.run_mode('teleop', .5)
+    disable_profiling()
+
+    # the process and the listener only go over the budget together
+    assert profiler.overrun_count == 1
+    assert abs(profiler.overruns[0].elapsed - .008) < 1e-9
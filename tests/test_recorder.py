@@ -0,0 +1,74 @@
+import threading
+
+from manager.recorder import Flight_Recorder, read_recording
+
+
+def make_recorder(loop, tmp_path, capacity = 1024):
+    return Flight_Recorder(str(tmp_path / 'match.evfr'), loop.process_manager, capacity, flush_interval = 60)
+
+def test_round_trip(loop, tmp_path):
+    recorder = make_recorder(loop, tmp_path)
+    loop.tick()
+    recorder.record_event('teleop.periodic')
+    recorder.record_input('stick0', Flight_Recorder.BUTTONS, 5)
+    loop.tick()
+    recorder.record_output('lift.setpoint', 235.0)
+    recorder.record_value('autonomous_routine', 'One Object')
+    recorder.record_dashboard('autonomous_mode', 'Move Forward')
+    recorder.record_dashboard('lift_kP', 15.0)
+    recorder.record_dashboard('enabled', True)
+    recorder.close()
+
+    recording = read_recording(recorder.path)
+    rows = list(recording.rows())
+
+    assert len(recording) == 7
+    assert [row[2] for row in rows] == ['teleop.periodic', 'stick0', 'lift.setpoint', 'autonomous_routine',
+                                        'autonomous_mode', 'lift_kP', 'enabled']
+    assert [row[1] for row in rows] == [1, 1, 2, 2, 2, 2, 2]
+    assert rows[1][4:] == (Flight_Recorder.BUTTONS, 5.0)
+    assert rows[2][5] == 235.0
+    assert recording.names[int(rows[3][5])] == 'One Object'
+    assert [recording.get_dashboard_value(i) for i in (4, 5, 6)] == ['Move Forward', 15.0, True]
+
+def test_ring_keeps_the_newest_records(loop, tmp_path):
+    recorder = make_recorder(loop, tmp_path, capacity = 8)
+    for i in range(20):
+        recorder.record_output('output', i)
+    recorder.close()
+
+    recording = read_recording(recorder.path)
+    assert list(recording.value) == [float(i) for i in range(12, 20)]
+
+def test_more_names_than_fit_in_16_bits(loop, tmp_path):
+    count = 70000
+    recorder = make_recorder(loop, tmp_path, capacity = count)
+    for i in range(count):
+        recorder.record_event('event%d' % i)
+    recorder.close()
+
+    recording = read_recording(recorder.path)
+    assert len(recording.names) == count
+    assert recording.get_name(count - 1) == 'event%d' % (count - 1)
+
+def test_names_interned_while_flushing_are_written(loop, tmp_path):
+    recorder = make_recorder(loop, tmp_path, capacity = 20000)
+    stop = threading.Event()
+
+    def flush():
+        while not stop.is_set():
+            recorder.flush()
+
+    thread = threading.Thread(target = flush)
+    thread.start()
+    try:
+        for i in range(20000):
+            recorder.record_event('event%d' % i)
+    finally:
+        stop.set()
+        thread.join()
+    recorder.close()
+
+    recording = read_recording(recorder.path)
+    assert recording.names == ['event%d' % i for i in range(20000)]
+    assert all(recording.get_name(i) == 'event%d' % i for i in range(len(recording)))
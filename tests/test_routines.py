@@ -0,0 +1,34 @@
+from common.routines import Routine_Registry
+
+
+def make_package(tmp_path, monkeypatch, name, modules):
+    package = tmp_path / name
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+
+    for module, source in modules.items():
+        (package / (module + '.py')).write_text(source)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return name
+
+def test_routines_are_found_without_importing_them(tmp_path, monkeypatch):
+    package = make_package(tmp_path, monkeypatch, 'found_routines', {
+        'forward' : "raise ImportError\n@autonomous('Forward')\ndef forward(robot, process):\n    pass\n",
+        'stay' : "@autonomous('Stay', default = True)\ndef stay(robot, process):\n    pass\n"
+    })
+    registry = Routine_Registry(package)
+
+    assert registry.get_names() == ['Forward', 'Stay']
+    assert registry.get_default() == 'Stay'
+
+def test_routines_whose_names_are_not_literals_are_skipped(tmp_path, monkeypatch, caplog):
+    package = make_package(tmp_path, monkeypatch, 'named_routines', {
+        'routines' : "NAME = 'Computed'\n"
+                     "@autonomous(NAME)\ndef computed(robot, process):\n    pass\n"
+                     "@autonomous('Literal')\ndef literal(robot, process):\n    pass\n"
+    })
+    registry = Routine_Registry(package)
+
+    assert registry.get_names() == ['Literal']
+    assert 'skipping routine computed' in caplog.text
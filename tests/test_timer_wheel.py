@@ -0,0 +1,45 @@
+from manager.timer_wheel import Timer_Wheel
+
+
+def advance(wheel, ticks):
+    '''
+        @return: The (tick, item) of each timer that was due
+    '''
+    fired = []
+    for i in range(ticks):
+        due = []
+        wheel.advance(due)
+        fired.extend((wheel.tick, item) for item in due)
+    return fired
+
+def test_timer_is_due_in_its_tick():
+    wheel = Timer_Wheel(8)
+    wheel.schedule('a', 3)
+    wheel.schedule('b', 1)
+
+    assert advance(wheel, 5) == [(1, 'b'), (3, 'a')]
+    assert wheel.count == 0
+
+def test_timer_is_at_least_one_tick_away():
+    wheel = Timer_Wheel(8)
+    assert wheel.schedule('a', 0) == 1
+    assert advance(wheel, 1) == [(1, 'a')]
+
+def test_timer_more_than_a_turn_away_waits_for_its_turn():
+    wheel = Timer_Wheel(8)
+    wheel.schedule('far', 19)
+    wheel.schedule('near', 3)
+
+    assert advance(wheel, 18) == [(3, 'near')]
+    assert advance(wheel, 1) == [(19, 'far')]
+
+def test_timers_in_the_same_slot():
+    wheel = Timer_Wheel(4)
+    for i in range(5):
+        wheel.schedule(i, 2)
+    wheel.schedule('later', 6)
+
+    fired = advance(wheel, 6)
+
+    assert sorted(item for tick, item in fired if tick == 2) == [0, 1, 2, 3, 4]
+    assert fired[-1] == (6, 'later')